@@ -13,6 +13,7 @@
 #    under the License.
 
 from murano.db import models
+from murano.db.services import session_model
 from murano.db import session as db_session
 
 stats = None
@@ -41,7 +42,8 @@ def get_draft(environment_id=None, session_id=None):
     # TODO(all): When session is deployed should be returned env.description
     if session_id:
         session = unit.query(models.Session).get(session_id)
-        return session.description
+        return session_model.SessionModelServices.get_description(
+            session, unit)
     else:
         environment = unit.query(models.Environment).get(environment_id)
         return environment.description
@@ -51,8 +53,7 @@ def save_draft(session_id, draft):
     unit = db_session.get_session()
     session = unit.query(models.Session).get(session_id)
 
-    session.description = draft
-    session.save(unit)
+    session_model.SessionModelServices.save_description(session, draft, unit)
 
 
 def get_service_status(environment_id, session_id, service):
@@ -14,6 +14,7 @@
 #    under the License.
 
 import cgi
+import hashlib
 import os
 import tempfile
 
@@ -25,16 +26,18 @@ from oslo_db import exception as db_exc
 from oslo_log import log as logging
 from oslo_log import versionutils
 import six
+import webob
 from webob import exc
 
 import murano.api.v1
 from murano.api.v1 import validation_schemas
+from murano.common import cache
 from murano.common import exceptions
 from murano.common import policy
 import murano.common.utils as murano_utils
 from murano.common import wsgi
 from murano.db.catalog import api as db_api
-from murano.common.i18n import _, _LW
+from murano.common.i18n import _, _LI, _LW
 from murano.packages import exceptions as pkg_exc
 from murano.packages import load_utils
 from muranoclient.glance import client as glare_client
@@ -48,6 +51,7 @@ LIST_PARAMS = murano.api.v1.LIST_PARAMS
 ORDER_VALUES = murano.api.v1.ORDER_VALUES
 PKG_PARAMS_MAP = murano.api.v1.PKG_PARAMS_MAP
 OPERATOR_VALUES = murano.api.v1.OPERATOR_VALUES
+BLOB_CHUNK_SIZE = 1024 * 1024
 
 
 def _check_content_type(req, content_type):
@@ -97,21 +101,8 @@ def _validate_body(body):
 
     Check multipart/form-data has two parts: text (which is json string and
     should parsed into dictionary in serializer) and file, which stores as
-    cgi.FieldStorage instance. Also validate file size doesn't exceed
-    the limit: seek to the end of the file, get the position of EOF and
-    reset the file position to the beginning
+    cgi.FieldStorage instance.
     """
-    def check_file_size(f):
-        mb_limit = CONF.murano.package_size_limit
-        pkg_size_limit = mb_limit * 1024 * 1024
-        f.seek(0, 2)
-        size = f.tell()
-        f.seek(0)
-        if size > pkg_size_limit:
-            raise exc.HTTPBadRequest(explanation=_(
-                'Uploading file is too large. '
-                'The limit is {0} Mb').format(mb_limit))
-
     if len(body) > 2:
         msg = _("'multipart/form-data' request body should contain 1 or 2 "
                 "parts: json string and zip archive. Current body consists "
@@ -124,7 +115,6 @@ def _validate_body(body):
     for part in body.values():
         if isinstance(part, cgi.FieldStorage):
             file_obj = part
-            check_file_size(file_obj.file)
 
         if isinstance(part, dict):
             package_meta = part
@@ -135,6 +125,86 @@ def _validate_body(body):
     return file_obj, package_meta
 
 
+def _check_archive(f):
+    """Check size of the package archive and calculate its checksum
+
+    The size is checked without reading the file. The archive is then read
+    by chunks to calculate the checksum, so it is not loaded into memory.
+    The file is rewound afterwards.
+
+    :returns: size of the archive and its SHA-256 hex digest
+    """
+    mb_limit = CONF.murano.package_size_limit
+    pkg_size_limit = mb_limit * 1024 * 1024
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    if size > pkg_size_limit:
+        raise exc.HTTPBadRequest(explanation=_(
+            'Uploading file is too large. '
+            'The limit is {0} Mb').format(mb_limit))
+    checksum = hashlib.sha256()
+    f.seek(0)
+    for chunk in iter(lambda: f.read(BLOB_CHUNK_SIZE), b''):
+        checksum.update(chunk)
+    f.seek(0)
+    return size, checksum.hexdigest()
+
+
+class PackageArchiveIterator(object):
+    """Reads archive of the package from the database by chunks
+
+    Supports app_iter_range() protocol of webob so that Range requests
+    read only the chunks that hold the requested part of the archive.
+    """
+
+    def __init__(self, package_id, size):
+        self.package_id = package_id
+        self.size = size
+
+    def __iter__(self):
+        return self.app_iter_range(0, self.size)
+
+    def app_iter_range(self, start, stop):
+        stop = self.size if stop is None else min(stop, self.size)
+        return db_api.package_archive_read(self.package_id, start, stop)
+
+
+def _blob_response(req, package, name, content_type):
+    """Returns response with large column of the package
+
+    Archive, logo and UI of the package never change once the package is
+    uploaded, thus package ID together with the column name is a strong
+    entity tag. This allows If-None-Match requests to be answered without
+    reading the column at all.
+    """
+    response = webob.Response(content_type=content_type,
+                              conditional_response=True)
+    response.etag = '{0}-{1}'.format(package.id, name)
+    if response.etag in req.if_none_match:
+        response.status_int = 304
+        response.content_type = None
+        return response
+
+    if name == 'archive':
+        size = db_api.package_archive_size(package.id)
+        if size:
+            response.app_iter = PackageArchiveIterator(package.id, size)
+            response.content_length = size
+            response.accept_ranges = 'bytes'
+        return response
+
+    # UI and logos are small, so they are read at once
+    blob = db_api.package_get_blob(package.id, name)
+    if blob is None:
+        return response
+    if name == 'ui_definition':
+        response.text = blob
+    else:
+        response.body = blob
+        response.accept_ranges = 'bytes'
+    return response
+
+
 class Controller(object):
     """WSGI controller for application catalog resource in Murano v1 API."""
 
@@ -213,15 +283,22 @@ class Controller(object):
             limit = CONF.murano.limit_param_default
         limit = min(CONF.murano.api_limit_max, limit)
 
-        result = {}
-
         catalog = req.GET.pop('catalog', '').lower() == 'true'
-        packages = db_api.package_search(
-            filters, req.context, manage_public, limit, catalog=catalog)
-        if len(packages) == limit:
-            result['next_marker'] = packages[-1].id
-        result['packages'] = [package.to_dict() for package in packages]
-        return result
+
+        def search():
+            result = {}
+            packages = db_api.package_search(
+                filters, req.context, manage_public, limit, catalog=catalog)
+            if len(packages) == limit:
+                result['next_marker'] = packages[-1].id
+            result['packages'] = [package.to_dict() for package in packages]
+            return result
+
+        return cache.get_cached(
+            cache.CATALOG,
+            ['packages', req.context.tenant, req.context.is_admin,
+             manage_public, catalog, limit, filters],
+            search)
 
     def upload(self, req, body=None):
         """Upload new file archive
@@ -248,18 +325,18 @@ class Controller(object):
         if package_meta.get('is_public'):
             policy.check('publicize_package', req.context)
 
-        with tempfile.NamedTemporaryFile(delete=False) as tempf:
-            LOG.debug("Storing package archive in a temporary file")
-            content = file_obj.file.read()
-            if not content:
-                msg = _("Uploading file can't be empty")
-                LOG.error(msg)
-                raise exc.HTTPBadRequest(explanation=msg)
-            tempf.write(content)
-            package_meta['archive'] = content
+        archive = file_obj.file
+        size, checksum = _check_archive(archive)
+        if not size:
+            msg = _("Uploading file can't be empty")
+            LOG.error(msg)
+            raise exc.HTTPBadRequest(explanation=msg)
+        # the archive is read from the file the request body was stored
+        # in, rather than loaded into memory
+        package_meta['archive'] = archive
         try:
             with load_utils.load_from_file(
-                    tempf.name, target_dir=None,
+                    archive, target_dir=None,
                     drop_dir=True) as pkg_to_upload:
                 # extend dictionary for update db
                 for k, v in six.iteritems(PKG_PARAMS_MAP):
@@ -277,15 +354,15 @@ class Controller(object):
                             'name is already registered')
                     LOG.exception(msg)
                     raise exc.HTTPConflict(msg)
+                LOG.info(_LI('Package {id} uploaded: {size} bytes, '
+                             'sha256 {checksum}').format(
+                    id=package.id, size=size, checksum=checksum))
                 return package.to_dict()
         except pkg_exc.PackageLoadError as e:
             msg = _("Couldn't load package from file: {reason}").format(
                 reason=e)
             LOG.exception(msg)
             raise exc.HTTPBadRequest(explanation=msg)
-        finally:
-            LOG.debug("Deleting package archive temporary file")
-            os.remove(tempf.name)
 
     def get_ui(self, req, package_id):
         if CONF.engine.packages_service == 'murano':
@@ -293,7 +370,8 @@ class Controller(object):
             policy.check("get_package", req.context, target)
 
             package = db_api.package_get(package_id, req.context)
-            return package.ui_definition
+            return _blob_response(req, package, 'ui_definition',
+                                  'text/plain')
         else:
             g_client = self._get_glare_client(req)
             blob_data = g_client.artifacts.download_blob(package_id, 'archive')
@@ -311,18 +389,21 @@ class Controller(object):
         policy.check("get_package", req.context, target)
 
         package = db_api.package_get(package_id, req.context)
-        return package.logo
+        return _blob_response(req, package, 'logo',
+                              'application/octet-stream')
 
     def get_supplier_logo(self, req, package_id):
         package = db_api.package_get(package_id, req.context)
-        return package.supplier_logo
+        return _blob_response(req, package, 'supplier_logo',
+                              'application/octet-stream')
 
     def download(self, req, package_id):
         target = {'package_id': package_id}
         policy.check("download_package", req.context, target)
 
         package = db_api.package_get(package_id, req.context)
-        return package.archive
+        return _blob_response(req, package, 'archive',
+                              'application/octet-stream')
 
     def delete(self, req, package_id):
         target = {'package_id': package_id}
@@ -342,8 +423,15 @@ class Controller(object):
                              in_favor_of='categories.list()')
     def show_categories(self, req):
         policy.check("get_category", req.context)
-        categories = db_api.categories_list()
-        return {'categories': [category.name for category in categories]}
+
+        def show_categories():
+            categories = db_api.categories_list()
+            return {'categories': [category.name
+                                   for category in categories]}
+
+        # categories are the same for all tenants
+        return cache.get_cached(cache.CATALOG, ['category_names'],
+                                show_categories)
 
     def list_categories(self, req):
         """List all categories
@@ -390,15 +478,21 @@ class Controller(object):
         marker = filters.get('marker')
         limit = self._validate_limit(filters.get('limit'))
 
-        result = {}
-        categories = db_api.categories_list(filters,
-                                            limit=limit,
-                                            marker=marker)
-        if len(categories) == limit:
-            result['next_marker'] = categories[-1].id
-
-        result['categories'] = [category.to_dict() for category in categories]
-        return result
+        def list_categories():
+            result = {}
+            categories = db_api.categories_list(filters,
+                                                limit=limit,
+                                                marker=marker)
+            if len(categories) == limit:
+                result['next_marker'] = categories[-1].id
+
+            result['categories'] = [category.to_dict()
+                                    for category in categories]
+            return result
+
+        # categories are the same for all tenants
+        return cache.get_cached(cache.CATALOG, ['categories', limit, filters],
+                                list_categories)
 
     def add_category(self, req, body=None):
         policy.check("add_category", req.context)
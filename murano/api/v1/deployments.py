@@ -12,23 +12,39 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import time
+
+from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_utils import strutils
+from oslo_utils import timeutils
+import sqlalchemy as sa
 from sqlalchemy import desc
+from sqlalchemy import orm as sa_orm
 from webob import exc
 
 from murano.api.v1 import request_statistics
 from murano.common.helpers import token_sanitizer
-from murano.common.i18n import _LE
+from murano.common.i18n import _, _LE
 from murano.common import policy
+from murano.common import progress
 from murano.common import utils
 from murano.common import wsgi
 from murano.db import models
+from murano.db.services import environments as envs
 from murano.db import session as db_session
 from murano.utils import verify_env
 
+CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
 
 API_NAME = 'Deployments'
+ENTITY_MAP_CACHE_SIZE = 256
+STATUSES_FETCH_SIZE = 500
+
+# deployment ID -> {service ID: [IDs of the service objects]}
+_service_entities = collections.OrderedDict()
 
 
 class Controller(object):
@@ -38,14 +54,51 @@ class Controller(object):
         target = {"environment_id": environment_id}
         policy.check("list_deployments", request.context, target)
 
+        limit = _validate_limit(request.GET.get('limit'))
+        marker = request.GET.get('marker')
+        # description of each deployment is the whole object model, so it
+        # is loaded only when asked for. Unpaginated requests include it
+        # to stay compatible with older clients
+        include_description = strutils.bool_from_string(
+            request.GET.get('include_description',
+                            limit is None and marker is None))
+
         unit = db_session.get_session()
         query = unit.query(models.Task) \
             .filter_by(environment_id=environment_id) \
-            .order_by(desc(models.Task.created))
+            .order_by(desc(models.Task.created), desc(models.Task.id))
+        if not include_description:
+            query = query.options(sa_orm.defer(models.Task.description))
+        if marker is not None:
+            marker_task = unit.query(models.Task).options(
+                sa_orm.load_only(models.Task.created)).get(marker)
+            if marker_task is None or \
+                    marker_task.environment_id != environment_id:
+                msg = _('Deployment with id {id} not found').format(id=marker)
+                LOG.error(msg)
+                raise exc.HTTPBadRequest(explanation=msg)
+            query = query.filter(sa.or_(
+                models.Task.created < marker_task.created,
+                sa.and_(models.Task.created == marker_task.created,
+                        models.Task.id < marker_task.id)))
+        if limit is not None:
+            query = query.limit(limit)
         result = query.all()
-        deployments = [set_dep_state(deployment, unit).to_dict() for deployment
-                       in result]
-        return {'deployments': deployments}
+
+        counts = get_status_counts(unit, [task.id for task in result])
+        deployments = []
+        for deployment in result:
+            num_errors, num_warnings = counts.get(deployment.id, (0, 0))
+            _set_state(deployment, num_errors, num_warnings)
+            if include_description:
+                deployment.description = _patch_description(
+                    deployment.description)
+            deployments.append(deployment.to_dict())
+
+        response = {'deployments': deployments}
+        if limit is not None and len(result) == limit:
+            response['next_marker'] = result[-1].id
+        return response
 
     @request_statistics.stats_count(API_NAME, 'Statuses')
     def statuses(self, request, environment_id, deployment_id):
@@ -53,28 +106,150 @@ class Controller(object):
                   "deployment_id": deployment_id}
         policy.check("statuses_deployments", request.context, target)
 
+        limit = _validate_limit(request.GET.get('limit'))
+        marker = request.GET.get('marker')
+        since = request.GET.get('since')
+
         unit = db_session.get_session()
+        deployment = _verify_deployment(unit, environment_id, deployment_id)
         query = unit.query(models.Status) \
             .filter_by(task_id=deployment_id) \
-            .order_by(models.Status.created)
-        deployment = verify_and_get_deployment(unit, environment_id,
-                                               deployment_id)
+            .order_by(models.Status.created, models.Status.id)
 
         if 'service_id' in request.GET:
-            service_id_set = set(request.GET.getall('service_id'))
-            environment = deployment.description
-            entity_ids = []
-            for service in environment.get('services', []):
-                if service['?']['id'] in service_id_set:
-                    id_map = utils.build_entity_map(service)
-                    entity_ids = entity_ids + id_map.keys()
+            services = get_service_entities(deployment)
+            entity_ids = set()
+            for service_id in request.GET.getall('service_id'):
+                entity_ids.update(services.get(service_id, []))
             if entity_ids:
                 query = query.filter(models.Status.entity_id.in_(entity_ids))
             else:
                 return {'reports': []}
 
-        result = query.all()
-        return {'reports': [status.to_dict() for status in result]}
+        if since is not None:
+            try:
+                since = timeutils.normalize_time(
+                    timeutils.parse_isotime(since))
+            except ValueError:
+                msg = _('Invalid "since" parameter {value}').format(
+                    value=since)
+                LOG.error(msg)
+                raise exc.HTTPBadRequest(explanation=msg)
+            query = query.filter(models.Status.created > since)
+        if marker is not None:
+            marker_status = unit.query(models.Status).get(marker)
+            if marker_status is None or marker_status.task_id != deployment_id:
+                msg = _('Report with id {id} not found').format(id=marker)
+                LOG.error(msg)
+                raise exc.HTTPBadRequest(explanation=msg)
+            query = query.filter(sa.or_(
+                models.Status.created > marker_status.created,
+                sa.and_(models.Status.created == marker_status.created,
+                        models.Status.id > marker_status.id)))
+
+        if limit is None:
+            # complete history can be large, so it is streamed. Errors
+            # while streaming cannot change the already sent status and
+            # abort the response instead
+            return {'reports': (status.to_dict() for status in
+                                query.yield_per(STATUSES_FETCH_SIZE))}
+
+        result = query.limit(limit).all()
+        response = {'reports': [status.to_dict() for status in result]}
+        if len(result) == limit:
+            response['next_marker'] = result[-1].id
+        return response
+
+    @request_statistics.stats_count(API_NAME, 'Progress')
+    @verify_env
+    def progress(self, request, environment_id):
+        """Long-polls for the progress of environment deployments
+
+        Responds as soon as there are status reports newer than the one
+        given as `marker` (or any reports of the last deployment when no
+        marker is given) or the environment status differs from the
+        `status` known to the client, but no later than in `timeout`
+        seconds. Passing `next_marker` and `status` of the response to the
+        next request resumes from where the client stopped.
+        """
+        target = {"environment_id": environment_id}
+        policy.check("statuses_deployments", request.context, target)
+
+        limit = _validate_limit(request.GET.get('limit'))
+        if limit is None:
+            limit = CONF.murano.api_limit_max
+        marker = request.GET.get('marker')
+        known_status = request.GET.get('status')
+        timeout = _validate_timeout(request.GET.get('timeout'))
+
+        unit = db_session.get_session()
+        marker_status = None
+        if marker is not None:
+            marker_status = unit.query(models.Status).get(marker)
+            if marker_status is None or \
+                    marker_status.task.environment_id != environment_id:
+                msg = _('Report with id {id} not found').format(id=marker)
+                LOG.error(msg)
+                raise exc.HTTPBadRequest(explanation=msg)
+
+        deadline = time.time() + timeout
+        with progress.subscribe(environment_id) as subscription:
+            while True:
+                unit = db_session.get_session()
+                status = envs.EnvironmentServices.get_status(environment_id)
+                reports = _get_new_reports(unit, environment_id,
+                                           marker_status, limit)
+                remaining = deadline - time.time()
+                if reports or status != known_status or remaining <= 0:
+                    break
+                # changes recorded by other API processes are not
+                # published to this one, so the DB is re-checked anyway
+                subscription.wait(min(
+                    remaining, CONF.murano.progress_db_poll_interval))
+
+        return {
+            'status': status,
+            'reports': [report.to_dict() for report in reports],
+            'next_marker': reports[-1].id if reports else marker
+        }
+
+
+def _validate_timeout(value):
+    if value is None:
+        return CONF.murano.progress_max_wait
+    try:
+        value = int(value)
+    except ValueError:
+        msg = _("Timeout param must be an integer")
+        LOG.error(msg)
+        raise exc.HTTPBadRequest(explanation=msg)
+
+    if value < 0:
+        msg = _("Timeout param must not be negative")
+        LOG.error(msg)
+        raise exc.HTTPBadRequest(explanation=msg)
+
+    return min(CONF.murano.progress_max_wait, value)
+
+
+def _get_new_reports(unit, environment_id, marker_status, limit):
+    if marker_status is None:
+        last_deployment = unit.query(models.Task.id) \
+            .filter_by(environment_id=environment_id) \
+            .order_by(desc(models.Task.started)).first()
+        if last_deployment is None:
+            return []
+        query = unit.query(models.Status) \
+            .filter_by(task_id=last_deployment.id)
+    else:
+        query = unit.query(models.Status).join(
+            models.Task, models.Status.task_id == models.Task.id).filter(
+            models.Task.environment_id == environment_id,
+            sa.or_(models.Status.created > marker_status.created,
+                   sa.and_(models.Status.created == marker_status.created,
+                           models.Status.id > marker_status.id)))
+    return query.order_by(models.Status.created, models.Status.id) \
+        .limit(limit).all()
 
 
 def _patch_description(description):
@@ -84,8 +259,29 @@ def _patch_description(description):
     return token_sanitizer.TokenSanitizer().sanitize(description)
 
 
-def verify_and_get_deployment(db_session, environment_id, deployment_id):
-    deployment = db_session.query(models.Task).get(deployment_id)
+def get_service_entities(deployment):
+    """Returns IDs of the objects of each service of the deployment
+
+    Object model of a deployment never changes, so the result is cached
+    and the description is only loaded on a cache miss.
+
+    :return: dict of service ID to list of IDs of its objects
+    """
+    result = _service_entities.pop(deployment.id, None)
+    if result is None:
+        description = _patch_description(deployment.description)
+        result = dict(
+            (service['?']['id'], list(utils.build_entity_map(service)))
+            for service in description.get('services', []))
+        if len(_service_entities) >= ENTITY_MAP_CACHE_SIZE:
+            _service_entities.popitem(last=False)
+    _service_entities[deployment.id] = result
+    return result
+
+
+def _verify_deployment(db_session, environment_id, deployment_id):
+    deployment = db_session.query(models.Task).options(
+        sa_orm.defer(models.Task.description)).get(deployment_id)
     if not deployment:
         LOG.error(_LE('Deployment with id {id} not found')
                   .format(id=deployment_id))
@@ -95,7 +291,11 @@ def verify_and_get_deployment(db_session, environment_id, deployment_id):
                       '{env_id}').format(d_id=deployment_id,
                                          env_id=environment_id))
         raise exc.HTTPBadRequest
+    return deployment
+
 
+def verify_and_get_deployment(db_session, environment_id, deployment_id):
+    deployment = _verify_deployment(db_session, environment_id, deployment_id)
     deployment.description = _patch_description(deployment.description)
     return deployment
 
@@ -104,15 +304,46 @@ def create_resource():
     return wsgi.Resource(Controller())
 
 
-def set_dep_state(deployment, unit):
-    num_errors = unit.query(models.Status).filter_by(
-        level='error',
-        task_id=deployment.id).count()
+def _validate_limit(value):
+    if value is None:
+        return None
+    try:
+        value = int(value)
+    except ValueError:
+        msg = _("Limit param must be an integer")
+        LOG.error(msg)
+        raise exc.HTTPBadRequest(explanation=msg)
 
-    num_warnings = unit.query(models.Status).filter_by(
-        level='warning',
-        task_id=deployment.id).count()
+    if value <= 0:
+        msg = _("Limit param must be positive")
+        LOG.error(msg)
+        raise exc.HTTPBadRequest(explanation=msg)
+
+    return min(CONF.murano.api_limit_max, value)
 
+
+def get_status_counts(unit, deployment_ids):
+    """Counts error and warning reports of deployments with a single query
+
+    :return: dict of deployment ID to (num_errors, num_warnings) tuple.
+             Deployments without such reports are omitted
+    """
+    if not deployment_ids:
+        return {}
+    level = models.Status.level
+    query = unit.query(
+        models.Status.task_id,
+        sa.func.sum(sa.case([(level == 'error', 1)], else_=0)),
+        sa.func.sum(sa.case([(level == 'warning', 1)], else_=0))
+    ).filter(
+        models.Status.task_id.in_(deployment_ids),
+        level.in_(['error', 'warning'])
+    ).group_by(models.Status.task_id)
+    return dict((task_id, (int(errors), int(warnings)))
+                for task_id, errors, warnings in query)
+
+
+def _set_state(deployment, num_errors, num_warnings):
     if deployment.finished:
         if num_errors:
             deployment.state = 'completed_w_errors'
@@ -128,5 +359,16 @@ def set_dep_state(deployment, unit):
         else:
             deployment.state = 'running'
 
+
+def set_dep_state(deployment, unit):
+    num_errors = unit.query(models.Status).filter_by(
+        level='error',
+        task_id=deployment.id).count()
+
+    num_warnings = unit.query(models.Status).filter_by(
+        level='warning',
+        task_id=deployment.id).count()
+
+    _set_state(deployment, num_errors, num_warnings)
     deployment.description = _patch_description(deployment.description)
     return deployment
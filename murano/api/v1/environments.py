@@ -20,6 +20,7 @@ from webob import exc
 
 from murano.api.v1 import request_statistics
 from murano.api.v1 import sessions
+from murano.common import cache
 from murano.common.i18n import _
 from murano.common import policy
 from murano.common import utils
@@ -54,10 +55,14 @@ class Controller(object):
             # Only environments from same tenant as user should be returned
             filters = {'tenant_id': request.context.tenant}
 
-        environments = envs.EnvironmentServices.get_environments_by(filters)
-        environments = [env.to_dict() for env in environments]
+        def index():
+            environments = envs.EnvironmentServices.get_environments_by(
+                filters)
+            return {"environments": [env.to_dict() for env in environments]}
 
-        return {"environments": environments}
+        return cache.get_cached(
+            cache.ENVIRONMENTS,
+            ['environments', request.context.tenant, all_tenants], index)
 
     @request_statistics.stats_count(API_NAME, 'Create')
     def create(self, request, body):
@@ -92,6 +97,16 @@ class Controller(object):
         target = {"environment_id": environment_id}
         policy.check('show_environment', request.context, target)
 
+        session_id = None
+        if hasattr(request, 'context') and request.context.session:
+            session_id = request.context.session
+
+        return cache.get_cached(
+            cache.ENVIRONMENTS, ['environment', environment_id, session_id],
+            lambda: self._show(request, environment_id, session_id))
+
+    @staticmethod
+    def _show(request, environment_id, session_id):
         session = db_session.get_session()
         environment = session.query(models.Environment).get(environment_id)
         env = environment.to_dict()
@@ -106,16 +121,14 @@ class Controller(object):
             if session_list:
                 env['acquired_by'] = session_list[0].id
 
-        session_id = None
-        if hasattr(request, 'context') and request.context.session:
-            session_id = request.context.session
         if session_id:
             env_session = session.query(models.Session).get(session_id)
             check_session(request, environment_id, env_session, session_id)
 
         # add services to env
         get_data = core_services.CoreServices.get_data
-        env['services'] = get_data(environment_id, '/services', session_id)
+        env['services'] = get_data(environment_id, '/services', session_id,
+                                   env_status=env['status'])
 
         return env
 
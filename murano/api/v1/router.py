@@ -160,6 +160,10 @@ class API(wsgi.Router):
                        controller=deployments_resource,
                        action='statuses',
                        conditions={'method': ['GET']})
+        mapper.connect('/environments/{environment_id}/progress',
+                       controller=deployments_resource,
+                       action='progress',
+                       conditions={'method': ['GET']})
 
         sessions_resource = sessions.create_resource()
         mapper.connect('/environments/{environment_id}/configure',
@@ -12,6 +12,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import time
+
 from keystoneauth1 import identity
 from keystoneauth1 import loading as ka_loading
 from keystoneclient.v3 import client as ks_client
@@ -25,6 +28,61 @@ CFG_KEYSTONE_GROUP = 'keystone_authtoken'
 cfg.CONF.import_group(CFG_KEYSTONE_GROUP, 'keystonemiddleware.auth_token')
 
 
+class _ClientPool(object):
+    """Worker-wide cache of keystone sessions and service clients
+
+    Reusing keystone sessions between tasks keeps their HTTP connections
+    alive and saves re-authentication: trust-scoped auth plugins obtain
+    new tokens by themselves when the current one is about to expire.
+    Keys always contain the credentials (trust ID or token and project)
+    so nothing is ever shared between different tenants. Entries are
+    evicted in LRU order and are re-created once they get older than
+    client_pool_max_age seconds.
+    """
+
+    def __init__(self):
+        self._items = collections.OrderedDict()
+
+    def get(self, key, factory):
+        max_size = cfg.CONF.engine.client_pool_size
+        if not max_size:
+            return factory()
+        now = time.time()
+        entry = self._items.pop(key, None)
+        if entry is None or (
+                now - entry[0] > cfg.CONF.engine.client_pool_max_age):
+            entry = (now, factory())
+        self._items[key] = entry
+        while len(self._items) > max_size:
+            self._items.popitem(last=False)
+        return entry[1]
+
+    def discard(self, credentials):
+        for key in list(self._items):
+            if credentials in key:
+                del self._items[key]
+
+    def clear(self):
+        self._items.clear()
+
+
+_pool = _ClientPool()
+
+
+def _get_credentials_key(execution_session):
+    if execution_session.trust_id:
+        return 'trust', execution_session.trust_id
+    return 'token', execution_session.token, execution_session.project_id
+
+
+def _get_tls_key(conf_section):
+    if not conf_section:
+        conf_section = cfg.CONF[CFG_KEYSTONE_GROUP]
+    return tuple(_get_config_option(conf_section, names) for names in (
+        'insecure', ('ca_file', 'cafile', 'cacert'),
+        ('key_file', 'keyfile'), ('cert_file', 'certfile')))
+
+
 def _get_keystone_auth(trust_id=None):
     if not cfg.CONF[CFG_KEYSTONE_GROUP].auth_type:
         # Fallback to legacy v2 options if no auth_type is set.
@@ -62,10 +120,10 @@ def _get_keystone_auth(trust_id=None):
 
 
 def _create_keystone_admin_client():
-    auth = _get_keystone_auth()
-    session = _get_session(
-        auth=auth,
-        conf_section=cfg.CONF[CFG_KEYSTONE_GROUP])
+    session = _pool.get(
+        ('session', ('admin',), _get_tls_key(None)),
+        lambda: _get_session(auth=_get_keystone_auth(),
+                             conf_section=cfg.CONF[CFG_KEYSTONE_GROUP]))
     return ks_client.Client(session=session)
 
 
@@ -77,9 +135,10 @@ def get_client_session(execution_session=None, conf=None):
         return get_token_client_session(
             token=execution_session.token,
             project_id=execution_session.project_id)
-    auth = _get_keystone_auth(trust_id)
-    session = _get_session(auth=auth, conf_section=conf)
-    return session
+    return _pool.get(
+        ('session', ('trust', trust_id), _get_tls_key(conf)),
+        lambda: _get_session(auth=_get_keystone_auth(trust_id),
+                             conf_section=conf))
 
 
 def get_token_client_session(token=None, project_id=None, conf=None):
@@ -88,12 +147,40 @@ def get_token_client_session(token=None, project_id=None, conf=None):
         execution_session = helpers.get_execution_session()
         token = execution_session.token
         project_id = execution_session.project_id
-    token_auth = identity.Token(
-        auth_url,
-        token=token,
-        project_id=project_id)
-    session = _get_session(auth=token_auth, conf_section=conf)
-    return session
+
+    def create_session():
+        token_auth = identity.Token(
+            auth_url,
+            token=token,
+            project_id=project_id)
+        return _get_session(auth=token_auth, conf_section=conf)
+
+    return _pool.get(
+        ('session', ('token', token, project_id), _get_tls_key(conf)),
+        create_session)
+
+
+def get_pooled_client(name, key, factory, conf=None, execution_session=None):
+    """Returns service client shared by tasks with the same credentials
+
+    :param name: name of the service
+    :param key: hashable value that identifies client settings (e.g.
+                region name) besides the credentials and `conf`
+    :param factory: callable that creates client from the keystone session
+    :param conf: configuration section of the service
+    :param execution_session: session whose credentials are to be used
+    """
+
+    if not execution_session:
+        execution_session = helpers.get_execution_session()
+    conf_key = _get_tls_key(conf) + (
+        _get_config_option(conf, 'url'),
+        _get_config_option(conf, 'endpoint_type'))
+    return _pool.get(
+        ('client', name, key, _get_credentials_key(execution_session),
+         conf_key),
+        lambda: factory(get_client_session(
+            execution_session=execution_session, conf=conf)))
 
 
 def create_keystone_client(token=None, project_id=None, conf=None):
@@ -122,6 +209,7 @@ def create_trust(trustee_token=None, trustee_project_id=None):
 def delete_trust(trust):
     user_client = _create_keystone_admin_client()
     user_client.trusts.delete(trust)
+    _pool.discard(('trust', trust))
 
 
 def _get_config_option(conf_section, option_names, default=None):
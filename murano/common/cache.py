@@ -0,0 +1,212 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Read-through cache of results of read-only API calls
+
+Every cached value belongs to a scope: the catalog or the environments.
+Each scope has a version, which is a part of keys of the values of the
+scope. The version is replaced whenever the data of the scope is changed
+in the database (see murano.db.session), which makes all values cached
+before the change unreachable without the need to find and delete them.
+
+Values and versions are kept in a backend. The local backend is an LRU
+cache in the memory of the API process, so changes made by other API
+processes are seen only when cached values expire. A shared backend
+(e.g. memcached configured with oslo.cache) makes the versions common for
+all API processes.
+"""
+
+import collections
+import hashlib
+import threading
+import time
+import uuid
+
+from oslo_config import cfg
+from oslo_log import log as logging
+from oslo_serialization import jsonutils
+from six.moves import cPickle as pickle
+from stevedore import driver
+
+try:
+    # shared cache backend is optional
+    from oslo_cache import core as oslo_cache
+except ImportError as e:
+    oslo_cache = None
+    oslo_cache_import_error = e
+
+from murano.common.i18n import _LW
+
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
+
+CATALOG = 'catalog'
+ENVIRONMENTS = 'environments'
+
+BACKENDS_NAMESPACE = 'murano.api_cache.backends'
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+class LocalBackend(object):
+    """In-process LRU cache which values may expire"""
+
+    def __init__(self, max_entries):
+        self._max_entries = max_entries
+        self._values = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._values.pop(key, None)
+            if item is None:
+                return None
+            value, expires = item
+            if expires is not None and expires <= time.time():
+                return None
+            # the most recently used values go last
+            self._values[key] = item
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires = None if ttl is None else time.time() + ttl
+        with self._lock:
+            self._values.pop(key, None)
+            self._values[key] = (value, expires)
+            while len(self._values) > self._max_entries:
+                self._values.popitem(last=False)
+
+
+class OsloCacheBackend(object):
+    """Cache shared by API processes
+
+    Uses the cache region configured by oslo.cache in the [cache] section
+    of the config, e.g. memcached.
+    """
+
+    def __init__(self, max_entries):
+        if oslo_cache is None:
+            raise oslo_cache_import_error
+        oslo_cache.configure(CONF)
+        self._region = oslo_cache.create_region()
+        oslo_cache.configure_cache_region(CONF, self._region)
+
+    def get(self, key):
+        item = self._region.get(key)
+        if not isinstance(item, tuple):
+            # NO_VALUE
+            return None
+        value, expires = item
+        if expires is not None and expires <= time.time():
+            return None
+        return value
+
+    def set(self, key, value, ttl=None):
+        expires = None if ttl is None else time.time() + ttl
+        self._region.set(key, (value, expires))
+
+
+BACKENDS = {
+    'local': LocalBackend,
+    'oslo_cache': OsloCacheBackend
+}
+
+
+def _get_backend():
+    global _backend
+
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = CONF.api_cache.backend
+                max_entries = CONF.api_cache.max_entries
+                if name in BACKENDS:
+                    _backend = BACKENDS[name](max_entries)
+                else:
+                    _backend = driver.DriverManager(
+                        BACKENDS_NAMESPACE, name, invoke_on_load=True,
+                        invoke_args=(max_entries,)).driver
+    return _backend
+
+
+def _get_version_key(scope):
+    return 'murano-api-version:' + scope
+
+
+def _get_version(backend, scope):
+    version = backend.get(_get_version_key(scope))
+    if version is None:
+        # versions may be evicted or expire, so a missing version is
+        # replaced with a new one, never reused
+        version = uuid.uuid4().hex
+        backend.set(_get_version_key(scope), version)
+    return version
+
+
+def _make_key(scope, version, key):
+    key = jsonutils.dumps([scope, version, key], sort_keys=True)
+    return 'murano-api:' + hashlib.sha256(
+        key.encode('utf-8')).hexdigest()
+
+
+def get_cached(scope, key, create):
+    """Returns the cached value or creates and caches it
+
+    :param scope: scope the value belongs to, CATALOG or ENVIRONMENTS
+    :param key: JSON serializable data identifying the value within the
+                scope, e.g. the tenant, results of policy checks and
+                request parameters
+    :param create: function that creates the value if there is no cached
+                   one
+    """
+    if not CONF.api_cache.enabled:
+        return create()
+
+    try:
+        backend = _get_backend()
+        key = _make_key(scope, _get_version(backend, scope), key)
+        data = backend.get(key)
+    except Exception:
+        LOG.warning(_LW('API cache is not available'), exc_info=True)
+        return create()
+    if data is not None:
+        return pickle.loads(data)
+
+    value = create()
+    try:
+        backend.set(key, pickle.dumps(value, 2),
+                    CONF.api_cache.ttl)
+    except Exception:
+        LOG.warning(_LW('Unable to store value in API cache'), exc_info=True)
+    return value
+
+
+def invalidate(*scopes):
+    """Makes all values cached for the scopes unreachable"""
+    if not CONF.api_cache.enabled:
+        return
+    try:
+        backend = _get_backend()
+        for scope in scopes:
+            backend.set(_get_version_key(scope), uuid.uuid4().hex)
+    except Exception:
+        LOG.warning(_LW('Unable to invalidate API cache scopes {scopes}')
+                    .format(scopes=', '.join(scopes)), exc_info=True)
+
+
+def reset():
+    """Drops the backend, e.g. after the configuration is changed"""
+    global _backend
+    _backend = None
@@ -61,6 +61,12 @@ rabbit_opts = [
     cfg.BoolOpt('insecure', default=False,
                 help='This option explicitly allows Murano to perform '
                      '"insecure" SSL connections to RabbitMQ'),
+
+    cfg.IntOpt('connection_pool_size', default=10, min=1,
+               help='Maximum number of connections to each RabbitMQ broker '
+                    'of guest agents that an engine worker can use at the '
+                    'same time. Connections are kept open and reused for '
+                    'sending messages to agents.'),
 ]
 
 heat_opts = [
@@ -86,7 +92,23 @@ heat_opts = [
 
     cfg.ListOpt('stack_tags', default=['murano'],
                 help='List of tags to be assigned to heat stacks created '
-                     'during environment deployment.')
+                     'during environment deployment.'),
+
+    cfg.FloatOpt('stack_status_min_poll_interval', default=1.0, min=0.1,
+                 help='Initial interval in seconds between polls of Heat '
+                      'for the status of stacks that are in progress. '
+                      'Stacks of the same tenant and region are polled '
+                      'with a single request.'),
+
+    cfg.FloatOpt('stack_status_max_poll_interval', default=8.0, min=0.1,
+                 help='Maximum interval in seconds between polls of Heat '
+                      'for the status of stacks. Interval is doubled each '
+                      'time polled stacks did not change their state.'),
+
+    cfg.FloatOpt('stack_status_poll_jitter', default=0.2, min=0, max=0.9,
+                 help='Relative random deviation applied to the poll '
+                      'interval so that engine workers do not poll Heat '
+                      'simultaneously.')
 ]
 
 mistral_opts = [
@@ -166,6 +188,16 @@ murano_opts = [
                     'pagination request',
                deprecated_group='packages_opts'),
 
+    cfg.IntOpt('progress_max_wait', default=30, min=0,
+               help='Maximum time in seconds a deployment progress request '
+                    'waits for new status reports or environment status '
+                    'change before returning an empty response.'),
+
+    cfg.FloatOpt('progress_db_poll_interval', default=2.0, min=0.1,
+                 help='Interval in seconds at which waiting deployment '
+                      'progress requests re-check the database for '
+                      'changes recorded by other API processes.'),
+
     cfg.IntOpt('api_workers',
                help=_('Number of API workers')),
 
@@ -208,6 +240,28 @@ networking_opts = [
                     'If not provided, the driver will be detected.'),
 ]
 
+api_cache_opts = [
+    cfg.BoolOpt('enabled', default=False,
+                help='Cache results of frequently called read-only API '
+                     'calls: listing of packages, categories and '
+                     'environments, and environment details.'),
+
+    cfg.StrOpt('backend', default='local',
+               help='Cache backend. "local" keeps the cache in memory of '
+                    'each API process, so changes made through other API '
+                    'processes are seen only when cached results expire. '
+                    '"oslo_cache" uses the cache configured in the [cache] '
+                    'section (e.g. memcached) and shares it between API '
+                    'processes. Other backends may be provided with '
+                    'murano.api_cache.backends entry points.'),
+
+    cfg.IntOpt('ttl', default=10, min=1,
+               help='Time in seconds results are cached for.'),
+
+    cfg.IntOpt('max_entries', default=1000, min=1,
+               help='Maximum number of results kept by the local backend.'),
+]
+
 stats_opts = [
     cfg.IntOpt('period', default=5,
                help=_('Statistics collection interval in minutes.'
@@ -227,6 +281,40 @@ engine_opts = [
     cfg.IntOpt('agent_timeout', default=3600,
                help=_('Time for waiting for a response from murano agent '
                       'during the deployment')),
+    cfg.IntOpt('agent_results_prefetch_count', default=50, min=1,
+               help=_('Maximum number of unacknowledged execution results '
+                      'that RabbitMQ delivers to an engine worker at once.')),
+    cfg.IntOpt('agent_results_ack_batch_size', default=20, min=1,
+               help=_('Number of received execution results that are '
+                      'acknowledged together. Results are also acknowledged '
+                      'whenever no more results are pending. Cannot exceed '
+                      'agent_results_prefetch_count.')),
+    cfg.IntOpt('status_report_batch_size', default=100, min=1,
+               help=_('Maximum number of deployment status reports that are '
+                      'buffered by the engine and sent to the API in a '
+                      'single notification. 1 disables the batching.')),
+    cfg.FloatOpt('status_report_batch_interval', default=1.0, min=0,
+                 help=_('Maximum time in seconds a deployment status report '
+                        'can stay in the buffer before it is sent. Reports '
+                        'are also sent when the task finishes.')),
+    cfg.IntOpt('instance_tracking_batch_size', default=100, min=1,
+               help=_('Maximum number of application and instance tracking '
+                      'changes that are buffered by the engine during a task '
+                      'and sent to the API in a single notification. '
+                      '1 disables the batching.')),
+    cfg.FloatOpt('instance_tracking_batch_interval', default=5.0, min=0,
+                 help=_('Maximum time in seconds an application or instance '
+                        'tracking change can stay in the buffer before it is '
+                        'sent. Changes are also sent when the task '
+                        'finishes.')),
+    cfg.IntOpt('client_pool_size', default=100, min=0,
+               help=_('Maximum number of keystone sessions and OpenStack '
+                      'service clients that are kept by the engine worker '
+                      'to be reused by the following tasks with the same '
+                      'credentials. 0 disables the reuse.')),
+    cfg.IntOpt('client_pool_max_age', default=1800, min=0,
+               help=_('Time in seconds after which pooled keystone sessions '
+                      'and service clients are re-created.')),
     cfg.IntOpt('engine_workers',
                deprecated_opts=[cfg.DeprecatedOpt('workers',
                                                   group='engine')],
@@ -248,6 +336,31 @@ engine_opts = [
                        'deployments.'),
                 deprecated_group='packages_opts'),
 
+    cfg.IntOpt('max_green_threads', default=1000, min=0,
+               help=_('Maximum number of green threads that can execute '
+                      'MuranoPL code in parallel (Parallel macro, pselect() '
+                      'etc.) across all tasks of the engine worker. '
+                      '0 means no limit.')),
+
+    cfg.IntOpt('max_task_green_threads', default=500, min=0,
+               help=_('Maximum number of parallel green threads that a single '
+                      'task (deployment) can occupy. Requests above the '
+                      'limit are queued and served in round-robin order '
+                      'between tasks. 0 means no limit.')),
+
+    cfg.IntOpt('scheduler_stats_interval', default=60, min=0,
+               help=_('Interval in seconds at which usage statistics of the '
+                      'green thread budget and of the native thread pool '
+                      '(active threads, queue depth and wait time of queued '
+                      'requests) are logged at debug level. 0 disables the '
+                      'logging.')),
+
+    cfg.IntOpt('native_thread_pool_size', default=20, min=1,
+               help=_('Number of OS threads used by native methods to '
+                      'execute blocking or CPU-heavy work (such as reading '
+                      'and parsing of package resources) without freezing '
+                      'other green threads of the engine worker.')),
+
     cfg.StrOpt('packages_service', default='murano',
                help=_('The service to store murano packages: murano (stands '
                       'for legacy behavior using murano-api) or glance '
@@ -312,6 +425,7 @@ CONF.register_opts(engine_opts, group='engine')
 CONF.register_opts(file_server)
 CONF.register_opt(home_region)
 CONF.register_cli_opts(metadata_dir)
+CONF.register_opts(api_cache_opts, group='api_cache')
 CONF.register_opts(stats_opts, group='stats')
 CONF.register_opts(networking_opts, group='networking')
 CONF.register_opts(glare_opts, group='glare')
@@ -33,6 +33,7 @@ from murano.dsl import context_manager
 from murano.dsl import dsl_exception
 from murano.dsl import executor as dsl_executor
 from murano.dsl import helpers
+from murano.dsl import scheduler
 from murano.dsl import schema_generator
 from murano.dsl import serializer
 from murano.engine import execution_session
@@ -58,6 +59,9 @@ class EngineService(service.Service):
         self.server = None
 
     def start(self):
+        scheduler.configure(CONF.engine.max_green_threads,
+                            CONF.engine.max_task_green_threads)
+        scheduler.configure_thread_pool(CONF.engine.native_thread_pool_size)
         endpoints = [
             TaskProcessingEndpoint(),
             StaticActionEndpoint(),
@@ -70,6 +74,23 @@ class EngineService(service.Service):
             transport, s_target, endpoints, 'eventlet')
         self.server.start()
         super(EngineService, self).start()
+        interval = CONF.engine.scheduler_stats_interval
+        if interval:
+            self.tg.add_timer(interval, self.log_scheduler_stats, interval)
+
+    @staticmethod
+    def log_scheduler_stats():
+        stats = scheduler.get_scheduler().get_stats()
+        LOG.debug('Green threads: {active_threads} active of {max_threads} '
+                  'in {active_tasks} tasks, {queue_depth} queued (max '
+                  '{max_queue_depth}), {total_waits} of {total_requests} '
+                  'requests waited {average_wait_time:.3f}s on average '
+                  '(max {max_wait_time:.3f}s)'.format(**stats))
+        stats = scheduler.get_thread_pool().get_stats()
+        LOG.debug('Native threads: {active_threads} active of {size}, '
+                  '{queue_depth} queued (max {max_queue_depth}), '
+                  '{saturated_calls} of {total_calls} calls waited '
+                  '{total_wait_time:.3f}s in total'.format(**stats))
 
     def stop(self, graceful=False):
         if self.server:
@@ -139,6 +160,7 @@ class TaskProcessingEndpoint(object):
             result = task_executor.execute()
             return result
         finally:
+            reporter.flush()
             LOG.info(_LI('Finished processing task: {task_desc}').format(
                 task_desc=jsonutils.dumps(result)))
 
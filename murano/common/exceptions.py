@@ -71,3 +71,8 @@ class PolicyViolationException(Exception):
 
 class RouterInfoException(Exception):
     pass
+
+
+class PackageArchiveTruncated(OpenstackException):
+    msg_fmt = ("Archive of package %(package_id)s ended at byte "
+               "%(offset)s instead of %(stop)s")
@@ -41,6 +41,18 @@ class Message(object):
     def body(self, value):
         self._body = value
 
+    @property
+    def routing_key(self):
+        if self._message_handle is None:
+            return None
+        return self._message_handle.delivery_info.get('routing_key')
+
+    @property
+    def delivery_tag(self):
+        if self._message_handle is None:
+            return None
+        return self._message_handle.delivery_tag
+
     @property
     def id(self):
         return self._id
@@ -49,5 +61,10 @@ class Message(object):
     def id(self, value):
         self._id = value or ''
 
-    def ack(self):
-        self._message_handle.ack()
+    def ack(self, multiple=False):
+        if multiple:
+            # acknowledges all the messages received on the channel so far
+            self._message_handle.channel.basic_ack(
+                self._message_handle.delivery_tag, multiple=True)
+        else:
+            self._message_handle.ack()
@@ -13,19 +13,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import contextlib
 import ssl as ssl_module
 
 from eventlet import patcher
+import eventlet.semaphore
+from oslo_log import log as logging
 from oslo_serialization import jsonutils
 
+from murano.common.i18n import _LW
 from murano.common.messaging import subscription
 
 kombu = patcher.import_patched('kombu')
+LOG = logging.getLogger(__name__)
 
 
 class MqClient(object):
     def __init__(self, login, password, host, port, virtual_host,
-                 ssl=False, ca_certs=None, insecure=False):
+                 ssl=False, ca_certs=None, insecure=False, transport='amqp'):
         ssl_params = None
 
         if ssl:
@@ -41,7 +47,8 @@ class MqClient(object):
             }
 
         self._connection = kombu.Connection(
-            'amqp://{0}:{1}@{2}:{3}/{4}'.format(
+            '{0}://{1}:{2}@{3}:{4}/{5}'.format(
+                transport,
                 login,
                 password,
                 host,
@@ -50,6 +57,7 @@ class MqClient(object):
             ), ssl=ssl_params
         )
         self._channel = None
+        self._producer = None
         self._connected = False
 
     def __enter__(self):
@@ -60,13 +68,32 @@ class MqClient(object):
         self.close()
         return False
 
+    @property
+    def connected(self):
+        return self._connected and self._connection.connected
+
+    @property
+    def errors(self):
+        return (self._connection.connection_errors +
+                self._connection.channel_errors)
+
     def connect(self):
-        self._connection.connect()
+        self._connection.ensure_connection(
+            errback=self._on_connection_error, max_retries=3,
+            interval_start=1, interval_step=2, interval_max=8)
         self._channel = self._connection.channel()
+        self._producer = None
         self._connected = True
 
+    @staticmethod
+    def _on_connection_error(exc, interval):
+        LOG.warning(_LW('Failed to connect to RabbitMQ: {error}. '
+                        'Retrying in {interval} seconds').format(
+            error=exc, interval=interval))
+
     def close(self):
         self._connection.close()
+        self._producer = None
         self._connected = False
 
     def declare(self, queue, exchange='', enable_ha=False, ttl=0):
@@ -95,8 +122,13 @@ class MqClient(object):
         if not self._connected:
             raise RuntimeError('Not connected to RabbitMQ')
 
-        producer = kombu.Producer(self._connection)
-        producer.publish(
+        if self._producer is None:
+            self._producer = kombu.Producer(self._connection)
+        publish = self._connection.ensure(
+            self._producer, self._producer.publish,
+            errback=self._on_connection_error, max_retries=3,
+            interval_start=1, interval_step=2, interval_max=8)
+        publish(
             exchange=str(exchange),
             routing_key=str(key),
             body=jsonutils.dumps(message.body),
@@ -109,3 +141,82 @@ class MqClient(object):
 
         return subscription.Subscription(
             self._connection, queue, prefetch_count)
+
+
+class ConnectionPool(object):
+    """Bounded pool of persistent connections to a RabbitMQ broker
+
+    Connections are kept open between uses together with their channel
+    and producer. Connections that were closed by the broker or failed
+    with a connection or channel error are dropped and replaced with new
+    ones. At most `max_size` connections can be in use at the same time,
+    other requests wait for a connection to be returned to the pool.
+    """
+
+    def __init__(self, client_factory, max_size=10):
+        self._client_factory = client_factory
+        self._max_size = max_size
+        self._semaphore = eventlet.semaphore.Semaphore(max_size)
+        self._idle = collections.deque()
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    @property
+    def idle_count(self):
+        return len(self._idle)
+
+    @contextlib.contextmanager
+    def acquire(self):
+        with self._semaphore:
+            client = self._get_client()
+            reusable = False
+            try:
+                yield client
+                reusable = True
+            except Exception as e:
+                reusable = not isinstance(e, client.errors)
+                raise
+            finally:
+                if reusable and client.connected:
+                    self._idle.append(client)
+                else:
+                    self._close_client(client)
+
+    def _get_client(self):
+        while self._idle:
+            # most recently used connection is the most likely to be alive
+            client = self._idle.pop()
+            if client.connected:
+                return client
+            self._close_client(client)
+        client = self._client_factory()
+        client.connect()
+        return client
+
+    @staticmethod
+    def _close_client(client):
+        try:
+            client.close()
+        except Exception as e:
+            LOG.debug('Error closing RabbitMQ connection: {error}'.format(
+                error=e))
+
+    def close(self):
+        while self._idle:
+            self._close_client(self._idle.pop())
+
+
+_pools = {}
+
+
+def get_pool(max_size=10, **settings):
+    """Returns connection pool for the broker with given settings"""
+
+    key = tuple(sorted(settings.items()))
+    pool = _pools.get(key)
+    if pool is None:
+        pool = ConnectionPool(lambda: MqClient(**settings), max_size)
+        _pools[key] = pool
+    return pool
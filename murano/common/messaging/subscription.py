@@ -28,16 +28,40 @@ class Subscription(object):
     def __init__(self, connection, queue, prefetch_count=1):
         self._buffer = collections.deque()
         self._connection = connection
-        self._queue = kombu.Queue(name=queue, exchange=None)
+        self._queue = None if queue is None else kombu.Queue(
+            name=queue, exchange=None)
         self._consumer = kombu.Consumer(self._connection, auto_declare=False)
         self._consumer.register_callback(self._receive)
         self._consumer.qos(prefetch_count=prefetch_count)
+        # only AMQP brokers can acknowledge several messages at once
+        self._multiple_ack = (
+            getattr(connection.transport, 'driver_type', None) == 'amqp')
 
     def __enter__(self):
-        self._consumer.add_queue(self._queue)
-        self._consumer.consume()
+        if self._queue is not None:
+            self.add_queue(self._queue.name)
         return self
 
+    def add_queue(self, queue):
+        self._consumer.add_queue(kombu.Queue(name=queue, exchange=None))
+        self._consumer.consume()
+
+    def remove_queue(self, queue):
+        self._consumer.cancel_by_queue(queue)
+
+    def ack(self, messages):
+        """Acknowledges messages received by this subscription at once"""
+
+        if not messages:
+            return
+        if self._multiple_ack:
+            # messages are not necessarily handled in the delivery order
+            max(messages, key=lambda msg: msg.delivery_tag).ack(
+                multiple=True)
+        else:
+            for msg in messages:
+                msg.ack()
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self._consumer is not None:
             self._consumer.cancel()
@@ -55,7 +79,7 @@ class Subscription(object):
         while True:
             time_start = time.time()
             if self._buffer:
-                return self._buffer.pop()
+                return self._buffer.popleft()
             try:
                 self._connection.drain_events(timeout=timeout and remaining)
             except socket.timeout:
@@ -0,0 +1,87 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""In-process notifications about deployment progress
+
+The notification service and the result endpoint publish the ID of the
+environment whenever they record new status reports or change the
+environment state. Long-poll requests of the same API process subscribe
+to these notifications to answer as soon as there is something new.
+Notifications carry no data: subscribers always re-read the database,
+which stays the only source of truth. Changes recorded by other API
+processes are not published here, so subscribers must also re-check the
+database periodically.
+"""
+
+import collections
+import contextlib
+
+import eventlet
+import eventlet.event
+
+
+class Subscription(object):
+    def __init__(self):
+        self._event = eventlet.event.Event()
+
+    def notify(self):
+        if not self._event.ready():
+            self._event.send()
+
+    def wait(self, timeout):
+        """Waits for a notification
+
+        Notifications that were published after the previous wait() call
+        are not lost.
+
+        :return: True if there was a notification, False on timeout
+        """
+        with eventlet.Timeout(timeout, False):
+            self._event.wait()
+        if self._event.ready():
+            self._event = eventlet.event.Event()
+            return True
+        return False
+
+
+class ProgressHub(object):
+    def __init__(self):
+        self._subscriptions = collections.defaultdict(set)
+
+    @contextlib.contextmanager
+    def subscribe(self, environment_id):
+        subscription = Subscription()
+        self._subscriptions[environment_id].add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscriptions = self._subscriptions[environment_id]
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[environment_id]
+
+    def publish(self, environment_id):
+        for subscription in self._subscriptions.get(environment_id, ()):
+            subscription.notify()
+
+
+_hub = ProgressHub()
+
+
+def subscribe(environment_id):
+    return _hub.subscribe(environment_id)
+
+
+def publish(environment_id):
+    _hub.publish(environment_id)
@@ -21,9 +21,12 @@ from oslo_messaging import target
 from oslo_service import service
 from oslo_utils import timeutils
 import pytz
+import six
 from sqlalchemy import desc
 
 from murano.common.helpers import token_sanitizer
+from murano.common import progress
+from murano.common import uuidutils
 from murano.db import models
 from murano.db.services import environments
 from murano.db.services import instances
@@ -56,6 +59,7 @@ class ResultEndpoint(object):
 
         if model['Objects'] is None and model.get('ObjectsCopy', {}) is None:
             environments.EnvironmentServices.remove(environment_id)
+            progress.publish(environment_id)
             return
 
         environment.description = model
@@ -106,6 +110,7 @@ class ResultEndpoint(object):
         else:
             conf_session.state = states.SessionState.DEPLOYED
         conf_session.save(unit)
+        progress.publish(environment.id)
 
         # output application tracking information
         services = []
@@ -169,18 +174,30 @@ def untrack_instance(payload):
         instance_id, environment_id)
 
 
+def _prepare_report(report):
+    report['entity_id'] = report.pop('id')
+    if 'timestamp' in report:
+        dt = timeutils.parse_isotime(report.pop('timestamp'))
+        report['created'] = dt.astimezone(pytz.utc).replace(tzinfo=None)
+    return report
+
+
+@notification_endpoint_wrapper()
+def track_instances(payload):
+    changes = payload['changes']
+    LOG.debug('Got {count} instance tracking changes from orchestration '
+              'engine'.format(count=len(changes)))
+    instances.InstanceStatsServices.track_instances(
+        payload['environment'], changes)
+
+
 @notification_endpoint_wrapper()
 def report_notification(report):
     LOG.debug('Got report from orchestration '
               'engine:\n{report}'.format(report=report))
 
-    report['entity_id'] = report.pop('id')
-
     status = models.Status()
-    if 'timestamp' in report:
-        dt = timeutils.parse_isotime(report.pop('timestamp'))
-        report['created'] = dt.astimezone(pytz.utc).replace(tzinfo=None)
-    status.update(report)
+    status.update(_prepare_report(report))
 
     unit = session.get_session()
     # connect with deployment
@@ -189,6 +206,39 @@ def report_notification(report):
                                                  status.environment_id)
         status.task_id = running_deployment.id
         unit.add(status)
+    progress.publish(status.environment_id)
+
+
+@notification_endpoint_wrapper()
+def report_notification_batch(payload):
+    reports = payload['reports']
+    LOG.debug('Got {count} reports from orchestration engine'.format(
+        count=len(reports)))
+    if not reports:
+        return
+
+    columns = set(column.name for column in models.Status.__table__.columns)
+    now = timeutils.utcnow()
+    rows = []
+    for report in reports:
+        row = dict((key, value)
+                   for key, value in six.iteritems(_prepare_report(report))
+                   if key in columns)
+        row.setdefault('created', now)
+        row['updated'] = now
+        rows.append(row)
+    # stable sort keeps the order of reports with equal timestamps
+    rows.sort(key=lambda row: row['created'])
+
+    unit = session.get_session()
+    with unit.begin():
+        running_deployment = get_last_deployment(unit,
+                                                 payload['environment_id'])
+        for row in rows:
+            row['id'] = uuidutils.generate_uuid()
+            row['task_id'] = running_deployment.id
+        unit.bulk_insert_mappings(models.Status, rows)
+    progress.publish(payload['environment_id'])
 
 
 def get_last_deployment(unit, env_id):
@@ -224,7 +274,8 @@ class NotificationService(Service):
         self.server = None
 
     def start(self):
-        endpoints = [report_notification, track_instance, untrack_instance]
+        endpoints = [report_notification, report_notification_batch,
+                     track_instance, untrack_instance, track_instances]
 
         transport = messaging.get_transport(CONF)
         s_target = target.Target(topic='murano', server=str(uuid.uuid4()))
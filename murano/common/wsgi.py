@@ -21,6 +21,7 @@ import re
 import socket
 import sys
 import time
+import types
 from xml.dom import minidom
 from xml.parsers import expat
 
@@ -439,6 +440,10 @@ class Resource(object):
         with ResourceExceptionHandler():
             action_result = self.execute_action(action, request, **action_args)
 
+        # controller has built the response itself, e.g. to stream a file
+        if isinstance(action_result, webob.Response):
+            return action_result
+
         try:
             return self.serialize_response(action, action_result, accept)
         # return unserializable result (typically a webob exc)
@@ -529,17 +534,63 @@ class DictSerializer(ActionDispatcher):
 
 
 class JSONDictSerializer(DictSerializer):
-    """Default JSON request body serialization."""
+    """Default JSON request body serialization.
+
+    Generators that are values of the top-level dict are serialized as
+    JSON arrays lazily. In that case an iterator of body chunks is
+    returned instead of the body so that large result sets do not have
+    to be held in memory. If a generator fails, the error is logged and
+    the iterator re-raises it without closing the JSON document.
+    """
+
+    STREAM_CHUNK_SIZE = 100
+
+    @staticmethod
+    def _sanitizer(obj):
+        if isinstance(obj, datetime.datetime):
+            _dtime = obj - datetime.timedelta(microseconds=obj.microsecond)
+            return _dtime.isoformat()
+        return six.text_type(obj)
 
     def default(self, data, result=None):
-        def sanitizer(obj):
-            if isinstance(obj, datetime.datetime):
-                _dtime = obj - datetime.timedelta(microseconds=obj.microsecond)
-                return _dtime.isoformat()
-            return six.text_type(obj)
         if result:
             data.body = jsonutils.dump_as_bytes(result)
-        return jsonutils.dump_as_bytes(data, default=sanitizer)
+        if isinstance(data, dict) and any(
+                isinstance(value, types.GeneratorType)
+                for value in six.itervalues(data)):
+            return self._stream(data)
+        return jsonutils.dump_as_bytes(data, default=self._sanitizer)
+
+    def _stream(self, data):
+        def dump(value):
+            return jsonutils.dump_as_bytes(value, default=self._sanitizer)
+
+        try:
+            yield b'{'
+            for i, (key, value) in enumerate(six.iteritems(data)):
+                prefix = b', ' if i else b''
+                if not isinstance(value, types.GeneratorType):
+                    yield prefix + dump(key) + b': ' + dump(value)
+                    continue
+                chunk = [prefix + dump(key) + b': [']
+                for j, item in enumerate(value):
+                    chunk.append((b', ' if j else b'') + dump(item))
+                    if len(chunk) >= self.STREAM_CHUNK_SIZE:
+                        yield b''.join(chunk)
+                        chunk = []
+                chunk.append(b']')
+                yield b''.join(chunk)
+            yield b'}'
+        except Exception:
+            # the status line has already been sent, so the only way to
+            # tell the client that the body is incomplete is to abort
+            # the response instead of finishing it as valid JSON
+            LOG.exception(_LE('Failed to stream response body'))
+            raise
+        finally:
+            for value in six.itervalues(data):
+                if isinstance(value, types.GeneratorType):
+                    value.close()
 
 
 class XMLDictSerializer(DictSerializer):
@@ -692,7 +743,11 @@ class ResponseSerializer(object):
         response.headers['Content-Type'] = content_type
         if data is not None:
             serializer = self.get_body_serializer(content_type)
-            response.body = serializer.serialize(data, action)
+            body = serializer.serialize(data, action)
+            if isinstance(body, types.GeneratorType):
+                response.app_iter = body
+            else:
+                response.body = body
 
     def get_body_serializer(self, content_type):
         try:
@@ -768,7 +823,9 @@ class RequestDeserializer(object):
         return self.headers_deserializer.deserialize(request, action)
 
     def deserialize_body(self, request, action):
-        if not len(request.body) > 0:
+        # Content-Length is checked first, so that large bodies (e.g.
+        # package archives) are not read into memory here
+        if not (request.content_length or len(request.body) > 0):
             LOG.debug("Empty body provided in request")
             return {}
 
@@ -19,15 +19,15 @@ from oslo_log import log as logging
 import six
 import sqlalchemy as sa
 from sqlalchemy import or_
-from sqlalchemy.orm import attributes
 # TODO(ruhe) use exception declared in openstack/common/db
 from webob import exc
 
+from murano.common import exceptions
+from murano.db.catalog import search
 from murano.db import models
 from murano.db import session as db_session
 from murano.common.i18n import _, _LW
 
-
 SEARCH_MAPPING = {'fqn': 'fully_qualified_name',
                   'name': 'name',
                   'created': 'created'
@@ -35,6 +35,9 @@ SEARCH_MAPPING = {'fqn': 'fully_qualified_name',
 
 LOG = logging.getLogger(__name__)
 
+# archives of packages are stored by parts of this size
+ARCHIVE_CHUNK_SIZE = 1024 * 1024
+
 
 def _package_get(package_id, session):
     # TODO(sjmc7): update openstack/common and pull in
@@ -79,6 +82,80 @@ def package_get(package_id, context):
     return package
 
 
+def package_get_blob(package_id, name):
+    """Return large column (archive, logo, etc.) of the package
+
+       :param package_id: ID of the package
+       :param name: name of the column
+       :returns: column value
+    """
+    session = db_session.get_session()
+    return session.query(getattr(models.Package, name)).filter(
+        models.Package.id == package_id).scalar()
+
+
+def package_archive_size(package_id):
+    """Return size of the archive of the package in bytes
+
+       :param package_id: ID of the package
+       :returns: size, 0 if the package has no archive
+    """
+    session = db_session.get_session()
+    last_chunk = session.query(
+        models.PackageArchiveChunk.position,
+        sa.func.length(models.PackageArchiveChunk.data)).filter_by(
+        package_id=package_id).order_by(
+        models.PackageArchiveChunk.position.desc()).first()
+    if last_chunk is None:
+        return 0
+    position, length = last_chunk
+    return position + length
+
+
+def package_archive_read(package_id, start=0, stop=None):
+    """Read the archive of the package by chunks
+
+       Chunks are fetched one at a time, so that the archive is not
+       loaded into memory as a whole, in a single transaction, so that
+       they are read from one snapshot of the database.
+
+       :param package_id: ID of the package
+       :param start: offset of the first byte to read
+       :param stop: offset of the byte after the last one to read, the end
+                    of the archive if None
+       :returns: iterator over bytes of the archive
+       :raises PackageArchiveTruncated: if the archive ends before stop
+                                        or a part of it is missing
+    """
+    session = db_session.get_session()
+    chunk_model = models.PackageArchiveChunk
+    with session.begin():
+        chunks = session.query(
+            chunk_model.position, sa.func.length(chunk_model.data)).filter_by(
+            package_id=package_id).order_by(chunk_model.position).all()
+        offset = 0
+        for position, length in chunks:
+            if position != offset:
+                break
+            offset += length
+            if offset <= start:
+                continue
+            if stop is not None and position >= stop:
+                break
+            data = session.query(chunk_model.data).filter_by(
+                package_id=package_id, position=position).scalar()
+            if data is None or len(data) != length:
+                offset = position
+                break
+            yield data[max(start - position, 0):
+                       None if stop is None else stop - position]
+        # headers of the response are sent by the time the archive is read,
+        # so a shorter archive must fail rather than look complete
+        if stop is not None and offset < stop:
+            raise exceptions.PackageArchiveTruncated(
+                package_id=package_id, offset=offset, stop=stop)
+
+
 def _get_categories(category_names, session=None):
     """Return existing category objects or raise an exception.
 
@@ -270,6 +347,8 @@ def package_update(pkg_id_or_name, changes, context):
                                             ignore_package_with_id=pkg.id)
 
         session.add(pkg)
+        session.flush()
+        search.update_index(pkg, session)
     return pkg
 
 
@@ -289,6 +368,10 @@ def package_search(filters, context, manage_public=False,
         The typical pattern of limit and marker is to make an initial limited
         request and then to use the ID of the last package from the response
         as the marker parameter in a subsequent limited request.
+      * Search (inside filters param) returns packages which name, fqn,
+        description, author, tags, categories or class names contain words
+        starting with any of the given words. Unless order_by is given,
+        the most relevant packages are returned first.
     """
     # pylint: disable=too-many-branches
 
@@ -336,40 +419,35 @@ def package_search(filters, context, manage_public=False,
     if 'name' in filters.keys():
         query = query.filter(pkg.name == filters['name'])
 
+    rank = None
     if 'search' in filters.keys():
-        fk_fields = {'categories': 'Category',
-                     'tags': 'Tag',
-                     'class_definitions': 'Class'}
-        conditions = []
+        words = search.split_words(filters['search'])
+        if words:
+            rank = search.rank_query(session, words)
+            query = query.join(rank, rank.c.package_id == pkg.id)
 
-        for attr in dir(pkg):
-            if attr.startswith('_'):
-                continue
-            if isinstance(getattr(pkg, attr),
-                          attributes.InstrumentedAttribute):
-                search_str = filters['search']
-                for delim in ',;':
-                    search_str = search_str.replace(delim, ' ')
-                for key_word in search_str.split():
-                    _word = u'%{value}%'.format(value=key_word)
-                    if attr in fk_fields.keys():
-                        condition = getattr(pkg, attr).any(
-                            getattr(models, fk_fields[attr]).name.like(_word))
-                        conditions.append(condition)
-                    elif isinstance(getattr(pkg, attr)
-                                    .property.columns[0].type, sa.String):
-                        conditions.append(getattr(pkg, attr).like(_word))
-        query = query.filter(or_(*conditions))
+    marker = filters.get('marker')
+    if marker is not None:  # set marker to real object instead of its id
+        marker = _package_get(marker, session)
+
+    if rank is not None and 'order_by' not in filters:
+        # most relevant packages go first
+        if marker is not None:
+            marker_rank = session.query(rank.c.rank).filter(
+                rank.c.package_id == marker.id).scalar() or 0
+            query = query.filter(or_(
+                rank.c.rank < marker_rank,
+                sa.and_(rank.c.rank == marker_rank, pkg.id > marker.id)))
+        query = query.order_by(rank.c.rank.desc(), pkg.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
 
     sort_keys = [SEARCH_MAPPING[sort_key] for sort_key in
                  filters.get('order_by', ['name'])]
     sort_keys.append('id')
-    marker = filters.get('marker')
     sort_dir = filters.get('sort_dir')
 
-    if marker is not None:  # set marker to real object instead of its id
-        marker = _package_get(marker, session)
-
     query = utils.paginate_query(
         query, pkg, limit, sort_keys, marker, sort_dir)
 
@@ -380,12 +458,24 @@ def package_search(filters, context, manage_public=False,
 def package_upload(values, tenant_id):
     """Upload a package with new application
 
-       :param values: parameters describing the new package
+       :param values: parameters describing the new package. Archive may
+                      be given either as bytes or as a seekable file-like
+                      object, which is read by parts when the package
+                      is inserted
        :returns: detailed information about new package, dict
     """
     session = db_session.get_session()
     package = models.Package()
 
+    archive = values.get('archive')
+    if hasattr(archive, 'read'):
+        # the call may be retried, so the file is rewound and values are
+        # not modified
+        archive.seek(0)
+        values = dict(values)
+    elif archive is not None:
+        archive = six.BytesIO(archive)
+
     composite_attr_to_func = {'categories': _get_categories,
                               'tags': _get_tags,
                               'class_definitions': _get_class_definitions}
@@ -408,9 +498,13 @@ def package_upload(values, tenant_id):
                 result = func(values[attr], session)
                 setattr(package, attr, result)
                 del values[attr]
-        package.update(values)
+        package.update(dict((k, v) for k, v in six.iteritems(values)
+                            if k != 'archive'))
         package.owner_id = tenant_id
         package.save(session)
+        if archive is not None:
+            _save_archive(package.id, archive, session)
+        search.update_index(package, session)
         tenant_lock.commit()
         if public_lock is not None:
             public_lock.commit()
@@ -423,6 +517,25 @@ def package_upload(values, tenant_id):
     return package
 
 
+def _save_archive(package_id, archive, session):
+    """Insert the archive of the package by chunks
+
+       Every chunk is flushed and then dropped from the session, so that
+       no more than one chunk of the archive is held in memory.
+    """
+    position = 0
+    while True:
+        data = archive.read(ARCHIVE_CHUNK_SIZE)
+        if not data:
+            break
+        chunk = models.PackageArchiveChunk(package_id=package_id,
+                                           position=position, data=data)
+        session.add(chunk)
+        session.flush()
+        session.expunge(chunk)
+        position += len(data)
+
+
 @oslo_db_api.wrap_db_retry(max_retries=5, retry_on_deadlock=True)
 def package_delete(package_id, context):
     """Delete a package by ID."""
@@ -434,6 +547,9 @@ def package_delete(package_id, context):
             raise exc.HTTPForbidden(
                 explanation="Package is not owned by the"
                             " tenant '{0}'".format(context.tenant))
+        search.delete_index(package.id, session)
+        session.query(models.PackageArchiveChunk).filter_by(
+            package_id=package.id).delete()
         session.delete(package)
 
 
@@ -0,0 +1,118 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Search index of the package catalog
+
+Searchable fields of a package are split into terms which are stored in the
+package_search_term table. Each word of a value is a term, and so is each
+alphanumeric part of a compound word, so that 'io.murano.apps.Apache' is
+found both by itself and by 'apache'. A search word matches terms it is a
+prefix of, and packages are ranked by the sum of weights of the fields
+matched.
+"""
+
+import re
+
+import six
+import sqlalchemy as sa
+
+from murano.db import models
+
+# weights of the fields used to rank search results
+FIELD_WEIGHTS = {
+    'name': 10,
+    'fully_qualified_name': 8,
+    'tags': 5,
+    'categories': 4,
+    'class_definitions': 3,
+    'author': 2,
+    'description': 1
+}
+
+TERM_LENGTH = 128
+
+_DELIMITERS = re.compile(r'[\s,;]+', re.UNICODE)
+_PARTS_DELIMITERS = re.compile(r'[\W_]+', re.UNICODE)
+
+
+def split_words(text):
+    """Splits search string into lowercase words
+
+    Words are separated by whitespaces, commas and semicolons.
+    """
+    words = []
+    for word in _DELIMITERS.split(six.text_type(text).lower()):
+        word = word[:TERM_LENGTH]
+        if word and word not in words:
+            words.append(word)
+    return words
+
+
+def get_terms(value):
+    """Returns set of terms of the field value"""
+    terms = set()
+    for word in split_words(value or ''):
+        terms.add(word)
+        terms.update(part for part in _PARTS_DELIMITERS.split(word) if part)
+    return terms
+
+
+def _get_field_values(package, field):
+    value = getattr(package, field)
+    if field in ('tags', 'categories', 'class_definitions'):
+        return [item.name for item in value]
+    return [value]
+
+
+def update_index(package, session):
+    """Replaces terms of the package in the search index
+
+    Should be called within transaction of the session after the package
+    is flushed.
+    """
+    delete_index(package.id, session)
+    for field, weight in six.iteritems(FIELD_WEIGHTS):
+        terms = set()
+        for value in _get_field_values(package, field):
+            terms.update(get_terms(value))
+        session.add_all(
+            models.PackageSearchTerm(package_id=package.id, field=field,
+                                     term=term, weight=weight)
+            for term in terms)
+
+
+def delete_index(package_id, session):
+    session.query(models.PackageSearchTerm).filter_by(
+        package_id=package_id).delete(synchronize_session=False)
+
+
+def _escape_like(word):
+    for char in ('\\', '%', '_'):
+        word = word.replace(char, '\\' + char)
+    return word
+
+
+def rank_query(session, words):
+    """Builds subquery of packages matching any of the words
+
+    The subquery has columns package_id and rank. Rank of a package is the
+    sum of weights of its terms the words are prefixes of.
+    """
+    term = models.PackageSearchTerm
+    conditions = [term.term.like(_escape_like(word) + '%', escape='\\')
+                  for word in words]
+    return session.query(
+        term.package_id.label('package_id'),
+        sa.func.sum(term.weight).label('rank')).filter(
+        sa.or_(*conditions)).group_by(term.package_id).subquery()
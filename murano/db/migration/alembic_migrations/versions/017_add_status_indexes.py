@@ -0,0 +1,40 @@
+# Copyright 2016 OpenStack Foundation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Add indexes on the status table for per-deployment queries
+
+Revision ID: 017
+Revises: 016
+Create Date: 2016-10-19 12:00:00
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '017'
+down_revision = '016'
+
+from alembic import op
+
+
+def upgrade():
+    op.create_index('ix_status_task_id_created', 'status',
+                    ['task_id', 'created'])
+    op.create_index('ix_status_task_id_level', 'status',
+                    ['task_id', 'level'])
+
+
+def downgrade():
+    op.drop_index('ix_status_task_id_level', table_name='status')
+    op.drop_index('ix_status_task_id_created', table_name='status')
@@ -0,0 +1,114 @@
+# Copyright 2016 OpenStack Foundation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Store applications of session object models in a separate table
+
+Revision ID: 018
+Revises: 017
+Create Date: 2016-10-19 14:00:00
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '018'
+down_revision = '017'
+
+from alembic import op
+from oslo_serialization import jsonutils
+import sqlalchemy as sa
+import sqlalchemy.dialects.mysql as sa_mysql
+
+MYSQL_ENGINE = 'InnoDB'
+MYSQL_CHARSET = 'utf8'
+DATA_TYPE = sa.Text().with_variant(sa_mysql.LONGTEXT(), 'mysql')
+
+session_table = sa.table(
+    'session',
+    sa.column('id', sa.String),
+    sa.column('description', sa.Text))
+
+application_table = sa.table(
+    'session_application',
+    sa.column('session_id', sa.String),
+    sa.column('position', sa.Integer),
+    sa.column('app_id', sa.String),
+    sa.column('data', sa.Text))
+
+
+def _get_id(data):
+    if isinstance(data, dict) and isinstance(data.get('?'), dict):
+        return data['?'].get('id')
+    return None
+
+
+def upgrade():
+    op.create_table(
+        'session_application',
+        sa.Column('session_id', sa.String(length=36), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False,
+                  autoincrement=False),
+        sa.Column('app_id', sa.String(length=255), nullable=True),
+        sa.Column('data', DATA_TYPE, nullable=False),
+        sa.ForeignKeyConstraint(['session_id'], ['session.id'], ),
+        sa.PrimaryKeyConstraint('session_id', 'position'),
+        mysql_engine=MYSQL_ENGINE,
+        mysql_charset=MYSQL_CHARSET)
+    op.create_index('ix_session_application_session_id_app_id',
+                    'session_application', ['session_id', 'app_id'])
+
+    engine = op.get_bind()
+    sessions = engine.execute(sa.select(
+        [session_table.c.id, session_table.c.description])).fetchall()
+    for session_id, text in sessions:
+        description = jsonutils.loads(text)
+        objects = description.get('Objects')
+        if objects is None or 'services' not in objects:
+            continue
+        services = objects.pop('services') or []
+        if services:
+            op.bulk_insert(application_table, [
+                {'session_id': session_id, 'position': i,
+                 'app_id': _get_id(data), 'data': jsonutils.dumps(data)}
+                for i, data in enumerate(services)])
+        engine.execute(session_table.update().where(
+            session_table.c.id == session_id).values(
+            description=jsonutils.dumps(description)))
+
+
+def downgrade():
+    engine = op.get_bind()
+    applications = {}
+    for session_id, data in engine.execute(
+            sa.select([application_table.c.session_id,
+                       application_table.c.data]).order_by(
+                application_table.c.session_id,
+                application_table.c.position)):
+        applications.setdefault(session_id, []).append(jsonutils.loads(data))
+
+    sessions = engine.execute(sa.select(
+        [session_table.c.id, session_table.c.description])).fetchall()
+    for session_id, text in sessions:
+        description = jsonutils.loads(text)
+        objects = description.get('Objects')
+        if objects is None or 'services' in objects:
+            continue
+        objects['services'] = applications.get(session_id, [])
+        engine.execute(session_table.update().where(
+            session_table.c.id == session_id).values(
+            description=jsonutils.dumps(description)))
+
+    op.drop_index('ix_session_application_session_id_app_id',
+                  table_name='session_application')
+    op.drop_table('session_application')
@@ -0,0 +1,134 @@
+# Copyright 2016 OpenStack Foundation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Add search index of the package catalog
+
+Revision ID: 019
+Revises: 018
+Create Date: 2016-10-19 15:00:00
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '019'
+down_revision = '018'
+
+import re
+
+from alembic import op
+import six
+import sqlalchemy as sa
+
+MYSQL_ENGINE = 'InnoDB'
+MYSQL_CHARSET = 'utf8'
+
+# the same as in murano.db.catalog.search at the time of the migration
+FIELD_WEIGHTS = {
+    'name': 10,
+    'fully_qualified_name': 8,
+    'tags': 5,
+    'categories': 4,
+    'class_definitions': 3,
+    'author': 2,
+    'description': 1
+}
+TERM_LENGTH = 128
+DELIMITERS = re.compile(r'[\s,;]+', re.UNICODE)
+PARTS_DELIMITERS = re.compile(r'[\W_]+', re.UNICODE)
+
+package_table = sa.table(
+    'package',
+    sa.column('id', sa.String),
+    sa.column('name', sa.String),
+    sa.column('fully_qualified_name', sa.String),
+    sa.column('author', sa.String),
+    sa.column('description', sa.Text))
+
+term_table = sa.table(
+    'package_search_term',
+    sa.column('package_id', sa.String),
+    sa.column('field', sa.String),
+    sa.column('term', sa.String),
+    sa.column('weight', sa.Integer))
+
+
+def _get_terms(value):
+    terms = set()
+    for word in DELIMITERS.split(six.text_type(value or '').lower()):
+        word = word[:TERM_LENGTH]
+        if word:
+            terms.add(word)
+            terms.update(part for part in PARTS_DELIMITERS.split(word)
+                         if part)
+    return terms
+
+
+def _get_names(engine, query):
+    names = {}
+    for package_id, name in engine.execute(sa.text(query)):
+        names.setdefault(package_id, []).append(name)
+    return names
+
+
+def upgrade():
+    op.create_table(
+        'package_search_term',
+        sa.Column('package_id', sa.String(length=36), nullable=False),
+        sa.Column('field', sa.String(length=32), nullable=False),
+        sa.Column('term', sa.String(length=128), nullable=False),
+        sa.Column('weight', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['package_id'], ['package.id'], ),
+        sa.PrimaryKeyConstraint('package_id', 'field', 'term'),
+        mysql_engine=MYSQL_ENGINE,
+        mysql_charset=MYSQL_CHARSET)
+    op.create_index('ix_package_search_term_term',
+                    'package_search_term', ['term'])
+
+    engine = op.get_bind()
+    related = {
+        'tags': _get_names(
+            engine, 'SELECT package_id, tag.name FROM package_to_tag '
+                    'JOIN tag ON package_to_tag.tag_id = tag.id'),
+        'categories': _get_names(
+            engine, 'SELECT package_id, category.name '
+                    'FROM package_to_category JOIN category '
+                    'ON package_to_category.category_id = category.id'),
+        'class_definitions': _get_names(
+            engine, 'SELECT package_id, name FROM class_definition')
+    }
+    packages = engine.execute(sa.select([
+        package_table.c.id, package_table.c.name,
+        package_table.c.fully_qualified_name, package_table.c.author,
+        package_table.c.description])).fetchall()
+    for package in packages:
+        rows = []
+        for field, weight in six.iteritems(FIELD_WEIGHTS):
+            if field in related:
+                values = related[field].get(package.id, [])
+            else:
+                values = [package[field]]
+            terms = set()
+            for value in values:
+                terms.update(_get_terms(value))
+            rows.extend({'package_id': package.id, 'field': field,
+                         'term': term, 'weight': weight} for term in terms)
+        if rows:
+            op.bulk_insert(term_table, rows)
+
+
+def downgrade():
+    op.drop_index('ix_package_search_term_term',
+                  table_name='package_search_term')
+    op.drop_table('package_search_term')
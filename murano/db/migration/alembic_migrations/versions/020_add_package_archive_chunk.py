@@ -0,0 +1,96 @@
+# Copyright 2016 OpenStack Foundation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Store package archives by chunks
+
+Revision ID: 020
+Revises: 019
+Create Date: 2016-10-19 16:00:00
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '020'
+down_revision = '019'
+
+from alembic import op
+import sqlalchemy as sa
+
+from murano.db.sqla import types as st
+
+MYSQL_ENGINE = 'InnoDB'
+MYSQL_CHARSET = 'utf8'
+
+# the same as in murano.db.catalog.api at the time of the migration
+ARCHIVE_CHUNK_SIZE = 1024 * 1024
+
+package_table = sa.table(
+    'package',
+    sa.column('id', sa.String),
+    sa.column('archive', st.LargeBinary()))
+
+chunk_table = sa.table(
+    'package_archive_chunk',
+    sa.column('package_id', sa.String),
+    sa.column('position', sa.BigInteger),
+    sa.column('data', st.LargeBinary()))
+
+
+def upgrade():
+    op.create_table(
+        'package_archive_chunk',
+        sa.Column('package_id', sa.String(length=36), nullable=False),
+        sa.Column('position', sa.BigInteger(), nullable=False,
+                  autoincrement=False),
+        sa.Column('data', st.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(['package_id'], ['package.id'], ),
+        sa.PrimaryKeyConstraint('package_id', 'position'),
+        mysql_engine=MYSQL_ENGINE,
+        mysql_charset=MYSQL_CHARSET)
+
+    engine = op.get_bind()
+    package_ids = [row.id for row in engine.execute(
+        sa.select([package_table.c.id]).where(
+            package_table.c.archive.isnot(None)))]
+    # archives are moved one by one, so that only one of them is held in
+    # memory at a time
+    for package_id in package_ids:
+        archive = engine.execute(sa.select([package_table.c.archive]).where(
+            package_table.c.id == package_id)).scalar()
+        for position in range(0, len(archive), ARCHIVE_CHUNK_SIZE):
+            op.execute(chunk_table.insert().values(
+                package_id=package_id, position=position,
+                data=archive[position:position + ARCHIVE_CHUNK_SIZE]))
+
+    with op.batch_alter_table('package') as batch_op:
+        batch_op.drop_column('archive')
+
+
+def downgrade():
+    op.add_column('package', sa.Column('archive', st.LargeBinary(),
+                                       nullable=True))
+
+    engine = op.get_bind()
+    package_ids = [row.package_id for row in engine.execute(
+        sa.select([chunk_table.c.package_id]).distinct())]
+    for package_id in package_ids:
+        chunks = engine.execute(sa.select([chunk_table.c.data]).where(
+            chunk_table.c.package_id == package_id).order_by(
+            chunk_table.c.position))
+        op.execute(package_table.update().where(
+            package_table.c.id == package_id).values(
+            archive=b''.join(row.data for row in chunks)))
+
+    op.drop_table('package_archive_chunk')
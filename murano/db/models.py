@@ -122,15 +122,42 @@ class Session(Base, TimestampMixin):
     description = sa.Column(st.JsonBlob(), nullable=False)
     version = sa.Column(sa.BigInteger, nullable=False, default=0)
 
+    applications = sa_orm.relationship(
+        'SessionApplication', backref='session',
+        cascade='save-update, merge, delete')
+
     def to_dict(self):
         dictionary = super(Session, self).to_dict()
         del dictionary['description']
         # object relations may be not loaded yet
         if 'environment' in dictionary:
             del dictionary['environment']
+        if 'applications' in dictionary:
+            del dictionary['applications']
         return dictionary
 
 
+class SessionApplication(Base):
+    """Object model of an application of the session
+
+    Applications of the session object model are stored separately from
+    the rest of the model so that they could be read and modified without
+    (de)serializing the whole model.
+    """
+    __tablename__ = 'session_application'
+    __table_args__ = (sa.Index('ix_session_application_session_id_app_id',
+                               'session_id', 'app_id'),)
+
+    session_id = sa.Column(sa.String(36), sa.ForeignKey('session.id'),
+                           primary_key=True, nullable=False)
+    # position in the services list. Positions are not shifted when an
+    # application is deleted
+    position = sa.Column(sa.Integer, primary_key=True, nullable=False,
+                         autoincrement=False)
+    app_id = sa.Column(sa.String(255), nullable=True)
+    data = sa.Column(st.JsonBlob(), nullable=False)
+
+
 class Task(Base, TimestampMixin):
     __tablename__ = 'task'
 
@@ -157,6 +184,10 @@ class Task(Base, TimestampMixin):
 
 class Status(Base, TimestampMixin):
     __tablename__ = 'status'
+    __table_args__ = (
+        sa.Index('ix_status_task_id_created', 'task_id', 'created'),
+        sa.Index('ix_status_task_id_level', 'task_id', 'level'),
+    )
 
     id = sa.Column(sa.String(36),
                    primary_key=True,
@@ -237,7 +268,8 @@ class Package(Base, TimestampMixin):
     id = sa.Column(sa.String(36),
                    primary_key=True,
                    default=uuidutils.generate_uuid)
-    archive = sa.Column(st.LargeBinary())
+    # large columns are loaded only when accessed, so that listing
+    # packages does not read them. Archive is kept in PackageArchiveChunk
     fully_qualified_name = sa.Column(sa.String(128),
                                      nullable=False)
     type = sa.Column(sa.String(20), nullable=False, default='class')
@@ -253,10 +285,11 @@ class Package(Base, TimestampMixin):
                                secondary=package_to_tag,
                                cascade='save-update, merge',
                                lazy='joined')
-    logo = sa.Column(st.LargeBinary(), nullable=True)
+    logo = sa_orm.deferred(sa.Column(st.LargeBinary(), nullable=True))
     owner_id = sa.Column(sa.String(64), nullable=False)
-    ui_definition = sa.Column(sa.Text)
-    supplier_logo = sa.Column(sa.LargeBinary, nullable=True)
+    ui_definition = sa_orm.deferred(sa.Column(sa.Text))
+    supplier_logo = sa_orm.deferred(sa.Column(sa.LargeBinary,
+                                              nullable=True))
     categories = sa_orm.relationship("Category",
                                      secondary=package_to_category,
                                      cascade='save-update, merge',
@@ -268,7 +301,6 @@ class Package(Base, TimestampMixin):
     def to_dict(self):
         d = self.__dict__.copy()
         not_serializable = ['_sa_instance_state',
-                            'archive',
                             'logo',
                             'ui_definition',
                             'supplier_logo']
@@ -323,6 +355,39 @@ class Class(Base, TimestampMixin):
     package_id = sa.Column(sa.String(36), sa.ForeignKey('package.id'))
 
 
+class PackageSearchTerm(Base):
+    """Represents a term of the package search index.
+
+    Each row tells that a term occurs in a field (name, tag, etc.) of a
+    package. Weight of the row reflects importance of the field and is used
+    to rank search results.
+    """
+    __tablename__ = 'package_search_term'
+    __table_args__ = (sa.Index('ix_package_search_term_term', 'term'),)
+
+    package_id = sa.Column(sa.String(36), sa.ForeignKey('package.id'),
+                           primary_key=True, nullable=False)
+    field = sa.Column(sa.String(32), primary_key=True, nullable=False)
+    term = sa.Column(sa.String(128), primary_key=True, nullable=False)
+    weight = sa.Column(sa.Integer, nullable=False)
+
+
+class PackageArchiveChunk(Base):
+    """Represents a part of the archive of a package.
+
+    Archives are stored by parts so that they can be written and read
+    without being held in memory as a whole.
+    """
+    __tablename__ = 'package_archive_chunk'
+
+    package_id = sa.Column(sa.String(36), sa.ForeignKey('package.id'),
+                           primary_key=True, nullable=False)
+    # offset of the first byte of the chunk in the archive
+    position = sa.Column(sa.BigInteger, primary_key=True, nullable=False,
+                         autoincrement=False)
+    data = sa.Column(st.LargeBinary(), nullable=False)
+
+
 class Lock(Base):
     __tablename__ = 'locks'
     id = sa.Column(sa.String(50), primary_key=True)
@@ -365,17 +430,17 @@ class CFServiceInstance(Base):
 
 def register_models(engine):
     """Creates database tables for all models with the given engine."""
-    models = (Environment, Status, Session, Task,
-              ApiStats, Package, Category, Class, Instance, Lock, CFSpace,
-              CFOrganization)
+    models = (Environment, Status, Session, SessionApplication, Task,
+              ApiStats, Package, Category, Class, PackageSearchTerm,
+              PackageArchiveChunk, Instance, Lock, CFSpace, CFOrganization)
     for model in models:
         model.metadata.create_all(engine)
 
 
 def unregister_models(engine):
     """Drops database tables for all models with the given engine."""
-    models = (Environment, Status, Session, Task,
-              ApiStats, Package, Category, Class, Lock, CFOrganization,
-              CFSpace)
+    models = (Environment, Status, Session, SessionApplication, Task,
+              ApiStats, Package, Category, Class, PackageSearchTerm,
+              PackageArchiveChunk, Lock, CFOrganization, CFSpace)
     for model in models:
         model.metadata.drop_all(engine)
@@ -22,14 +22,14 @@ def get_environment(session, unit):
 
 
 def update_task(action, session, task, unit):
-    objects = session.description.get('Objects', None)
+    objects = task['model'].get('Objects', None)
     session.state = states.SessionState.DELETING if objects is None \
         else states.SessionState.DEPLOYING
     task_info = models.Task()
     task_info.environment_id = session.environment_id
     if objects:
         task_info.description = token_sanitizer.TokenSanitizer().sanitize(
-            dict(session.description.get('Objects')))
+            dict(objects))
     task_info.action = task['action']
     status = models.Status()
     status.text = 'Action {0} is scheduled'.format(action)
@@ -20,13 +20,15 @@ from murano.common.i18n import _
 from murano.common import utils
 from murano.db.services import environment_templates as env_temp
 from murano.db.services import environments as envs
+from murano.db.services import session_model
+from murano.db import session as db_session
 
 LOG = logging.getLogger(__name__)
 
 
 class CoreServices(object):
     @staticmethod
-    def get_service_status(environment_id, service_id):
+    def get_service_status(environment_id, service_id, env_status=None):
         """Service can have one of three distinguished statuses:
 
          - Deploying: if environment has status deploying and there is at least
@@ -38,31 +40,55 @@ class CoreServices(object):
         :param environment_id: Service environment, we always know to which
             environment service belongs to
         :param service_id: Id of service for which we checking status.
+        :param env_status: status of the environment if already known
         :return: Service status
         """
         # Now we assume that service has same status as environment.
         # TODO(ruhe): implement as designed and described above
 
+        if env_status is not None:
+            return env_status
         return envs.EnvironmentServices.get_status(environment_id)
 
     @staticmethod
-    def get_data(environment_id, path, session_id=None):
-        get_description = envs.EnvironmentServices.get_environment_description
+    def get_data(environment_id, path, session_id=None, env_status=None):
+        application = _get_application_path(path)
+        session = None
+        if session_id and application is not None:
+            session = envs.EnvironmentServices.get_draft_session(session_id)
+
+        if session is not None and \
+                session_model.SessionModelServices.is_split(session):
+            key, app_path = application
+            if key is None:
+                result = [app.data for app in session_model.
+                          SessionModelServices.get_applications(session.id)]
+            else:
+                result = utils.TraverseHelper.get(
+                    app_path, _find_application(session.id, key).data)
+        else:
+            get_description = \
+                envs.EnvironmentServices.get_environment_description
 
-        env_description = get_description(environment_id, session_id)
+            env_description = get_description(environment_id, session_id)
 
-        if env_description is None:
-            return None
+            if env_description is None:
+                return None
 
-        if 'services' not in env_description:
-            return []
+            if 'services' not in env_description:
+                return []
 
-        result = utils.TraverseHelper.get(path, env_description)
+            result = utils.TraverseHelper.get(path, env_description)
 
         if path == '/services':
             get_status = CoreServices.get_service_status
+            if env_status is None and result:
+                # the same for all the services
+                env_status = envs.EnvironmentServices.get_status(
+                    environment_id)
             for srv in result:
-                srv['?']['status'] = get_status(environment_id, srv['?']['id'])
+                srv['?']['status'] = get_status(
+                    environment_id, srv['?']['id'], env_status)
 
         return result
 
@@ -159,6 +185,14 @@ class CoreServices(object):
 
     @staticmethod
     def post_data(environment_id, session_id, data, path):
+        session = envs.EnvironmentServices.get_draft_session(session_id)
+        if session is not None and \
+                session_model.SessionModelServices.is_split(session):
+            if path == '/services':
+                session_model.SessionModelServices.add_applications(
+                    session.id, data if isinstance(data, list) else [data])
+            return data
+
         get_description = envs.EnvironmentServices.get_environment_description
         save_description = envs.EnvironmentServices.\
             save_environment_description
@@ -185,6 +219,31 @@ class CoreServices(object):
 
     @staticmethod
     def put_data(environment_id, session_id, data, path):
+        application = _get_application_path(path)
+        session = envs.EnvironmentServices.get_draft_session(session_id)
+        if application is not None and application[0] is not None and \
+                session is not None and \
+                session_model.SessionModelServices.is_split(session):
+            key, app_path = application
+            app = _find_application(session.id, key)
+            if app_path == '/':
+                app_data = data
+            else:
+                app_data = app.data
+                utils.TraverseHelper.update(app_path, data, app_data)
+            unit = db_session.get_session()
+            with unit.begin():
+                session_model.SessionModelServices.save_application(
+                    app, app_data, unit)
+                description = dict(session.description)
+                description['Objects'] = dict(description['Objects'])
+                description['Objects']['?'] = dict(
+                    description['Objects']['?'],
+                    updated=str(timeutils.utcnow()))
+                session.description = description
+                unit.add(session)
+            return data
+
         get_description = envs.EnvironmentServices.get_environment_description
         save_description = envs.EnvironmentServices.\
             save_environment_description
@@ -200,6 +259,24 @@ class CoreServices(object):
 
     @staticmethod
     def delete_data(environment_id, session_id, path):
+        application = _get_application_path(path)
+        session = envs.EnvironmentServices.get_draft_session(session_id)
+        if application is not None and application[0] is not None and \
+                session is not None and \
+                session_model.SessionModelServices.is_split(session):
+            key, app_path = application
+            app = _find_application(session.id, key)
+            unit = db_session.get_session()
+            with unit.begin():
+                if app_path == '/':
+                    unit.delete(app)
+                else:
+                    app_data = app.data
+                    utils.TraverseHelper.remove(app_path, app_data)
+                    session_model.SessionModelServices.save_application(
+                        app, app_data, unit)
+            return
+
         get_description = envs.EnvironmentServices.get_environment_description
         save_description = envs.EnvironmentServices.\
             save_environment_description
@@ -262,3 +339,25 @@ class CoreServices(object):
         temp_description['updated'] = str(timeutils.utcnow())
         save_description(temp_description, env_template_id)
         return data
+
+
+def _get_application_path(path):
+    """Splits /services/<key>/<path> into application key and inner path
+
+    :return: (key, path) tuple where key is None for the /services path
+             itself or None if the path does not point into services
+    """
+    keys = [key for key in path.split('/') if key]
+    if not keys or keys[0] != 'services':
+        return None
+    if len(keys) == 1:
+        return None, '/'
+    return keys[1], '/' + '/'.join(keys[2:])
+
+
+def _find_application(session_id, key):
+    application = session_model.SessionModelServices.find_application(
+        session_id, key)
+    if application is None:
+        raise KeyError(key)
+    return application
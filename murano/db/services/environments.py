@@ -22,6 +22,7 @@ import yaml
 from murano.common import auth_utils
 from murano.common import uuidutils
 from murano.db import models
+from murano.db.services import session_model
 from murano.db.services import sessions
 from murano.db import session as db_session
 from murano.services import states
@@ -33,6 +34,16 @@ DEFAULT_NETWORK_TYPES = {
     "nova": 'io.murano.resources.NovaNetwork',
     "neutron": 'io.murano.resources.NeutronNetwork'
 }
+SESSION_STATE_TO_STATUS = {
+    states.SessionState.DEPLOYING: states.EnvironmentStatus.DEPLOYING,
+    states.SessionState.DELETING: states.EnvironmentStatus.DELETING,
+    states.SessionState.DEPLOY_FAILURE:
+        states.EnvironmentStatus.DEPLOY_FAILURE,
+    states.SessionState.DELETE_FAILURE:
+        states.EnvironmentStatus.DELETE_FAILURE
+}
+# keeps the number of bound parameters below the limits of DB engines
+STATUS_QUERY_CHUNK_SIZE = 500
 
 
 class EnvironmentServices(object):
@@ -47,8 +58,10 @@ class EnvironmentServices(object):
         environments = unit.query(models.Environment). \
             filter_by(**filters).all()
 
+        statuses = EnvironmentServices.get_statuses(
+            [env['id'] for env in environments])
         for env in environments:
-            env['status'] = EnvironmentServices.get_status(env['id'])
+            env['status'] = statuses[env['id']]
 
         return environments
 
@@ -67,26 +80,46 @@ class EnvironmentServices(object):
         :param environment_id: Id of environment for which we checking status.
         :return: Environment status
         """
-        # Deploying: there is at least one valid session with status deploying
-        session_list = sessions.SessionServices.get_sessions(environment_id)
-        has_opened = False
-        for session in session_list:
-            if session.state == states.SessionState.DEPLOYING:
-                return states.EnvironmentStatus.DEPLOYING
-            elif session.state == states.SessionState.DELETING:
-                return states.EnvironmentStatus.DELETING
-            elif session.state == states.SessionState.DEPLOY_FAILURE:
-                return states.EnvironmentStatus.DEPLOY_FAILURE
-            elif session.state == states.SessionState.DELETE_FAILURE:
-                return states.EnvironmentStatus.DELETE_FAILURE
-            elif session.state == states.SessionState.OPENED:
-                has_opened = True
-            elif session.state == states.SessionState.DEPLOYED:
-                break
-        if has_opened:
-            return states.EnvironmentStatus.PENDING
-
-        return states.EnvironmentStatus.READY
+        return EnvironmentServices.get_statuses(
+            [environment_id])[environment_id]
+
+    @staticmethod
+    def get_statuses(environment_ids):
+        """Computes statuses of many environments at once
+
+        Sessions of all the environments are fetched with a single query
+        that loads only their states. The status of each environment is
+        determined the same way as in get_status.
+
+        :param environment_ids: list of environment Ids
+        :return: dict of environment Id to environment status
+        """
+        result = dict((environment_id, states.EnvironmentStatus.READY)
+                      for environment_id in environment_ids)
+        environment_ids = list(result)
+        unit = db_session.get_session()
+        decided = set()
+        for i in range(0, len(environment_ids), STATUS_QUERY_CHUNK_SIZE):
+            query = unit.query(
+                models.Session.environment_id, models.Session.state).filter(
+                models.Session.environment_id.in_(
+                    environment_ids[i:i + STATUS_QUERY_CHUNK_SIZE])
+            ).order_by(models.Session.environment_id,
+                       models.Session.version.desc(),
+                       models.Session.updated.desc())
+            # for each environment its sessions are walked from the most
+            # recent one until the first one that defines the status
+            for environment_id, state in query:
+                if environment_id in decided:
+                    continue
+                if state == states.SessionState.OPENED:
+                    result[environment_id] = states.EnvironmentStatus.PENDING
+                elif state == states.SessionState.DEPLOYED:
+                    decided.add(environment_id)
+                elif state in SESSION_STATE_TO_STATUS:
+                    result[environment_id] = SESSION_STATE_TO_STATUS[state]
+                    decided.add(environment_id)
+        return result
 
     @staticmethod
     def create(environment_params, context):
@@ -167,15 +200,12 @@ class EnvironmentServices(object):
         unit = db_session.get_session()
 
         if session_id:
-            session = unit.query(models.Session).get(session_id)
-            if sessions.SessionServices.validate(session):
-                if session.state != states.SessionState.DEPLOYED:
-                    env_description = session.description
-                else:
-                    env = unit.query(models.Environment) \
-                        .get(session.environment_id)
-                    env_description = env.description
+            session = EnvironmentServices.get_draft_session(session_id, unit)
+            if session is not None:
+                env_description = session_model.SessionModelServices.\
+                    get_description(session, unit)
             else:
+                session = unit.query(models.Session).get(session_id)
                 env = unit.query(models.Environment) \
                     .get(session.environment_id)
                 env_description = env.description
@@ -202,10 +232,28 @@ class EnvironmentServices(object):
         if inner:
             data = session.description.copy()
             data['Objects'] = environment
-            session.description = data
         else:
-            session.description = environment
-        session.save(unit)
+            data = environment
+        session_model.SessionModelServices.save_description(
+            session, data, unit)
+
+    @staticmethod
+    def get_draft_session(session_id, unit=None):
+        """Returns session if its object model is the one to work with
+
+           Object model of the session is used instead of the environment
+           one while the session is valid and is not deployed yet.
+
+           :param session_id: Session Id
+           :param unit: SQLAlchemy session
+           :return: Session or None
+        """
+        unit = unit or db_session.get_session()
+        session = unit.query(models.Session).get(session_id)
+        if (sessions.SessionServices.validate(session) and
+                session.state != states.SessionState.DEPLOYED):
+            return session
+        return None
 
     @staticmethod
     def generate_default_networks(env_name, network_driver):
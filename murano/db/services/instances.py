@@ -54,6 +54,68 @@ class InstanceStatsServices(object):
                     models.Instance.environment_id == environment_id).values(
                         unit_count=unit_count))
 
+    @staticmethod
+    def track_instances(environment_id, changes):
+        """Tracks and untracks instances of the environment in one go
+
+        :param environment_id: ID of the environment
+        :param changes: list of dicts in the order of occurrence. Each of
+                        them has an 'action' ('track' or 'untrack') and
+                        'instance' (instance ID) keys and for the 'track'
+                        action also 'type_name' and optionally
+                        'instance_type', 'type_title' and 'unit_count'.
+                        'timestamp' is the time the change was made by
+                        the engine; the current time is used if it is
+                        missing
+        """
+
+        if not changes:
+            return
+        unit = db_session.get_session()
+        now = timeutils.utcnow_ts()
+        with unit.begin():
+            env = unit.query(models.Environment).get(environment_id)
+            if env is None:
+                return
+            instance_ids = set(change['instance'] for change in changes)
+            existing = dict(
+                (instance.instance_id, instance) for instance in
+                unit.query(models.Instance).filter(
+                    models.Instance.environment_id == environment_id,
+                    models.Instance.instance_id.in_(instance_ids)))
+            new_rows = {}
+            for change in changes:
+                instance_id = change['instance']
+                timestamp = change.get('timestamp', now)
+                instance = existing.get(instance_id)
+                row = new_rows.get(instance_id)
+                if change['action'] == 'track':
+                    if instance is not None:
+                        instance.unit_count = change.get('unit_count')
+                    elif row is not None:
+                        row['unit_count'] = change.get('unit_count')
+                    else:
+                        new_rows[instance_id] = {
+                            'instance_id': instance_id,
+                            'environment_id': environment_id,
+                            'tenant_id': env.tenant_id,
+                            'instance_type': change.get('instance_type', 0),
+                            'created': timestamp,
+                            'destroyed': None,
+                            'type_name': change['type_name'],
+                            'type_title': change.get('type_title'),
+                            'unit_count': change.get('unit_count')
+                        }
+                elif instance is not None:
+                    if not instance.destroyed:
+                        instance.destroyed = timestamp
+                elif row is not None:
+                    if not row['destroyed']:
+                        row['destroyed'] = timestamp
+            if new_rows:
+                unit.bulk_insert_mappings(models.Instance,
+                                          list(new_rows.values()))
+
     @staticmethod
     def destroy_instance(instance_id, environment_id):
         unit = db_session.get_session()
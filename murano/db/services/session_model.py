@@ -0,0 +1,131 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import sqlalchemy as sa
+from sqlalchemy.orm import attributes
+
+from murano.db import models
+from murano.db import session as db_session
+
+
+class SessionModelServices(object):
+    """Stores object model of a session in parts
+
+    Applications (items of the Objects/services list) of the session object
+    model are kept in the session_application table, one row per
+    application, while the rest of the model is kept in
+    Session.description. Thus API calls that work with a single
+    application (de)serialize only this application. The whole model is
+    assembled only when it is needed as a whole, e.g. to deploy the session.
+
+    Sessions which description still contains the services list (e.g. the
+    ones that were saved as a whole by an older API) are read as is and
+    are split on the next save.
+    """
+
+    @staticmethod
+    def is_split(session):
+        objects = session.description.get('Objects')
+        return objects is not None and 'services' not in objects
+
+    @staticmethod
+    def get_description(session, unit=None):
+        """Returns the whole object model of the session"""
+        if not SessionModelServices.is_split(session):
+            return session.description
+        unit = unit or db_session.get_session()
+        description = dict(session.description)
+        description['Objects'] = dict(description['Objects'])
+        description['Objects']['services'] = [
+            app.data for app in
+            SessionModelServices.get_applications(session.id, unit)]
+        return description
+
+    @staticmethod
+    def save_description(session, description, unit=None):
+        """Replaces the whole object model of the session"""
+        unit = unit or db_session.get_session()
+        objects = description.get('Objects')
+        services = []
+        if objects is not None:
+            objects = dict(objects)
+            services = objects.pop('services', None) or []
+            description = dict(description)
+            description['Objects'] = objects
+
+        with unit.begin(subtransactions=True):
+            session.description = description
+            unit.add(session)
+            unit.flush()
+            unit.query(models.SessionApplication).filter_by(
+                session_id=session.id).delete(synchronize_session=False)
+            SessionModelServices._add(session.id, services, 0, unit)
+
+    @staticmethod
+    def get_applications(session_id, unit=None):
+        unit = unit or db_session.get_session()
+        return unit.query(models.SessionApplication).filter_by(
+            session_id=session_id).order_by(
+            models.SessionApplication.position).all()
+
+    @staticmethod
+    def find_application(session_id, key, unit=None):
+        """Finds application by its ID or index in the services list
+
+        :return: SessionApplication or None if there is no such application
+        """
+        unit = unit or db_session.get_session()
+        query = unit.query(models.SessionApplication).filter_by(
+            session_id=session_id)
+        application = query.filter_by(app_id=key).first()
+        if application is None and key.isdigit():
+            application = query.order_by(
+                models.SessionApplication.position).offset(int(key)).first()
+        return application
+
+    @staticmethod
+    def add_applications(session_id, applications, unit=None):
+        """Appends applications to the end of the services list"""
+        unit = unit or db_session.get_session()
+        with unit.begin(subtransactions=True):
+            last = unit.query(
+                sa.func.max(models.SessionApplication.position)).filter_by(
+                session_id=session_id).scalar()
+            SessionModelServices._add(
+                session_id, applications,
+                0 if last is None else last + 1, unit)
+
+    @staticmethod
+    def save_application(application, data, unit=None):
+        unit = unit or db_session.get_session()
+        application.data = data
+        application.app_id = _get_id(data)
+        # data may be the same object that was modified in place
+        attributes.flag_modified(application, 'data')
+        with unit.begin(subtransactions=True):
+            unit.add(application)
+
+    @staticmethod
+    def _add(session_id, applications, position, unit):
+        unit.add_all(
+            models.SessionApplication(
+                session_id=session_id, app_id=_get_id(data),
+                position=position + i, data=data)
+            for i, data in enumerate(applications))
+
+
+def _get_id(data):
+    if isinstance(data, dict) and isinstance(data.get('?'), dict):
+        return data['?'].get('id')
+    return None
@@ -13,6 +13,7 @@
 #    under the License.
 
 from murano.db import models
+from murano.db.services import session_model
 from murano.db import session as db_session
 from murano.services import actions
 from murano.services import states
@@ -64,10 +65,9 @@ class SessionServices(object):
         session.version = environment.version
         # all changes to environment is stored here, and translated to
         # environment only after deployment completed
-        session.description = environment.description
-
         with unit.begin():
-            unit.add(session)
+            session_model.SessionModelServices.save_description(
+                session, environment.description, unit)
 
         return session
 
@@ -86,9 +86,10 @@ class SessionServices(object):
 
         # if environment version is higher then version on which current
         #  session is created then other session was already deployed
-        current_env = unit.query(models.Environment).\
-            get(session.environment_id)
-        if current_env.version > session.version:
+        # only the version is needed, the object model may be large
+        current_version = unit.query(models.Environment.version).filter_by(
+            id=session.environment_id).scalar()
+        if current_version > session.version:
             return False
 
         # if other session is deploying now current session is invalid
@@ -13,6 +13,7 @@
 #    under the License.
 
 """Session management functions."""
+import itertools
 import threading
 
 from oslo_config import cfg
@@ -20,7 +21,10 @@ from oslo_db import exception
 from oslo_db import options
 from oslo_db.sqlalchemy import session as db_session
 from oslo_utils import timeutils
+import sqlalchemy as sa
+from sqlalchemy import orm as sa_orm
 
+from murano.common import cache
 from murano.db import models
 
 CONF = cfg.CONF
@@ -32,6 +36,18 @@ _LOCK = threading.Lock()
 
 MAX_LOCK_RETRIES = 10
 
+# scopes of the API cache that depend on data of the models
+_CACHE_SCOPES = {
+    models.Package: cache.CATALOG,
+    models.Category: cache.CATALOG,
+    models.Tag: cache.CATALOG,
+    models.Class: cache.CATALOG,
+    models.PackageSearchTerm: cache.CATALOG,
+    models.Environment: cache.ENVIRONMENTS,
+    models.Session: cache.ENVIRONMENTS,
+    models.SessionApplication: cache.ENVIRONMENTS,
+}
+
 
 def _create_facade_lazily():
     global _LOCK, _FACADE
@@ -89,3 +105,40 @@ def _get_or_create_lock(name, session, nested, retry=0):
         existing.ts = timeutils.utcnow()
         existing.save(session)
         return session.transaction
+
+
+def _add_cache_scopes(session, classes):
+    scopes = set(_CACHE_SCOPES[cls] for cls in classes
+                 if cls in _CACHE_SCOPES)
+    if not scopes:
+        return
+    if session.transaction is None:
+        # statement was executed in autocommit mode
+        cache.invalidate(*scopes)
+    else:
+        session.info.setdefault('cache_scopes', set()).update(scopes)
+
+
+@sa.event.listens_for(sa_orm.Session, 'after_flush')
+def _after_flush(session, flush_context):
+    _add_cache_scopes(session, set(
+        type(instance) for instance in itertools.chain(
+            session.new, session.dirty, session.deleted)))
+
+
+@sa.event.listens_for(sa_orm.Session, 'after_bulk_update')
+@sa.event.listens_for(sa_orm.Session, 'after_bulk_delete')
+def _after_bulk_operation(update_context):
+    _add_cache_scopes(update_context.session,
+                      [update_context.mapper.class_])
+
+
+@sa.event.listens_for(sa_orm.Session, 'after_transaction_end')
+def _after_transaction_end(session, transaction):
+    # cached values are invalidated once changes are visible to others,
+    # i.e. when the outermost transaction ends. Values are invalidated
+    # on rollback too, which is harmless
+    if transaction.parent is None:
+        scopes = session.info.pop('cache_scopes', None)
+        if scopes:
+            cache.invalidate(*scopes)
@@ -52,6 +52,7 @@ TL_OBJECT_STORE = '__murano_object_store'
 TL_SESSION = '__murano_execution_session'
 TL_CONTRACT_PASSKEY = '__murano_contract_passkey'
 TL_OBJECTS_DRY_RUN = '__murano_objects_dry_run'
+TL_SCHEDULER_TASK = '__murano_scheduler_task'
 
 
 RUNTIME_VERSION_1_0 = semantic_version.Version('1.0.0')
@@ -59,3 +60,6 @@ RUNTIME_VERSION_1_1 = semantic_version.Version('1.1.0')
 RUNTIME_VERSION_1_2 = semantic_version.Version('1.2.0')
 RUNTIME_VERSION_1_3 = semantic_version.Version('1.3.0')
 RUNTIME_VERSION_1_4 = semantic_version.Version('1.4.0')
+
+PARSE_CACHE_SIZE = 1024
+POSITIONS_CACHE_SIZE = 65536
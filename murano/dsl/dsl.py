@@ -26,6 +26,7 @@ from yaql import yaql_interface
 from murano.dsl import constants
 from murano.dsl import dsl_types
 from murano.dsl import helpers
+from murano.dsl import scheduler
 
 
 NO_VALUE = utils.create_marker('NO_VALUE')
@@ -331,6 +332,8 @@ class Interfaces(object):
 
 
 class NativeInstruction(object):
+    __slots__ = ('instruction', 'source_file_position')
+
     def __init__(self, instruction, location):
         self.instruction = instruction
         self.source_file_position = location
@@ -362,6 +365,18 @@ def meta(type_name, value):
     return wrapper
 
 
+def execute_in_thread(func, *args, **kwargs):
+    """Executes func in the native thread pool
+
+    Should be used by native methods for blocking (not eventlet-patched)
+    or CPU-heavy work so that it does not freeze other green threads of
+    the engine. func must not use MuranoPL objects, the object store or
+    contexts, so all arguments need to be resolved beforehand.
+    """
+
+    return scheduler.get_thread_pool().execute(func, *args, **kwargs)
+
+
 def get_this(context=None):
     this = helpers.get_this(context)
     return MuranoObjectInterface.create(this)
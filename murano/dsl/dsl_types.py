@@ -93,7 +93,7 @@ class MuranoMetaClass(MuranoClass):
 
 
 class MuranoObject(object):
-    pass
+    __slots__ = ()
 
 
 class MuranoMethod(object):
@@ -136,7 +136,7 @@ class MuranoTypeReference(object):
 
 
 class YaqlExpression(object):
-    pass
+    __slots__ = ()
 
 
 class MuranoObjectInterface(object):
@@ -144,6 +144,9 @@ class MuranoObjectInterface(object):
 
 
 class ExpressionFilePosition(object):
+    __slots__ = ('_file_path', '_start_line', '_start_column',
+                 '_end_line', '_end_column')
+
     def __init__(self, file_path, start_line, start_column,
                  end_line, end_column):
         self._file_path = file_path
@@ -50,11 +50,21 @@ class MuranoDslExecutor(object):
         self._locks = {}
         self._root_context_cache = {}
         self._static_properties = {}
+        self._type_cache = {}
+        self._types_generation = package_loader.types_generation
 
     @property
     def object_store(self):
         return self._object_store
 
+    @property
+    def type_cache(self):
+        generation = self._package_loader.types_generation
+        if generation != self._types_generation:
+            self._type_cache = {}
+            self._types_generation = generation
+        return self._type_cache
+
     @property
     def execution_session(self):
         return self._session
@@ -24,6 +24,8 @@ _macros = []
 
 
 class InstructionStub(object):
+    __slots__ = ('_title', 'source_file_position')
+
     def __init__(self, title, position):
         self._title = title
         self.source_file_position = position
@@ -37,6 +37,7 @@ from yaql.language import utils as yaqlutils
 from murano.dsl import constants
 from murano.dsl import dsl_types
 from murano.dsl import exceptions
+from murano.dsl import scheduler
 
 _threads_sequencer = 0
 # type string: ns.something.MyApp[/1.2.3-alpha][@my.package.fqn]
@@ -110,21 +111,67 @@ def generate_id():
     return uuid.uuid4().hex
 
 
+def intern_name(name):
+    # only native strings can be interned (that is not unicode on Py2)
+    if type(name) is str:
+        return six.moves.intern(name)
+    return name
+
+
+def lru_memoize(max_size, key=None):
+    """Bounded memoization for pure functions
+
+    Keeps at most max_size most recently used results. Calls with
+    arguments that cannot be hashed are not cached. Optional key function
+    computes cache key from the arguments. The cache is not thread-safe,
+    so decorated functions must not be called from the native thread pool.
+    """
+
+    def decorator(func):
+        cache = collections.OrderedDict()
+
+        @functools.wraps(func)
+        def wrap(*args):
+            cache_key = args if key is None else key(*args)
+            try:
+                result = cache.pop(cache_key)
+            except KeyError:
+                result = func(*args)
+                if len(cache) >= max_size:
+                    cache.popitem(last=False)
+            except TypeError:
+                return func(*args)
+            cache[cache_key] = result
+            return result
+
+        wrap.cache_clear = cache.clear
+        return wrap
+    return decorator
+
+
 def parallel_select(collection, func, limit=1000):
     # workaround for eventlet issue 232
     # https://github.com/eventlet/eventlet/issues/232
     context = get_context()
     object_store = get_object_store()
+    task = None if object_store is None else object_store.executor
+    thread_scheduler = scheduler.get_scheduler()
 
     def wrapper(element):
+        # each element is executed in a brand new green thread, thus
+        # there is no need to restore thread-local values afterwards
+        current_thread = eventlet.greenthread.getcurrent()
+        setattr(current_thread, constants.TL_OBJECT_STORE, object_store)
+        setattr(current_thread, constants.TL_CONTEXT, context)
         try:
-            with with_object_store(object_store), contextual(context):
+            with thread_scheduler.slot(task):
                 return func(element), False, None
         except Exception as e:
             return e, True, sys.exc_info()[2]
 
     gpool = eventlet.greenpool.GreenPool(limit)
-    result = list(gpool.imap(wrapper, collection))
+    with scheduler.GreenThreadScheduler.suspended():
+        result = list(gpool.imap(wrapper, collection))
     try:
         exception = next(t for t in result if t[1])
     except StopIteration:
@@ -272,6 +319,11 @@ def parse_version_spec(version_spec):
     if isinstance(version_spec, semantic_version.Version):
         return normalize_version_spec(
             semantic_version.Spec('==' + str(version_spec)))
+    return _parse_version_spec_string(version_spec)
+
+
+@lru_memoize(constants.PARSE_CACHE_SIZE)
+def _parse_version_spec_string(version_spec):
     if not version_spec:
         version_spec = '0'
     version_spec = re.sub('\s+', '', str(version_spec))
@@ -284,6 +336,11 @@ def parse_version_spec(version_spec):
 def parse_version(version):
     if isinstance(version, semantic_version.Version):
         return version
+    return _parse_version_string(version)
+
+
+@lru_memoize(constants.PARSE_CACHE_SIZE)
+def _parse_version_string(version):
     if not version:
         version = '0'
     return semantic_version.Version.coerce(str(version))
@@ -378,6 +435,8 @@ def get_memoize_func(func, cache):
     return wrap
 
 
+@lru_memoize(constants.PARSE_CACHE_SIZE,
+             key=lambda version_spec: tuple(version_spec.specs))
 def normalize_version_spec(version_spec):
     def coerce(v):
         return semantic_version.Version('{0}.{1}.{2}'.format(
@@ -498,8 +557,18 @@ def resolve_type(value, scope_type, return_reference=False):
         scope_type = scope_type.type
     if not isinstance(value, (dsl_types.MuranoType,
                               dsl_types.MuranoTypeReference)):
-        name = scope_type.namespace_resolver.resolve_name(value)
-        result = scope_type.package.find_class(name)
+        executor = get_executor()
+        type_cache = None if executor is None else executor.type_cache
+        # types are equal when their names and versions are, so the package
+        # is needed to tell apart same types shipped in different packages
+        key = (value, scope_type.package.name, scope_type.name,
+               scope_type.version)
+        result = None if type_cache is None else type_cache.get(key)
+        if result is None:
+            name = scope_type.namespace_resolver.resolve_name(value)
+            result = scope_type.package.find_class(name)
+            if type_cache is not None:
+                type_cache[key] = result
     else:
         result = value
 
@@ -542,20 +611,10 @@ def parse_object_definition(spec, scope_type, context):
             elif isinstance(obj_type, dsl_types.MuranoType):
                 type_obj = obj_type
             elif obj_type:
-                type_str, version_str, package_str = parse_type_string(
+                type_obj = _load_type(
                     obj_type,
                     system_data.get('classVersion'),
-                    system_data.get('package')
-                )
-                version_spec = parse_version_spec(version_str)
-                package_loader = get_package_loader()
-                if package_str:
-                    package = package_loader.load_package(
-                        package_str, version_spec)
-                else:
-                    package = package_loader.load_class_package(
-                        type_str, version_spec)
-                type_obj = package.find_class(type_str, False)
+                    system_data.get('package'))
         else:
             system_data = {}
 
@@ -573,6 +632,29 @@ def parse_object_definition(spec, scope_type, context):
     }
 
 
+def _load_type(obj_type, class_version, package_name):
+    executor = get_executor()
+    type_cache = None if executor is None else executor.type_cache
+    key = (obj_type, class_version, package_name)
+    if type_cache is not None:
+        type_obj = type_cache.get(key)
+        if type_obj is not None:
+            return type_obj
+
+    type_str, version_str, package_str = parse_type_string(
+        obj_type, class_version, package_name)
+    version_spec = parse_version_spec(version_str)
+    package_loader = get_package_loader()
+    if package_str:
+        package = package_loader.load_package(package_str, version_spec)
+    else:
+        package = package_loader.load_class_package(type_str, version_spec)
+    type_obj = package.find_class(type_str, False)
+    if type_cache is not None:
+        type_cache[key] = type_obj
+    return type_obj
+
+
 def assemble_object_definition(parsed, model_format=dsl_types.DumpTypes.Mixed):
     if model_format == dsl_types.DumpTypes.Inline:
         result = {
@@ -627,22 +709,25 @@ def weak_proxy(obj):
     return weakref.proxy(obj)
 
 
-def weak_ref(obj):
-    class MuranoObjectWeakRef(weakref.ReferenceType):
-        def __init__(self, murano_object):
-            self.ref = weakref.ref(murano_object)
-            self.object_id = murano_object.object_id
-
-        def __call__(self):
-            res = self.ref()
-            if not res:
-                object_store = get_object_store()
-                if object_store:
-                    res = object_store.get(self.object_id)
-                    if res:
-                        self.ref = weakref.ref(res)
-            return res
+class MuranoObjectWeakRef(weakref.ReferenceType):
+    __slots__ = ('ref', 'object_id')
 
+    def __init__(self, murano_object):
+        self.ref = weakref.ref(murano_object)
+        self.object_id = murano_object.object_id
+
+    def __call__(self):
+        res = self.ref()
+        if not res:
+            object_store = get_object_store()
+            if object_store:
+                res = object_store.get(self.object_id)
+                if res:
+                    self.ref = weakref.ref(res)
+        return res
+
+
+def weak_ref(obj):
     if obj is None or isinstance(obj, weakref.ReferenceType):
         return obj
 
@@ -651,6 +736,7 @@ def weak_ref(obj):
     return weakref.ref(obj)
 
 
+@lru_memoize(constants.PARSE_CACHE_SIZE)
 def parse_type_string(type_str, default_version, default_package):
     res = TYPE_RE.match(type_str)
     if res is None:
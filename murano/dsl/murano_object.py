@@ -24,6 +24,14 @@ from murano.dsl import yaql_integration
 
 
 class MuranoObject(dsl_types.MuranoObject):
+    # declaring_type is only set on meta class instances and __passkey__
+    # on objects loaded by template contracts
+    __slots__ = ('_initialized', '_destroyed', '_owner', '_object_id',
+                 '_type', '_properties', '_parents', '_this', '_name',
+                 '_extension', '_executor', '_config',
+                 '_destruction_dependencies', '_suppress__del__',
+                 'declaring_type', '__passkey__', '__weakref__')
+
     def __init__(self, murano_class, owner, object_id=None, name=None,
                  known_classes=None, this=None):
         self._initialized = False
@@ -272,11 +280,11 @@ class MuranoObject(dsl_types.MuranoObject):
                     ultimate_spec.declaring_type, name, value, context,
                     dry_run=dry_run)
             elif not dry_run:
-                self.real_this._properties[name] = value
+                self.real_this._properties[helpers.intern_name(name)] = value
         elif derived:
             if not dry_run:
                 obj = self.cast(caller_class)
-                obj._properties[name] = value
+                obj._properties[helpers.intern_name(name)] = value
         else:
             raise exceptions.PropertyWriteError(name, start_type)
 
@@ -377,6 +385,8 @@ class MuranoObject(dsl_types.MuranoObject):
 
 
 class RecyclableMuranoObject(MuranoObject):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         # Create self-reference to prevent __del__ from being called
         # automatically when there are no other objects referring to this one.
@@ -154,6 +154,7 @@ class MuranoPackage(dsl_types.MuranoPackage, dslmeta.MetaProvider):
         return m_class
 
     def register_class(self, cls, name=None):
+        self._package_loader.invalidate_type_caches()
         if inspect.isclass(cls):
             name = name or getattr(cls, '__murano_name', None) or cls.__name__
             if name in self._classes:
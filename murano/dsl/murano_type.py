@@ -85,12 +85,19 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
                     u'Type {0} cannot have parent with Usage {1}'.format(
                         self.name, p.usage))
         remappings = self._build_parent_remappings()
+        # weak references to direct subclasses and to copies of the class
+        # made for them, i.e. to the classes whose symbol lookup results
+        # depend on methods and properties of this class
+        self._dependents = []
         self._parents = self._adjusted_parents(remappings)
+        for p in self._parents:
+            p._dependents.append(weakref.ref(self))
         self._context = None
         self._exported_context = None
         self._meta = dslmeta.MetaData(meta, dsl_types.MetaTargets.Type, self)
         self._meta_values = None
         self._imports = list(self._resolve_imports(imports))
+        self._symbols_cache = {}
 
     def _adjusted_parents(self, remappings):
         seen = {}
@@ -113,6 +120,12 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
             res._meta_values = None
             res._context = None
             res._exported_context = None
+            res._symbols_cache = {}
+            # the copy shares methods and properties with the original
+            res._dependents = [weakref.ref(class_)]
+            class_._dependents.append(weakref.ref(res))
+            for p in new_parents:
+                p._dependents.append(weakref.ref(res))
             seen[class_] = res
             return res
         return [altered_clone(p) for p in self._parents]
@@ -160,6 +173,7 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
     def add_method(self, name, payload, original_name=None):
         method = murano_method.MuranoMethod(self, name, payload, original_name)
         self._methods[name] = method
+        self._invalidate_symbols_cache()
         self._context = None
         self._exported_context = None
         return method
@@ -178,7 +192,28 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
     def add_property(self, property_typespec):
         if not isinstance(property_typespec, murano_property.MuranoProperty):
             raise TypeError('property_typespec')
-        self._properties[property_typespec.name] = property_typespec
+        self._properties[
+            helpers.intern_name(property_typespec.name)] = property_typespec
+        self._invalidate_symbols_cache()
+
+    def _invalidate_symbols_cache(self):
+        # symbol lookup results of the class and all of its descendants
+        # depend on the changed class
+        seen = set()
+        queue = [self]
+        while queue:
+            cls = queue.pop()
+            if id(cls) in seen:
+                continue
+            seen.add(id(cls))
+            cls._symbols_cache = {}
+            alive = []
+            for ref in cls._dependents:
+                dependent = ref()
+                if dependent is not None:
+                    alive.append(ref)
+                    queue.append(dependent)
+            cls._dependents = alive
 
     def _find_symbol_chains(self, func):
         queue = collections.deque([(self, ())])
@@ -232,12 +267,25 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
                 result.append(chains[i][0])
         return result
 
+    def _find_symbol(self, kind, name, func):
+        # class hierarchy doesn't change after the classes were loaded so
+        # resolved symbols (that hold their declaring type) can be reused
+        # until add_method() or add_property() is called on the class or
+        # one of its ancestors
+        key = (kind, name)
+        result = self._symbols_cache.get(key)
+        if result is None:
+            result = tuple(self._choose_symbol(func))
+            self._symbols_cache[key] = result
+        return list(result)
+
     def find_method(self, name):
-        return self._choose_symbol(lambda cls: cls.methods.get(name))
+        return self._find_symbol(
+            'method', name, lambda cls: cls.methods.get(name))
 
     def find_property(self, name):
-        return self._choose_symbol(
-            lambda cls: cls.properties.get(name))
+        return self._find_symbol(
+            'property', name, lambda cls: cls.properties.get(name))
 
     def find_static_property(self, name):
         def prop_func(cls):
@@ -245,7 +293,7 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
             if prop is not None and prop.usage == 'Static':
                 return prop
 
-        result = self._choose_symbol(prop_func)
+        result = self._find_symbol('static_property', name, prop_func)
         if len(result) < 1:
             raise exceptions.NoPropertyFound(name)
         elif len(result) > 1:
@@ -36,8 +36,16 @@ class NamespaceResolver(object):
         self._namespaces = namespaces.copy()
         self._namespaces.setdefault('=', '')
         self._namespaces[''] = ''
+        self._resolved_names = {}
 
     def resolve_name(self, name):
+        result = self._resolved_names.get(name)
+        if result is None:
+            result = self._resolve_name(name)
+            self._resolved_names[name] = result
+        return result
+
+    def _resolve_name(self, name):
         if not self.is_typename(name, True):
             raise ValueError('Invalid type name "{0}"'.format(name))
         name = six.text_type(name)
@@ -19,6 +19,8 @@ import six
 
 @six.add_metaclass(abc.ABCMeta)
 class MuranoPackageLoader(object):
+    _types_generation = 0
+
     @abc.abstractmethod
     def load_package(self, package_name, version_spec):
         pass
@@ -42,3 +44,20 @@ class MuranoPackageLoader(object):
     @abc.abstractmethod
     def compact_fixation_table(self):
         pass
+
+    @property
+    def types_generation(self):
+        """Version of the set of types available through the loader
+
+        Executors drop type names resolved with the loader when it changes.
+        """
+        return self._types_generation
+
+    def invalidate_type_caches(self):
+        """Drops resolved types cached by executors using the loader
+
+        Must be called whenever new packages or classes get registered
+        because type names that were resolved before might point to
+        different types now.
+        """
+        self._types_generation += 1
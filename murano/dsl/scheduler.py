@@ -0,0 +1,278 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import contextlib
+import time
+
+import eventlet.event
+import eventlet.greenthread
+import eventlet.semaphore
+from eventlet import tpool
+
+from murano.dsl import constants
+
+
+class GreenThreadScheduler(object):
+    """Global green thread budget shared by all tasks of the worker
+
+    Each green thread spawned for parallel execution (Parallel macro,
+    pselect() etc.) must obtain a slot before it starts to do any work.
+    There can be at most `max_threads` slots taken at any moment and at most
+    `max_task_threads` of them can belong to the same task (executor).
+    When there are no free slots requests are queued per task and served
+    in round-robin order so that one huge deployment cannot starve
+    others.
+
+    Thread that waits for its children to complete releases its slot for
+    the time of waiting. Thus nested parallel blocks cannot deadlock on
+    exhausted budget.
+    """
+
+    def __init__(self, max_threads=1000, max_task_threads=0):
+        self._max_threads = max_threads
+        self._max_task_threads = max_task_threads
+        self._active = 0
+        self._task_active = collections.defaultdict(int)
+        self._queues = collections.OrderedDict()
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+        self._total_requests = 0
+        self._total_waits = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    @property
+    def max_threads(self):
+        return self._max_threads
+
+    @property
+    def max_task_threads(self):
+        return self._max_task_threads
+
+    @property
+    def active_threads(self):
+        return self._active
+
+    @property
+    def queue_depth(self):
+        return self._queue_depth
+
+    def get_stats(self):
+        return {
+            'max_threads': self._max_threads,
+            'max_task_threads': self._max_task_threads,
+            'active_threads': self._active,
+            'active_tasks': len(self._task_active),
+            'queue_depth': self._queue_depth,
+            'max_queue_depth': self._max_queue_depth,
+            'total_requests': self._total_requests,
+            'total_waits': self._total_waits,
+            'total_wait_time': self._total_wait_time,
+            'max_wait_time': self._max_wait_time,
+            'average_wait_time': (
+                self._total_wait_time / self._total_waits
+                if self._total_waits else 0.0)
+        }
+
+    def _has_capacity(self, task):
+        if self._max_threads and self._active >= self._max_threads:
+            return False
+        if (self._max_task_threads and
+                self._task_active.get(task, 0) >= self._max_task_threads):
+            return False
+        return True
+
+    def _grant(self, task):
+        self._active += 1
+        self._task_active[task] += 1
+
+    def acquire(self, task):
+        self._total_requests += 1
+        if not self._queues and self._has_capacity(task):
+            self._grant(task)
+            return
+        event = eventlet.event.Event()
+        self._queues.setdefault(task, collections.deque()).append(event)
+        self._queue_depth += 1
+        self._max_queue_depth = max(self._max_queue_depth, self._queue_depth)
+        start = time.time()
+        self._dispatch()
+        try:
+            event.wait()
+        except BaseException:
+            # thread was killed while waiting. Either withdraw the request
+            # or give back the slot that was granted in the meantime
+            if event.ready():
+                self.release(task)
+            else:
+                self._queues[task].remove(event)
+                if not self._queues[task]:
+                    del self._queues[task]
+                self._queue_depth -= 1
+            raise
+        wait_time = time.time() - start
+        self._total_waits += 1
+        self._total_wait_time += wait_time
+        self._max_wait_time = max(self._max_wait_time, wait_time)
+
+    def release(self, task):
+        self._active -= 1
+        self._task_active[task] -= 1
+        if self._task_active[task] <= 0:
+            del self._task_active[task]
+        self._dispatch()
+
+    def _dispatch(self):
+        # each pass serves at most one request per task in the order tasks
+        # were enqueued. Served task moves to the end of the queue
+        progress = True
+        while self._queues and progress:
+            progress = False
+            for task in list(self._queues):
+                if self._max_threads and self._active >= self._max_threads:
+                    return
+                if not self._has_capacity(task):
+                    continue
+                waiters = self._queues.pop(task)
+                event = waiters.popleft()
+                if waiters:
+                    self._queues[task] = waiters
+                self._queue_depth -= 1
+                self._grant(task)
+                event.send()
+                progress = True
+
+    @contextlib.contextmanager
+    def slot(self, task):
+        self.acquire(task)
+        current_thread = eventlet.greenthread.getcurrent()
+        # the last item tells whether the thread holds the slot. It does
+        # not while suspended() waits to get it back
+        owner = [self, task, True]
+        setattr(current_thread, constants.TL_SCHEDULER_TASK, owner)
+        try:
+            yield
+        finally:
+            delattr(current_thread, constants.TL_SCHEDULER_TASK)
+            if owner[2]:
+                self.release(task)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def suspended():
+        """Releases slot of the current thread while it waits for children"""
+
+        current_thread = eventlet.greenthread.getcurrent()
+        owner = getattr(current_thread, constants.TL_SCHEDULER_TASK, None)
+        if owner is None or not owner[2]:
+            yield
+            return
+        scheduler, task, _ = owner
+        scheduler.release(task)
+        owner[2] = False
+        try:
+            yield
+        finally:
+            scheduler.acquire(task)
+            owner[2] = True
+
+
+class NativeThreadPool(object):
+    """Executes blocking native code in a pool of real OS threads
+
+    Used for work that calls libraries which are not green (or is
+    CPU-bound) and thus would block the whole hub otherwise. Only pure
+    functions of their arguments may be executed here: the executor,
+    object store and contexts are bound to green threads of the hub and
+    eventlet primitives are not safe to use from other OS threads.
+    """
+
+    def __init__(self, size=20):
+        self._size = size
+        self._semaphore = eventlet.semaphore.Semaphore(size)
+        self._active = 0
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+        self._total_calls = 0
+        self._saturated_calls = 0
+        self._total_wait_time = 0.0
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def active_threads(self):
+        return self._active
+
+    def get_stats(self):
+        return {
+            'size': self._size,
+            'active_threads': self._active,
+            'queue_depth': self._queue_depth,
+            'max_queue_depth': self._max_queue_depth,
+            'total_calls': self._total_calls,
+            'saturated_calls': self._saturated_calls,
+            'total_wait_time': self._total_wait_time,
+            'saturation': float(self._active) / self._size
+        }
+
+    def execute(self, func, *args, **kwargs):
+        self._total_calls += 1
+        if self._semaphore.locked():
+            self._saturated_calls += 1
+            self._queue_depth += 1
+            self._max_queue_depth = max(
+                self._max_queue_depth, self._queue_depth)
+            start = time.time()
+            try:
+                self._semaphore.acquire()
+            finally:
+                self._queue_depth -= 1
+                self._total_wait_time += time.time() - start
+        else:
+            self._semaphore.acquire()
+        self._active += 1
+        try:
+            return tpool.execute(func, *args, **kwargs)
+        finally:
+            self._active -= 1
+            self._semaphore.release()
+
+
+_scheduler = GreenThreadScheduler()
+_thread_pool = NativeThreadPool()
+
+
+def get_scheduler():
+    return _scheduler
+
+
+def configure(max_threads, max_task_threads=0):
+    global _scheduler
+    _scheduler = GreenThreadScheduler(max_threads, max_task_threads)
+    return _scheduler
+
+
+def get_thread_pool():
+    return _thread_pool
+
+
+def configure_thread_pool(size):
+    global _thread_pool
+    # has effect only until the first use of eventlet.tpool
+    tpool.set_num_threads(size)
+    _thread_pool = NativeThreadPool(size)
+    return _thread_pool
@@ -27,6 +27,9 @@ EXPRESSION_REGEX = re.compile('^[\s\w\d.]*$')
 
 
 class YaqlExpression(dsl_types.YaqlExpression):
+    __slots__ = ('_version', '_expression', '_parsed_expression',
+                 '_file_position')
+
     def __init__(self, expression, version):
         self._version = version
         if isinstance(expression, six.string_types):
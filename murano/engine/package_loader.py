@@ -170,6 +170,7 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
             return self._to_dsl_package(package)
 
     def register_package(self, package):
+        self._root_loader.invalidate_type_caches()
         for name in package.classes:
             self._class_cache.setdefault(name, {})[package.version] = package
         self._package_cache.setdefault(package.name, {})[
@@ -507,6 +508,7 @@ class DirectoryPackageLoader(package_loader.MuranoPackageLoader):
         return packages[version]
 
     def register_package(self, package):
+        self._root_loader.invalidate_type_caches()
         for c in package.classes:
             self._packages_by_class.setdefault(c, {})[
                 package.version] = package
@@ -15,7 +15,9 @@
 
 import copy
 import datetime
+import json
 import os
+import time
 import uuid
 
 import eventlet.event
@@ -28,11 +30,14 @@ from yaql import specs
 import murano.common.exceptions as exceptions
 from murano.common.messaging import message
 from murano.dsl import dsl
+from murano.dsl import session_local_storage
 import murano.engine.system.common as common
 
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
 
+_plan_cache = session_local_storage.SessionLocalDict()
+
 
 class AgentException(Exception):
     pass
@@ -64,7 +69,7 @@ class Agent(object):
             return
 
         region = dsl.MuranoObjectInterface.create(self._host().getRegion())
-        with common.create_rmq_client(region) as client:
+        with common.get_rmq_client(region) as client:
             client.declare(self._queue, enable_ha=True, ttl=86400000)
 
     def queue_name(self):
@@ -87,36 +92,44 @@ class Agent(object):
         region = self._host().getRegion()
         msg_id = template.get('ID', uuid.uuid4().hex)
         if wait_results:
-            event = eventlet.event.Event()
-            listener = region['agentListener']
-            listener().subscribe(msg_id, event)
+            event = self._subscribe(region, msg_id)
 
         msg = self._prepare_message(template, msg_id)
-        with common.create_rmq_client(region) as client:
+        with common.get_rmq_client(region) as client:
             client.send(message=msg, key=self._queue)
 
         if wait_results:
-            try:
-                with eventlet.Timeout(timeout):
-                    result = event.wait()
+            return self._wait_result(region, msg_id, event, timeout)
+        else:
+            return None
 
-            except eventlet.Timeout:
-                listener().unsubscribe(msg_id)
-                raise exceptions.TimeoutException(
-                    'The murano-agent did not respond '
-                    'within {0} seconds'.format(timeout))
+    @staticmethod
+    def _subscribe(region, msg_id):
+        event = eventlet.event.Event()
+        listener = region['agentListener']
+        listener().subscribe(msg_id, event)
+        return event
 
-            if not result:
-                return None
+    def _wait_result(self, region, msg_id, event, timeout):
+        try:
+            with eventlet.Timeout(timeout):
+                result = event.wait()
 
-            if result.get('FormatVersion', '1.0.0').startswith('1.'):
-                return self._process_v1_result(result)
+        except eventlet.Timeout:
+            listener = region['agentListener']
+            listener().unsubscribe(msg_id)
+            raise exceptions.TimeoutException(
+                'The murano-agent did not respond '
+                'within {0} seconds'.format(timeout))
 
-            else:
-                return self._process_v2_result(result)
+        if not result:
+            return None
+
+        if result.get('FormatVersion', '1.0.0').startswith('1.'):
+            return self._process_v1_result(result)
 
         else:
-            return None
+            return self._process_v2_result(result)
 
     @specs.parameter(
         'resources', dsl.MuranoObjectParameter('io.murano.system.Resources'))
@@ -124,16 +137,68 @@ class Agent(object):
         if timeout is None:
             timeout = CONF.engine.agent_timeout
         self._check_enabled()
-        plan = self.build_execution_plan(template, resources())
+        plan = self._build_plan(template, resources)
         return self._send(plan, True, timeout)
 
     @specs.parameter(
         'resources', dsl.MuranoObjectParameter('io.murano.system.Resources'))
     def send(self, template, resources):
         self._check_enabled()
-        plan = self.build_execution_plan(template, resources())
+        plan = self._build_plan(template, resources)
         return self._send(plan, False, 0)
 
+    @staticmethod
+    @specs.parameter(
+        'resources', dsl.MuranoObjectParameter('io.murano.system.Resources'))
+    def broadcast(agents, template, resources, timeout=None):
+        """Sends the same execution plan to many agents
+
+        The plan is built once and published to queues of all agents over
+        a single connection. Results are awaited concurrently, each agent
+        has `timeout` seconds since the plan was sent to respond. Returns
+        list of results in the order of agents. If any of the agents
+        failed, the first error is raised after all the agents responded
+        or timed out.
+        """
+
+        if timeout is None:
+            timeout = CONF.engine.agent_timeout
+        agents = [dsl.MuranoObjectInterface.create(agent).extension
+                  for agent in agents]
+        for agent in agents:
+            agent._check_enabled()
+        if not agents:
+            return []
+        plan = agents[0]._build_plan(template, resources)
+
+        requests = []
+        for agent in agents:
+            region = agent._host().getRegion()
+            agent_plan = agent._copy_plan(plan)
+            msg_id = agent_plan.get('ID', uuid.uuid4().hex)
+            event = agent._subscribe(region, msg_id)
+            requests.append((agent, region, agent_plan, msg_id, event))
+
+        # all the publishes reuse the same pooled connection of the broker
+        for agent, region, agent_plan, msg_id, event in requests:
+            with common.get_rmq_client(region) as client:
+                client.send(message=agent._prepare_message(agent_plan, msg_id),
+                            key=agent._queue)
+
+        deadline = time.time() + timeout
+        results = []
+        error = None
+        for agent, region, agent_plan, msg_id, event in requests:
+            try:
+                results.append(agent._wait_result(
+                    region, msg_id, event, max(0, deadline - time.time())))
+            except Exception as e:
+                results.append(None)
+                error = error or e
+        if error is not None:
+            raise error
+        return results
+
     def call_raw(self, plan, timeout=None):
         if timeout is None:
             timeout = CONF.engine.agent_timeout
@@ -203,8 +268,37 @@ class Agent(object):
             'timestamp': datetime.datetime.now().isoformat()
         }
 
+    def _build_plan(self, template, resources):
+        # plans built from the same template and resources are the same
+        # for all hosts except for the plan ID
+        key = self._get_plan_cache_key(template, resources)
+        plan = None if key is None else _plan_cache.get(key)
+        if plan is None:
+            plan = self.build_execution_plan(template, resources())
+            if key is not None:
+                _plan_cache[key] = plan
+        return self._copy_plan(plan)
+
+    @staticmethod
+    def _get_plan_cache_key(template, resources):
+        package = resources.extension._package
+        try:
+            return (package.name, str(package.version),
+                    json.dumps(template, sort_keys=True))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _copy_plan(plan):
+        # plan is not modified once it is built, so only the ID
+        # needs to be replaced
+        plan = dict(plan)
+        if 'ID' in plan:
+            plan['ID'] = uuid.uuid4().hex
+        return plan
+
     def build_execution_plan(self, template, resources):
-        template = copy.deepcopy(template)
+        template = dsl.execute_in_thread(copy.deepcopy, template)
         if not isinstance(template, dict):
             raise ValueError('Incorrect execution plan ')
         format_version = template.get('FormatVersion')
@@ -293,7 +387,7 @@ class Agent(object):
         if use_base64:
             path = os.path.join(folder, file[1: -1])
             body = resources.string(path, binary=True)
-            body = base64.encode_as_text(body) + "\n"
+            body = dsl.execute_in_thread(base64.encode_as_text, body) + "\n"
         else:
             path = os.path.join(folder, file)
             body = resources.string(path)
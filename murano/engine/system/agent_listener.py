@@ -13,12 +13,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import greenlet
+import eventlet
 from oslo_config import cfg
 from oslo_log import log as logging
 
 from murano.common import exceptions
 from murano.common.i18n import _LE
+from murano.common.messaging import mqclient
 from murano.dsl import dsl
 from murano.engine.system import common
 
@@ -30,6 +31,127 @@ class AgentListenerException(Exception):
     pass
 
 
+class ResultsConsumer(object):
+    """Consumes execution results queues of agent listeners
+
+    There is one consumer per engine worker and RabbitMQ broker. It
+    consumes results queues of all active listeners that use the broker
+    over a single connection in a single green thread, which blocks on
+    the connection while there are no messages. Received messages are
+    passed to the listener owning the queue and acknowledged in batches.
+
+    Queues are declared by register() rather than by the consumer thread,
+    so that results published right after registration are not dropped by
+    the broker while the thread waits for messages of other queues.
+    """
+
+    def __init__(self, client_factory, prefetch_count=50, ack_batch_size=20,
+                 drain_timeout=1, declare_client_factory=None):
+        self._client_factory = client_factory
+        self._declare_client_factory = (declare_client_factory or
+                                        client_factory)
+        self._prefetch_count = prefetch_count
+        self._ack_batch_size = max(1, min(ack_batch_size, prefetch_count))
+        self._drain_timeout = drain_timeout
+        self._listeners = {}
+        self._thread = None
+        self._retrying = False
+
+    def register(self, queue, callback):
+        with self._declare_client_factory() as client:
+            client.declare(queue, enable_ha=True, ttl=86400000)
+        self._listeners[queue] = callback
+        if self._thread is None:
+            self._thread = eventlet.spawn(self._run)
+
+    def unregister(self, queue):
+        self._listeners.pop(queue, None)
+        if not self._listeners and self._retrying:
+            self._thread.kill()
+
+    def _run(self):
+        delay = 1
+        try:
+            while self._listeners:
+                try:
+                    self._receive()
+                    delay = 1
+                except Exception:
+                    LOG.exception(_LE('Error receiving execution results '
+                                      'from murano agents'))
+                    self._retrying = True
+                    eventlet.sleep(delay)
+                    self._retrying = False
+                    delay = min(delay * 2, 30)
+        finally:
+            self._thread = None
+            self._retrying = False
+            if self._listeners:
+                self._thread = eventlet.spawn(self._run)
+
+    def _receive(self):
+        with self._client_factory() as client:
+            with client.open(None, self._prefetch_count) as subscription:
+                queues = set()
+                unacked = []
+                try:
+                    while self._listeners:
+                        self._update_queues(subscription, queues)
+                        msg = subscription.get_message(
+                            timeout=self._drain_timeout)
+                        if msg is None:
+                            subscription.ack(unacked)
+                            unacked = []
+                            continue
+                        unacked.append(msg)
+                        self._dispatch(msg)
+                        if len(unacked) >= self._ack_batch_size:
+                            subscription.ack(unacked)
+                            unacked = []
+                finally:
+                    subscription.ack(unacked)
+
+    def _update_queues(self, subscription, queues):
+        for queue in queues - set(self._listeners):
+            subscription.remove_queue(queue)
+            queues.remove(queue)
+        for queue in set(self._listeners) - queues:
+            subscription.add_queue(queue)
+            queues.add(queue)
+
+    def _dispatch(self, msg):
+        if not isinstance(msg.body, dict):
+            return
+        # agents publish results to the default exchange so the routing
+        # key is the name of the queue. Otherwise each listener is offered
+        # the result until one of them recognizes its SourceID
+        callback = self._listeners.get(msg.routing_key)
+        if callback is not None:
+            callback(msg)
+            return
+        for callback in list(self._listeners.values()):
+            if callback(msg):
+                return
+
+
+_consumers = {}
+
+
+def get_results_consumer(region):
+    settings = common.get_rmq_settings(region)
+    key = tuple(sorted(settings.items()))
+    consumer = _consumers.get(key)
+    if consumer is None:
+        consumer = ResultsConsumer(
+            lambda: mqclient.MqClient(**settings),
+            CONF.engine.agent_results_prefetch_count,
+            CONF.engine.agent_results_ack_batch_size,
+            declare_client_factory=lambda: mqclient.get_pool(
+                CONF.rabbitmq.connection_pool_size, **settings).acquire())
+        _consumers[key] = consumer
+    return consumer
+
+
 @dsl.name('io.murano.system.AgentListener')
 class AgentListener(object):
     def __init__(self, name):
@@ -39,7 +161,7 @@ class AgentListener(object):
         self._enabled = True
         self._results_queue = str('-execution-results-%s' % name.lower())
         self._subscriptions = {}
-        self._receive_thread = None
+        self._consumer = None
 
     def _check_enabled(self):
         if CONF.engine.disable_murano_agent:
@@ -63,12 +185,12 @@ class AgentListener(object):
             LOG.debug("murano-agent is disabled by the server")
             return
 
-        if self._receive_thread is None:
+        if self._consumer is None:
             dsl.get_execution_session().on_session_finish(
                 lambda: self.stop())
-            self._receive_thread = dsl.spawn(
-                self._receive,
+            self._consumer = get_results_consumer(
                 dsl.get_this().find_owner('io.murano.CloudRegion'))
+            self._consumer.register(self._results_queue, self._receive)
 
     def stop(self):
         if CONF.engine.disable_murano_agent:
@@ -76,14 +198,9 @@ class AgentListener(object):
             LOG.debug("murano-agent is disabled by the server")
             return
 
-        if self._receive_thread is not None:
-            self._receive_thread.kill()
-            try:
-                self._receive_thread.wait()
-            except greenlet.GreenletExit:
-                pass
-            finally:
-                self._receive_thread = None
+        if self._consumer is not None:
+            self._consumer.unregister(self._results_queue)
+            self._consumer = None
 
     def subscribe(self, message_id, event):
         self._check_enabled()
@@ -94,19 +211,12 @@ class AgentListener(object):
         self._check_enabled()
         self._subscriptions.pop(message_id)
 
-    def _receive(self, region):
-        with common.create_rmq_client(region) as client:
-            client.declare(self._results_queue, enable_ha=True, ttl=86400000)
-            with client.open(self._results_queue) as subscription:
-                while True:
-                    msg = subscription.get_message()
-                    if not msg:
-                        continue
-                    msg.ack()
-                    msg_id = msg.body.get('SourceID', msg.id)
-                    LOG.debug("Got execution result: id '{msg_id}'"
-                              " body '{body}'".format(msg_id=msg_id,
-                                                      body=msg.body))
-                    if msg_id in self._subscriptions:
-                        event = self._subscriptions.pop(msg_id)
-                        event.send(msg.body)
+    def _receive(self, msg):
+        msg_id = msg.body.get('SourceID', msg.id)
+        LOG.debug("Got execution result: id '{msg_id}'"
+                  " body '{body}'".format(msg_id=msg_id, body=msg.body))
+        if msg_id in self._subscriptions:
+            event = self._subscriptions.pop(msg_id)
+            event.send(msg.body)
+            return True
+        return False
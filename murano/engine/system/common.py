@@ -13,15 +13,79 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import eventlet
 from oslo_config import cfg
+from oslo_log import log as logging
 
 from murano.common.messaging import mqclient
+from murano.dsl import helpers
 
 CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
 
 
-def create_rmq_client(region):
+def get_rmq_settings(region):
     region_config = region().getConfig()
     rmq_settings = dict(region_config['agentRabbitMq'])
     rmq_settings['ca_certs'] = CONF.rabbitmq.ca_certs.strip() or None
-    return mqclient.MqClient(**rmq_settings)
+    return rmq_settings
+
+
+def create_rmq_client(region):
+    return mqclient.MqClient(**get_rmq_settings(region))
+
+
+def get_rmq_client(region):
+    """Returns context manager that borrows pooled connected client"""
+
+    return mqclient.get_pool(
+        CONF.rabbitmq.connection_pool_size,
+        **get_rmq_settings(region)).acquire()
+
+
+class NotificationBatch(object):
+    """Buffers notification items and sends them in batches
+
+    Buffered items are passed to `send` as a list once `batch_size` of
+    them are collected, `interval` seconds after the first of them was
+    buffered or when the execution session they were added in finishes,
+    whichever comes first.
+    """
+
+    def __init__(self, send, batch_size, interval, error_message):
+        self._send = send
+        self._batch_size = batch_size
+        self._interval = interval
+        self._error_message = error_message
+        self._items = []
+        self._flush_timer = None
+        self._finish_session = None
+
+    def add(self, item):
+        self._items.append(item)
+        # items must not outlive the task
+        session = helpers.get_execution_session()
+        if session is not None and session is not self._finish_session:
+            session.on_session_finish(self.flush)
+            self._finish_session = session
+        if len(self._items) >= self._batch_size:
+            self.flush()
+        elif self._flush_timer is None:
+            self._flush_timer = eventlet.spawn_after(
+                self._interval, self._flush_safe)
+
+    def flush(self):
+        if self._flush_timer is not None:
+            # does nothing if called from the timer itself
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._items:
+            return
+        items, self._items = self._items, []
+        self._send(items)
+
+    def _flush_safe(self):
+        try:
+            self.flush()
+        except Exception:
+            LOG.exception(self._error_message)
@@ -0,0 +1,199 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import random
+import time
+
+import eventlet
+import eventlet.event
+from oslo_config import cfg
+from oslo_log import log as logging
+
+from murano.common.i18n import _LW
+
+LOG = logging.getLogger(__name__)
+CONF = cfg.CONF
+
+
+class _Waiter(object):
+    def __init__(self, stack_name, ready):
+        self.stack_name = stack_name
+        self.ready = ready
+        self.event = eventlet.event.Event()
+
+
+class _PollGroup(object):
+    def __init__(self, client):
+        self.client = client
+        self.waiters = []
+        self.wakeup = eventlet.event.Event()
+        self.thread = None
+
+
+class StackStatusPoller(object):
+    """Waits for Heat stacks of the engine worker to reach stable state
+
+    All stacks that are being waited on for the same group (tenant and
+    region) are polled with a single stacks.list() call. Poll interval
+    starts at `min_interval` and is doubled (up to `max_interval`) each
+    time nothing has changed for the group's waiters. Every new waiter
+    resets the interval. Intervals are randomized by +/- `jitter` so that
+    several workers do not hit Heat API simultaneously.
+
+    Waiters are green threads blocked on events. They are woken up by the
+    group's polling thread which exists only while there is someone to
+    wait for.
+    """
+
+    def __init__(self, min_interval=1.0, max_interval=8.0, jitter=0.2,
+                 max_failures=4):
+        self._min_interval = min_interval
+        self._max_interval = max(min_interval, max_interval)
+        self._jitter = jitter
+        self._max_failures = max_failures
+        self._groups = {}
+        self._total_polls = 0
+
+    @property
+    def total_polls(self):
+        return self._total_polls
+
+    def wait(self, client, group_key, stack_name, ready=None):
+        """Blocks until stack becomes ready
+
+        :param client: heat client to be used to poll the stack
+        :param group_key: key of the tenant/region the stack belongs to
+        :param stack_name: name of the stack
+        :param ready: predicate that receives stack summary (or None if
+                      there is no such stack) and tells whether to stop
+                      waiting. By default waits while stack is IN_PROGRESS
+        :return: stack summary as returned by stacks.list() or None if
+                 the stack does not exist
+        """
+
+        waiter = _Waiter(stack_name, ready or is_stable)
+        group = self._groups.get(group_key)
+        if group is None:
+            group = _PollGroup(client)
+            self._groups[group_key] = group
+        else:
+            # the most recently used client is the most likely to have
+            # a valid token
+            group.client = client
+        group.waiters.append(waiter)
+        if group.thread is None:
+            group.thread = eventlet.spawn(self._poll_loop, group_key, group)
+        elif not group.wakeup.ready():
+            group.wakeup.send()
+        try:
+            return waiter.event.wait()
+        finally:
+            if waiter in group.waiters:
+                group.waiters.remove(waiter)
+
+    def _poll_loop(self, group_key, group):
+        interval = self._min_interval
+        failures = 0
+        try:
+            while group.waiters:
+                try:
+                    stacks = self._list_stacks(group)
+                except Exception as e:
+                    failures += 1
+                    LOG.warning(_LW('Failed to poll Heat stacks: {error}')
+                                .format(error=e))
+                    if failures >= self._max_failures:
+                        failures = 0
+                        for waiter in list(group.waiters):
+                            group.waiters.remove(waiter)
+                            waiter.event.send_exception(e)
+                        continue
+                    interval = min(interval * 2, self._max_interval)
+                else:
+                    failures = 0
+                    if self._notify(group, stacks):
+                        interval = self._min_interval
+                    else:
+                        interval = min(interval * 2, self._max_interval)
+                if not group.waiters:
+                    break
+                if self._sleep(group, interval):
+                    interval = self._min_interval
+        except BaseException as e:
+            for waiter in group.waiters:
+                waiter.event.send_exception(e)
+            raise
+        finally:
+            group.thread = None
+            if self._groups.get(group_key) is group:
+                del self._groups[group_key]
+
+    def _list_stacks(self, group):
+        names = list(set(waiter.stack_name for waiter in group.waiters))
+        self._total_polls += 1
+        return dict((stack.stack_name, stack) for stack in
+                    group.client.stacks.list(filters={'name': names}))
+
+    @staticmethod
+    def _notify(group, stacks):
+        notified = False
+        for waiter in list(group.waiters):
+            stack = stacks.get(waiter.stack_name)
+            try:
+                ready = waiter.ready(stack)
+            except Exception as e:
+                group.waiters.remove(waiter)
+                waiter.event.send_exception(e)
+                notified = True
+                continue
+            if ready:
+                group.waiters.remove(waiter)
+                waiter.event.send(stack)
+                notified = True
+        return notified
+
+    def _randomize(self, interval):
+        return interval * random.uniform(1 - self._jitter, 1 + self._jitter)
+
+    def _sleep(self, group, interval):
+        # new waiter cuts the sleep short but still no more than one
+        # request per min_interval is made. Thus a burst of new waiters
+        # results in a single stacks.list() call.
+        # Returns True if the sleep was interrupted by a new waiter
+        start = time.time()
+        with eventlet.Timeout(self._randomize(interval), False):
+            group.wakeup.wait()
+            group.wakeup = eventlet.event.Event()
+            eventlet.sleep(max(
+                0, self._randomize(self._min_interval) -
+                (time.time() - start)))
+            return True
+        return False
+
+
+def is_stable(stack):
+    return stack is None or 'IN_PROGRESS' not in stack.stack_status
+
+
+_poller = None
+
+
+def get_poller():
+    global _poller
+    if _poller is None:
+        _poller = StackStatusPoller(
+            CONF.heat.stack_status_min_poll_interval,
+            CONF.heat.stack_status_max_poll_interval,
+            CONF.heat.stack_status_poll_jitter)
+    return _poller
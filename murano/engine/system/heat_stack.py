@@ -13,10 +13,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import copy
+import hashlib
 import json
 
 import eventlet
+import eventlet.semaphore
 import heatclient.client as hclient
 import heatclient.exc as heat_exc
 from oslo_config import cfg
@@ -27,18 +28,29 @@ from murano.common import auth_utils
 from murano.common.i18n import _LW
 from murano.dsl import dsl
 from murano.dsl import helpers
-from murano.dsl import session_local_storage
+from murano.engine.system import heat_poller
 
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
 
 HEAT_TEMPLATE_VERSION = '2013-05-23'
+FINGERPRINT_ATTRIBUTE = 'fingerprint'
 
 
 class HeatStackError(Exception):
     pass
 
 
+def _get_fingerprint(*values):
+    data = json.dumps(values, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def _get_this():
+    context = helpers.get_context()
+    return None if context is None else helpers.get_this(context)
+
+
 @dsl.name('io.murano.system.HeatStack')
 class HeatStack(object):
     def __init__(self, name, description=None, region_name=None):
@@ -48,10 +60,15 @@ class HeatStack(object):
         self._files = {}
         self._hot_environment = ''
         self._applied = True
+        self._revision = 0
+        self._applied_fingerprint = None
         self._description = description
         self._last_stack_timestamps = (None, None)
         self._tags = ''
         self._region_name = region_name
+        self._push_lock = eventlet.semaphore.Semaphore()
+        self._push_epoch = 0
+        self._completed_push_epoch = 0
 
     @staticmethod
     def _create_client(session, region_name):
@@ -65,10 +82,11 @@ class HeatStack(object):
         return self._get_client(self._region_name)
 
     @staticmethod
-    @session_local_storage.execution_session_memoize
     def _get_client(region_name):
-        session = auth_utils.get_client_session(conf=CONF.heat)
-        return HeatStack._create_client(session, region_name)
+        return auth_utils.get_pooled_client(
+            'heat', region_name,
+            lambda session: HeatStack._create_client(session, region_name),
+            conf=CONF.heat)
 
     def _get_token_client(self):
         ks_session = auth_utils.get_token_client_session(conf=CONF.heat)
@@ -100,25 +118,29 @@ class HeatStack(object):
 
     def reload(self):
         self._template = None
-        self._parameters.clear()
+        self._parameters = {}
         return self.current()
 
+    def _set_modified(self):
+        self._applied = False
+        self._revision += 1
+
     def set_template(self, template):
         self._template = template
-        self._parameters.clear()
-        self._applied = False
+        self._parameters = {}
+        self._set_modified()
 
     def set_parameters(self, parameters):
         self._parameters = parameters
-        self._applied = False
+        self._set_modified()
 
     def set_files(self, files):
         self._files = files
-        self._applied = False
+        self._set_modified()
 
     def set_hot_environment(self, hot_environment):
         self._hot_environment = hot_environment
-        self._applied = False
+        self._set_modified()
 
     def update_template(self, template):
         template_version = template.get('heat_template_version',
@@ -129,7 +151,8 @@ class HeatStack(object):
             raise HeatStackError(err_msg)
         current = self.current()
         self._template = helpers.merge_dicts(self._template, template)
-        self._applied = self._template == current and self._applied
+        if self._template != current:
+            self._set_modified()
 
     @staticmethod
     def _remove_system_params(parameters):
@@ -137,69 +160,67 @@ class HeatStack(object):
                     not k.startswith('OS::'))
 
     def _get_status(self):
-        status = [None]
-
-        def status_func(state_value):
-            status[0] = state_value
-            return True
-
-        self._wait_state(status_func)
-        return status[0]
+        stack_info = self._wait_stack()
+        return 'NOT_FOUND' if stack_info is None else stack_info.stack_status
+
+    def _wait_stack(self, wait_progress=False):
+        last_stack_timestamps = self._last_stack_timestamps
+
+        def ready(stack_info):
+            if not heat_poller.is_stable(stack_info):
+                return False
+            stack_timestamps = (None, None) if not stack_info \
+                else (stack_info.creation_time, stack_info.updated_time)
+            return not (wait_progress and
+                        last_stack_timestamps == stack_timestamps and
+                        last_stack_timestamps != (None, None))
+
+        session = helpers.get_execution_session()
+        group_key = (session and session.project_id, self._region_name)
+        stack_info = heat_poller.get_poller().wait(
+            self._client, group_key, self._name, ready)
+        self._last_stack_timestamps = (None, None) if not stack_info \
+            else (stack_info.creation_time, stack_info.updated_time)
+        return stack_info
 
     def _wait_state(self, status_func, wait_progress=False):
-        tries = 4
-        delay = 1
-
-        while tries > 0:
-            while True:
-                try:
-                    stack_info = self._client.stacks.get(
-                        stack_id=self._name)
-                    status = stack_info.stack_status
-                    tries = 4
-                    delay = 1
-                except heat_exc.HTTPNotFound:
-                    stack_info = None
-                    status = 'NOT_FOUND'
-                except Exception:
-                    tries -= 1
-                    delay *= 2
-                    if not tries:
-                        raise
-                    eventlet.sleep(delay)
-                    break
-
-                if 'IN_PROGRESS' in status:
-                    eventlet.sleep(2)
-                    continue
-
-                last_stack_timestamps = self._last_stack_timestamps
-                self._last_stack_timestamps = (None, None) if not stack_info \
-                    else(stack_info.creation_time, stack_info.updated_time)
-
-                if (wait_progress and last_stack_timestamps ==
-                        self._last_stack_timestamps and
-                        last_stack_timestamps != (None, None)):
-                    eventlet.sleep(2)
-                    continue
-
-                if not status_func(status):
-                    reason = ': {0}'.format(
-                        stack_info.stack_status_reason) if stack_info else ''
-                    raise EnvironmentError(
-                        "Unexpected stack state {0}{1}".format(status, reason))
-
-                try:
-                    return dict([(t['output_key'], t['output_value'])
-                                 for t in stack_info.outputs])
-                except Exception:
-                    return {}
-        return {}
+        stack_info = self._wait_stack(wait_progress)
+        status = 'NOT_FOUND' if stack_info is None \
+            else stack_info.stack_status
+        if not status_func(status):
+            reason = ': {0}'.format(
+                stack_info.stack_status_reason) if stack_info else ''
+            raise EnvironmentError(
+                "Unexpected stack state {0}{1}".format(status, reason))
+        return stack_info
 
     def output(self):
-        return self._wait_state(lambda status: True)
+        if self._wait_state(lambda status: True) is None:
+            return {}
+        # stack list the status is polled with does not contain outputs
+        try:
+            stack_info = self._client.stacks.get(stack_id=self._name)
+        except heat_exc.HTTPNotFound:
+            return {}
+        return dict([(t['output_key'], t['output_value'])
+                     for t in stack_info.outputs or []])
 
     def push(self):
+        # Pushes are coalesced: the push that is in flight might not
+        # include changes made after it had started. Thus every request
+        # needs a push that starts after the request was made. All requests
+        # that arrive while a push is in flight are served by the single
+        # follow-up push made by whoever acquires the lock first
+        required_epoch = self._push_epoch + 1
+        with self._push_lock:
+            if self._completed_push_epoch >= required_epoch:
+                return
+            self._push_epoch += 1
+            epoch = self._push_epoch
+            self._push()
+            self._completed_push_epoch = epoch
+
+    def _push(self):
         if self._applied or self._template is None:
             return
 
@@ -210,7 +231,22 @@ class HeatStack(object):
         if 'description' not in self._template and self._description:
             self._template['description'] = self._description
 
-        template = copy.deepcopy(self._template)
+        # setters replace values rather than modify them in place so that
+        # references taken here stay intact even if the stack gets modified
+        # while the push is in progress
+        template = self._template
+        parameters = self._parameters
+        files = self._files
+        hot_environment = self._hot_environment
+        revision = self._revision
+        fingerprint = _get_fingerprint(
+            template, parameters, files, hot_environment, self._tags)
+        if fingerprint == self._get_applied_fingerprint():
+            LOG.debug('Stack {stack_name} is up to date'.format(
+                stack_name=self._name))
+            self._applied = self._revision == revision
+            return
+
         LOG.debug('Pushing: {template}'.format(template=json.dumps(template)))
 
         while True:
@@ -223,10 +259,10 @@ class HeatStack(object):
                         token_client = self._get_token_client()
                         token_client.stacks.create(
                             stack_name=self._name,
-                            parameters=self._parameters,
+                            parameters=parameters,
                             template=template,
-                            files=self._files,
-                            environment=self._hot_environment,
+                            files=files,
+                            environment=hot_environment,
                             disable_rollback=True,
                             tags=self._tags)
 
@@ -236,9 +272,9 @@ class HeatStack(object):
                     if resources is not None:
                         self._client.stacks.update(
                             stack_id=self._name,
-                            parameters=self._parameters,
-                            files=self._files,
-                            environment=self._hot_environment,
+                            parameters=parameters,
+                            files=files,
+                            environment=hot_environment,
                             template=template,
                             disable_rollback=True,
                             tags=self._tags)
@@ -252,7 +288,33 @@ class HeatStack(object):
             else:
                 break
 
-        self._applied = self._template == template
+        if self._template:
+            self._set_applied_fingerprint(fingerprint)
+        self._applied = self._revision == revision
+
+    def _get_fingerprint_key(self):
+        # HeatStack objects are usually recreated on every deployment (see
+        # CloudRegion) while their owners persist in the object model. So
+        # the fingerprint is kept in the attributes of the owner and keyed
+        # by the name of the Heat stack rather than by the stack object
+        this = _get_this()
+        if this is None:
+            return None
+        return (this.owner or this, this.type,
+                '{0}:{1}'.format(FINGERPRINT_ATTRIBUTE, self._name))
+
+    def _get_applied_fingerprint(self):
+        key = self._get_fingerprint_key()
+        if key is None:
+            return self._applied_fingerprint
+        return helpers.get_attribute_store().get(*key)
+
+    def _set_applied_fingerprint(self, fingerprint):
+        key = self._get_fingerprint_key()
+        if key is None:
+            self._applied_fingerprint = fingerprint
+        else:
+            helpers.get_attribute_store().set(*(key + (fingerprint,)))
 
     def delete(self):
         while True:
@@ -276,3 +338,4 @@ class HeatStack(object):
 
         self._template = {}
         self._applied = True
+        self._set_applied_fingerprint(None)
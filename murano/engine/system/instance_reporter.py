@@ -15,9 +15,13 @@
 
 from oslo_config import cfg
 import oslo_messaging as messaging
+from oslo_utils import timeutils
 
+from murano.common.i18n import _LE
 from murano.common import uuidutils
 from murano.dsl import dsl
+from murano.dsl import helpers
+from murano.engine.system import common
 
 CONF = cfg.CONF
 
@@ -38,6 +42,36 @@ class InstanceReportNotifier(object):
             publisher_id=uuidutils.generate_uuid(),
             topic='murano')
         self._environment_id = environment.id
+        self._batch = common.NotificationBatch(
+            self._send_batch, CONF.engine.instance_tracking_batch_size,
+            CONF.engine.instance_tracking_batch_interval,
+            _LE('Failed to send instance tracking changes'))
+
+    def _send(self, event_type, payload):
+        if (helpers.get_execution_session() is None or
+                CONF.engine.instance_tracking_batch_size <= 1):
+            self._notifier.info({}, 'murano.' + event_type, payload)
+            return
+
+        change = dict(payload)
+        del change['environment']
+        change['action'] = 'track' if event_type == 'track_instance' \
+            else 'untrack'
+        # the change may be sent long after it happened, so it carries
+        # its own time
+        change['timestamp'] = timeutils.utcnow_ts()
+        self._batch.add(change)
+
+    def flush(self):
+        """Sends buffered changes in a single notification"""
+
+        self._batch.flush()
+
+    def _send_batch(self, changes):
+        self._notifier.info({}, 'murano.track_instances', {
+            'environment': self._environment_id,
+            'changes': changes
+        })
 
     def _track_instance(self, instance, instance_type,
                         type_title, unit_count):
@@ -50,7 +84,7 @@ class InstanceReportNotifier(object):
             'unit_count': unit_count
         }
 
-        self._notifier.info({}, 'murano.track_instance', payload)
+        self._send('track_instance', payload)
 
     def _untrack_instance(self, instance, instance_type):
         payload = {
@@ -59,7 +93,7 @@ class InstanceReportNotifier(object):
             'instance_type': instance_type,
         }
 
-        self._notifier.info({}, 'murano.untrack_instance', payload)
+        self._send('untrack_instance', payload)
 
     def track_application(self, instance, title=None, unit_count=None):
         self._track_instance(instance, APPLICATION, title, unit_count)
@@ -12,6 +12,7 @@
 # implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import bisect
 import math
 
 import netaddr
@@ -33,6 +34,45 @@ CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
 
 
+class CidrIndex(object):
+    """Sorted index of address ranges taken by subnets
+
+    Ranges are kept merged so that the starts and ends are both sorted
+    and overlap check is a single binary search.
+    """
+
+    def __init__(self, cidrs=()):
+        self._starts = []
+        self._ends = []
+        for cidr in cidrs:
+            self.add(cidr)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def add(self, cidr):
+        cidr = netaddr.IPNetwork(cidr)
+        first, last = cidr.first, cidr.last
+        lo = bisect.bisect_left(self._ends, first)
+        hi = bisect.bisect_right(self._starts, last)
+        if lo < hi:
+            first = min(first, self._starts[lo])
+            last = max(last, self._ends[hi - 1])
+        self._starts[lo:hi] = [first]
+        self._ends[lo:hi] = [last]
+
+    def overlaps(self, cidr):
+        cidr = netaddr.IPNetwork(cidr)
+        index = bisect.bisect_right(self._starts, cidr.last)
+        return index > 0 and self._ends[index - 1] >= cidr.first
+
+
+# CIDR indexes of routers keyed by (region, router ID). Allocated CIDRs are
+# added to the index immediately so that networks created in parallel
+# within the same deployment get different CIDRs
+_cidr_indexes = session_local_storage.SessionLocalDict()
+
+
 @dsl.name('io.murano.system.NetworkExplorer')
 class NetworkExplorer(object):
     def __init__(self, this, region_name=None):
@@ -44,18 +84,30 @@ class NetworkExplorer(object):
         self._region_name = region_name
 
     @staticmethod
-    @session_local_storage.execution_session_memoize
     def _get_client(region_name):
         neutron_settings = CONF.neutron
-        return nclient.Client(**auth_utils.get_session_client_parameters(
-            service_type='network', region=region_name, conf=neutron_settings
-        ))
+        return auth_utils.get_pooled_client(
+            'neutron', region_name,
+            lambda session: nclient.Client(
+                **auth_utils.get_session_client_parameters(
+                    service_type='network', region=region_name,
+                    conf=neutron_settings, session=session)),
+            conf=neutron_settings)
 
     @property
     def _client(self):
-        region = self._region_name or (
+        return self._get_client(self._get_region_name())
+
+    def _get_region_name(self):
+        return self._region_name or (
             None if self._region is None else self._region['name'])
-        return self._get_client(region)
+
+    @staticmethod
+    @session_local_storage.execution_session_memoize
+    def _get_subnet_cidrs(region_name):
+        client = NetworkExplorer._get_client(region_name)
+        subnets = client.list_subnets(fields=['id', 'cidr'])['subnets']
+        return dict((subnet['id'], subnet['cidr']) for subnet in subnets)
 
     # NOTE(starodubcevna): to avoid simultaneous router requests we use retry
     # decorator with random delay 1-10 seconds between attempts and maximum
@@ -115,16 +167,16 @@ class NetworkExplorer(object):
         range.
         If the cidr is taken will pick another one.
         """
-        taken_cidrs = self._get_cidrs_taken_by_router(router_id)
+        taken_cidrs = self._get_cidr_index(router_id)
         id_hash = hash(net_id)
         num_fails = 0
         while num_fails < len(self._available_cidrs):
             cidr = self._available_cidrs[
                 (id_hash + num_fails) % len(self._available_cidrs)]
-            if any(self._cidrs_overlap(cidr, taken_cidr) for taken_cidr in
-                   taken_cidrs):
+            if taken_cidrs.overlaps(cidr):
                 num_fails += 1
             else:
+                taken_cidrs.add(cidr)
                 return str(cidr)
         return None
 
@@ -156,25 +208,43 @@ class NetworkExplorer(object):
                 return ext_net_id
         return None
 
+    def _get_cidr_index(self, router_id):
+        key = (self._get_region_name(), router_id)
+        index = _cidr_indexes.get(key)
+        if index is None:
+            index = CidrIndex(self._get_cidrs_taken_by_router(router_id))
+            # another green thread might have built the index meanwhile
+            index = _cidr_indexes.setdefault(key, index)
+        return index
+
     def _get_cidrs_taken_by_router(self, router_id):
         if not router_id:
             return []
         ports = self._client.list_ports(device_id=router_id)['ports']
-        subnet_ids = []
+        subnet_ids = set()
         for port in ports:
             for fixed_ip in port['fixed_ips']:
-                subnet_ids.append(fixed_ip['subnet_id'])
+                subnet_ids.add(fixed_ip['subnet_id'])
 
-        all_subnets = self._client.list_subnets()['subnets']
-        filtered_cidrs = [netaddr.IPNetwork(subnet['cidr']) for subnet in
-                          all_subnets if subnet['id'] in subnet_ids]
+        subnet_cidrs = self._get_subnet_cidrs(self._get_region_name())
+        missing_ids = list(subnet_ids.difference(subnet_cidrs))
+        if missing_ids:
+            # subnets created after the listing was cached
+            for subnet in self._client.list_subnets(
+                    id=missing_ids, fields=['id', 'cidr'])['subnets']:
+                subnet_cidrs[subnet['id']] = subnet['cidr']
 
+        filtered_cidrs = []
+        for subnet_id in subnet_ids:
+            cidr = subnet_cidrs.get(subnet_id)
+            if cidr is None:
+                continue
+            cidr = netaddr.IPNetwork(cidr)
+            # candidate CIDRs are IPv4 only
+            if cidr.version == ipv4.version:
+                filtered_cidrs.append(cidr)
         return filtered_cidrs
 
-    @staticmethod
-    def _cidrs_overlap(cidr1, cidr2):
-        return (cidr1 in cidr2) or (cidr2 in cidr1)
-
     def _generate_possible_cidrs(self):
         bits_for_envs = int(
             math.ceil(math.log(self._settings.max_environments, 2)))
@@ -56,24 +56,31 @@ class ResourceManager(object):
     @specs.meta(constants.META_NO_TRACE, True)
     def string(receiver, name, owner=None, binary=False):
         path = ResourceManager._get_package(owner, receiver).get_resource(name)
-        mode = 'rb' if binary else 'rU'
-        with open(path, mode) as file:
-            return file.read()
+        return dsl.execute_in_thread(ResourceManager._read, path, binary)
 
     @classmethod
     @specs.parameter('owner', dsl.MuranoTypeParameter(nullable=True))
     @specs.inject('receiver', yaqltypes.Receiver())
     @specs.meta(constants.META_NO_TRACE, True)
     def json(cls, receiver, name, owner=None):
-        return jsonlib.loads(cls.string(receiver, name, owner))
+        path = cls._get_package(owner, receiver).get_resource(name)
+        return dsl.execute_in_thread(
+            lambda: jsonlib.loads(cls._read(path)))
 
     @classmethod
     @specs.parameter('owner', dsl.MuranoTypeParameter(nullable=True))
     @specs.inject('receiver', yaqltypes.Receiver())
     @specs.meta(constants.META_NO_TRACE, True)
     def yaml(cls, receiver, name, owner=None):
-        return yamllib.load(
-            cls.string(receiver, name, owner), Loader=yaml_loader)
+        path = cls._get_package(owner, receiver).get_resource(name)
+        return dsl.execute_in_thread(
+            lambda: yamllib.load(cls._read(path), Loader=yaml_loader))
+
+    @staticmethod
+    def _read(path, binary=False):
+        mode = 'rb' if binary else 'rU'
+        with open(path, mode) as file:
+            return file.read()
 
     @staticmethod
     def _get_package(owner, receiver):
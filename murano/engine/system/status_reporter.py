@@ -19,8 +19,10 @@ import oslo_messaging as messaging
 from oslo_utils import timeutils
 import six
 
+from murano.common.i18n import _LE
 from murano.common import uuidutils
 from murano.dsl import dsl
+from murano.engine.system import common
 
 CONF = cfg.CONF
 
@@ -40,6 +42,12 @@ class StatusReporter(object):
             self._environment_id = environment
         else:
             self._environment_id = environment.id
+        self._batch = None
+        if CONF.engine.status_report_batch_size > 1:
+            self._batch = common.NotificationBatch(
+                self._send_batch, CONF.engine.status_report_batch_size,
+                CONF.engine.status_report_batch_interval,
+                _LE('Failed to send status reports'))
 
     def _report(self, instance, msg, details=None, level='info'):
         body = {
@@ -51,7 +59,22 @@ class StatusReporter(object):
             'environment_id': self._environment_id,
             'timestamp': timeutils.isotime(subsecond=True)
         }
-        self._notifier.info({}, 'murano.report_notification', body)
+        if self._batch is None:
+            self._notifier.info({}, 'murano.report_notification', body)
+        else:
+            self._batch.add(body)
+
+    def flush(self):
+        """Sends buffered reports in a single batch notification"""
+
+        if self._batch is not None:
+            self._batch.flush()
+
+    def _send_batch(self, reports):
+        self._notifier.info({}, 'murano.report_notification_batch', {
+            'environment_id': self._environment_id,
+            'reports': reports
+        })
 
     def report(self, instance, msg):
         self._report(instance, msg)
@@ -27,7 +27,6 @@ from oslo_log import log as logging
 from murano.common import auth_utils
 from murano.common.i18n import _LW
 from murano.dsl import dsl
-from murano.dsl import session_local_storage
 
 CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
@@ -50,7 +49,6 @@ class MistralClient(object):
         return self._create_client(region)
 
     @staticmethod
-    @session_local_storage.execution_session_memoize
     def _create_client(region):
         if not mistralcli:
             LOG.warning(_LW("Mistral client is not available"))
@@ -61,23 +59,30 @@ class MistralClient(object):
         endpoint_type = mistral_settings.endpoint_type
         service_type = mistral_settings.service_type
         session = auth_utils.get_client_session()
-
-        mistral_url = mistral_settings.url or session.get_endpoint(
-            service_type=service_type,
-            endpoint_type=endpoint_type,
-            region_name=region)
+        # mistral client is bound to the token rather than to the session.
+        # Getting the access info renews the token if it is about to expire
         auth_ref = session.auth.get_access(session)
 
-        return mistralcli.client(
-            mistral_url=mistral_url,
-            project_id=auth_ref.project_id,
-            endpoint_type=endpoint_type,
-            service_type=service_type,
-            auth_token=auth_ref.auth_token,
-            user_id=auth_ref.user_id,
-            insecure=mistral_settings.insecure,
-            cacert=mistral_settings.ca_cert
-        )
+        def create_client(session):
+            mistral_url = mistral_settings.url or session.get_endpoint(
+                service_type=service_type,
+                endpoint_type=endpoint_type,
+                region_name=region)
+
+            return mistralcli.client(
+                mistral_url=mistral_url,
+                project_id=auth_ref.project_id,
+                endpoint_type=endpoint_type,
+                service_type=service_type,
+                auth_token=auth_ref.auth_token,
+                user_id=auth_ref.user_id,
+                insecure=mistral_settings.insecure,
+                cacert=mistral_settings.ca_cert
+            )
+
+        return auth_utils.get_pooled_client(
+            'mistral', (region, auth_ref.auth_token), create_client,
+            conf=mistral_settings)
 
     def upload(self, definition):
         self._client.workflows.create(definition)
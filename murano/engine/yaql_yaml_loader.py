@@ -17,17 +17,27 @@ import yaml
 import yaml.composer
 import yaml.constructor
 
+from murano.dsl import constants
 from murano.dsl import dsl_types
 from murano.dsl import helpers
 from murano.dsl import yaql_expression
 
 
+@helpers.lru_memoize(constants.POSITIONS_CACHE_SIZE)
+def _get_file_position(file_id, start_line, start_column,
+                       end_line, end_column):
+    # positions are immutable so identical ones (e.g. when the same
+    # package is loaded by several tasks) are shared
+    return dsl_types.ExpressionFilePosition(
+        file_id, start_line, start_column, end_line, end_column)
+
+
 @helpers.memoize
 def get_loader(version):
     version = helpers.parse_version(version)
 
     class MuranoPlDict(dict):
-        pass
+        __slots__ = ('source_file_position',)
 
     class YaqlExpression(yaql_expression.YaqlExpression):
         @staticmethod
@@ -36,7 +46,7 @@ def get_loader(version):
 
     def load(contents, file_id):
         def build_position(node):
-            return dsl_types.ExpressionFilePosition(
+            return _get_file_position(
                 file_id,
                 node.start_mark.line + 1,
                 node.start_mark.column + 1,
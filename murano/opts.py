@@ -44,6 +44,7 @@ _opt_lists = [
     ('mistral', murano.common.config.mistral_opts),
     ('networking', murano.common.config.networking_opts),
     ('stats', murano.common.config.stats_opts),
+    ('api_cache', murano.common.config.api_cache_opts),
     (None, build_list([
         murano.common.config.metadata_dir,
         murano.common.config.bind_opts,
@@ -12,9 +12,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
 import os
 import shutil
 import sys
+import tempfile
 
 import six
 import yaml
@@ -25,6 +27,10 @@ from murano.packages import package_base
 RESOURCES_DIR_NAME = 'Resources/'
 HOT_FILES_DIR_NAME = 'HotFiles/'
 HOT_ENV_DIR_NAME = 'HotEnvironments/'
+TRANSLATION_CACHE_DIR_NAME = '.translated'
+# should be increased whenever translation changes, so that translations
+# cached by previous versions are not used
+TRANSLATION_VERSION = 1
 
 
 class YAQL(object):
@@ -64,7 +70,8 @@ class HotPackage(package_base.PackageBase):
     @property
     def ui(self):
         if not self._translated_ui:
-            self._translated_ui = self._translate_ui()
+            self._translated_ui = self._get_translation(
+                'ui', self._translate_ui)
         return self._translated_ui
 
     def get_class(self, name):
@@ -72,16 +79,77 @@ class HotPackage(package_base.PackageBase):
             raise exceptions.PackageClassLoadError(
                 name, 'Class not defined in this package')
         if not self._translated_class:
-            self._translate_class()
+            self._translated_class = self._get_translation(
+                'class', self._translate_class)
+            resource = self.get_resource(self.full_name)
+            if not os.path.isfile(resource):
+                shutil.copy(self._get_template_file(), resource)
         return self._translated_class, '<generated code>'
 
+    def _get_template_file(self):
+        return os.path.join(self._source_directory, 'template.yaml')
+
+    def _get_translation(self, name, translate):
+        """Returns translation cached in the package directory
+
+        Translation of the template is kept in the package directory, so
+        that it is computed once rather than each time the package is
+        loaded, e.g. from the package cache of the engine. Cached
+        translation is identified by digest of everything it depends on,
+        thus it is never used once the package is changed.
+        """
+        template_file = self._get_template_file()
+        if not os.path.isfile(template_file):
+            return translate()
+
+        cache_file = os.path.join(
+            self._source_directory, TRANSLATION_CACHE_DIR_NAME,
+            '{0}-{1}.yaml'.format(name, self._get_translation_digest()))
+        if os.path.isfile(cache_file):
+            with open(cache_file) as stream:
+                return stream.read()
+
+        translation = translate()
+        cache_dir = os.path.dirname(cache_file)
+        try:
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir)
+            # concurrent loads of the package write their own files, and the
+            # file is replaced atomically
+            fd, temp_file = tempfile.mkstemp(dir=cache_dir)
+            try:
+                with os.fdopen(fd, 'w') as stream:
+                    stream.write(translation)
+                os.rename(temp_file, cache_file)
+            except Exception:
+                os.remove(temp_file)
+                raise
+        except (IOError, OSError):
+            # package directory is not writable, the translation is just
+            # not cached
+            pass
+        return translation
+
+    def _get_translation_digest(self):
+        digest = hashlib.sha256()
+        for value in (TRANSLATION_VERSION, self.full_name, self.description,
+                      self.version):
+            digest.update(six.text_type(value).encode('utf-8') + b'\0')
+        with open(self._get_template_file(), 'rb') as stream:
+            digest.update(stream.read())
+        for dir_name in (HOT_FILES_DIR_NAME, HOT_ENV_DIR_NAME):
+            files = HotPackage._build_hot_resources(os.path.join(
+                self._source_directory, RESOURCES_DIR_NAME, dir_name))
+            for path in sorted(files):
+                digest.update(b'\0' + path.encode('utf-8'))
+        return digest.hexdigest()
+
     def _translate_class(self):
-        template_file = os.path.join(self._source_directory, 'template.yaml')
+        template_file = self._get_template_file()
 
         if not os.path.isfile(template_file):
             raise exceptions.PackageClassLoadError(
                 self.full_name, 'File with class definition not found')
-        shutil.copy(template_file, self.get_resource(self.full_name))
         with open(template_file) as stream:
             hot = yaml.safe_load(stream)
             if 'resources' not in hot:
@@ -113,6 +181,7 @@ class HotPackage(package_base.PackageBase):
         # may be interpreted as YAQL expressions upon load
         self._translated_class = yaml.dump(
             translated, Dumper=Dumper, default_style='"')
+        return self._translated_class
 
     @staticmethod
     def _build_properties(hot, validate_hot_parameters):
@@ -516,7 +585,7 @@ class HotPackage(package_base.PackageBase):
         return app
 
     def _translate_ui(self):
-        template_file = os.path.join(self._source_directory, 'template.yaml')
+        template_file = self._get_template_file()
 
         if not os.path.isfile(template_file):
             raise exceptions.PackageClassLoadError(
@@ -47,7 +47,13 @@ def get_plugin_loader():
 
 @contextlib.contextmanager
 def load_from_file(archive_path, target_dir=None, drop_dir=False):
-    if not os.path.isfile(archive_path):
+    """Extracts and loads a package
+
+    :param archive_path: path to the package archive or a seekable
+                         file-like object with its content
+    """
+    if not hasattr(archive_path, 'read') and not os.path.isfile(
+            archive_path):
         raise e.PackageLoadError('Unable to find package file')
     created = False
     if not target_dir:
@@ -10,9 +10,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from murano.common import progress
 from murano.common import rpc
 from murano.db import models
 from murano.db.services import actions as actions_db
+from murano.db.services import session_model
 from murano.services import states
 
 
@@ -29,12 +31,13 @@ class ActionServices(object):
             }
         task = {
             'action': action,
-            'model': session.description,
+            'model': session_model.SessionModelServices.get_description(
+                session),
             'token': token,
             'tenant_id': environment.tenant_id,
             'id': environment.id
         }
-        if session.description['Objects'] is not None:
+        if task['model']['Objects'] is not None:
             task['model']['Objects']['?']['id'] = environment.id
             task['model']['Objects']['applications'] = \
                 task['model']['Objects'].pop('services', [])
@@ -64,6 +67,7 @@ class ActionServices(object):
             environment, session, token)
         task_id = actions_db.update_task(action_name, session, task, unit)
         rpc.engine().handle_task(task)
+        progress.publish(environment.id)
         return task_id
 
     @staticmethod
@@ -71,7 +75,9 @@ class ActionServices(object):
         if args is None:
             args = {}
         environment = actions_db.get_environment(session, unit)
-        action = ActionServices.find_action(session.description, action_id)
+        action = ActionServices.find_action(
+            session_model.SessionModelServices.get_description(session),
+            action_id)
         if action is None:
             raise LookupError('Action is not found')
         if not action[1].get('enabled', True):
@@ -14,6 +14,7 @@
 # limitations under the License.
 
 import cgi
+import hashlib
 import imghdr
 import os
 import tempfile
@@ -30,6 +31,7 @@ from webob import exc
 
 from murano.api.v1 import catalog
 from murano.api.v1 import PKG_PARAMS_MAP
+from murano.common import cache
 from murano.common import exceptions as common_exc
 from murano.db.catalog import api as db_catalog_api
 from murano.db import models
@@ -114,6 +116,34 @@ class TestCatalogApi(test_base.ControllerTest, test_base.MuranoApiTestCase):
                 'type': 'Library'}))
         self.assertEqual(2, len(result['packages']))
 
+    def test_packages_search_is_cached(self):
+        self.override_config('enabled', True, 'api_cache')
+        cache.reset()
+        self.addCleanup(cache.reset)
+        self._set_policy_rules(
+            {'get_package': '',
+             'manage_public_package': ''}
+        )
+        for dummy in range(4):
+            self.expect_policy_check('get_package')
+            self.expect_policy_check('manage_public_package')
+
+        self._add_pkg('test_tenant')
+        with mock.patch.object(db_catalog_api, 'package_search',
+                               wraps=db_catalog_api.package_search) as search:
+            for dummy in range(2):
+                result = self.controller.search(self._get(
+                    '/v1/catalog/packages/'))
+                self.assertEqual(1, len(result['packages']))
+            self.assertEqual(1, search.call_count)
+
+            self._add_pkg('test_tenant')
+            for dummy in range(2):
+                result = self.controller.search(self._get(
+                    '/v1/catalog/packages/'))
+                self.assertEqual(2, len(result['packages']))
+            self.assertEqual(2, search.call_count)
+
     def test_packages_filtering_non_admin(self):
         self.is_admin = False
         self._set_policy_rules(
@@ -792,7 +822,7 @@ class TestCatalogApi(test_base.ControllerTest, test_base.MuranoApiTestCase):
         )
         result = self.controller.get_supplier_logo(req, saved_package.id)
 
-        self.assertEqual('png', imghdr.what('', result))
+        self.assertEqual('png', imghdr.what('', result.body))
 
     def test_download_package(self):
         self._set_policy_rules(
@@ -813,6 +843,61 @@ class TestCatalogApi(test_base.ControllerTest, test_base.MuranoApiTestCase):
 
         self.assertEqual(200, result.status_code)
 
+    def test_download_package_range(self):
+        self._set_policy_rules({'download_package': '@'})
+        _, package = self._test_package()
+        saved_package = db_catalog_api.package_upload(package, '')
+        url = '/catalog/packages/%s/download' % saved_package.id
+
+        self.expect_policy_check('download_package',
+                                 {'package_id': saved_package.id})
+        req = self._get_with_accept(url)
+        result = req.get_response(self.api)
+        self.assertEqual(package['archive'], result.body)
+        self.assertEqual(len(package['archive']), result.content_length)
+        etag = result.etag
+        self.assertIsNotNone(etag)
+
+        self.expect_policy_check('download_package',
+                                 {'package_id': saved_package.id})
+        req = self._get_with_accept(url)
+        req.range = (10, 260)
+        with mock.patch.object(
+                db_catalog_api, 'package_archive_read',
+                wraps=db_catalog_api.package_archive_read) as read:
+            result = req.get_response(self.api)
+            self.assertEqual(206, result.status_code)
+            self.assertEqual(package['archive'][10:260], result.body)
+        read.assert_called_once_with(saved_package.id, 10, 260)
+
+        self.expect_policy_check('download_package',
+                                 {'package_id': saved_package.id})
+        req = self._get_with_accept(url)
+        req.if_none_match = etag
+        with mock.patch.object(db_catalog_api,
+                               'package_archive_size') as size:
+            result = req.get_response(self.api)
+            self.assertFalse(size.called)
+        self.assertEqual(304, result.status_code)
+        self.assertEqual(b'', result.body)
+
+    def test_search_does_not_load_blobs(self):
+        self._set_policy_rules({'get_package': '',
+                                'manage_public_package': ''})
+        self.expect_policy_check('get_package')
+        self.expect_policy_check('manage_public_package')
+        for _ in range(3):
+            self._add_pkg('test_tenant')
+        req = self._get('/v1/catalog/packages')
+        result = self.controller.search(req)
+        self.assertEqual(3, len(result['packages']))
+
+        packages = db_catalog_api.package_search({}, req.context)
+        for package in packages:
+            for name in ['archive', 'logo', 'supplier_logo',
+                         'ui_definition']:
+                self.assertNotIn(name, package.__dict__)
+
     def test_download_package_negative(self):
 
         _, package = self._test_package()
@@ -1003,6 +1088,29 @@ class TestCatalogApi(test_base.ControllerTest, test_base.MuranoApiTestCase):
 
         self.assertEqual(200, result.status_code)
 
+    def test_get_ui_definition_etag(self):
+        self._set_policy_rules({'get_package': '@'})
+        _, package = self._test_package()
+        package['ui_definition'] = 'Version: 2.2\nForms: []\n'
+        saved_package = db_catalog_api.package_upload(package, '')
+        url = '/catalog/packages/%s/ui' % saved_package.id
+
+        self.expect_policy_check('get_package',
+                                 {'package_id': saved_package.id})
+        result = self._get_with_accept(url, accept='text/plain').get_response(
+            self.api)
+        self.assertEqual(package['ui_definition'], result.text)
+        self.assertFalse(result.etag is None)
+
+        self.expect_policy_check('get_package',
+                                 {'package_id': saved_package.id})
+        req = self._get_with_accept(url, accept='text/plain')
+        req.if_none_match = result.etag
+        with mock.patch.object(db_catalog_api, 'package_get_blob') as get:
+            result = req.get_response(self.api)
+            self.assertFalse(get.called)
+        self.assertEqual(304, result.status_code)
+
     def test_get_ui_definition_negative(self):
         _, package = self._test_package()
 
@@ -1038,6 +1146,24 @@ class TestCatalogApi(test_base.ControllerTest, test_base.MuranoApiTestCase):
         self.assertEqual(200, result.status_code)
         self.assertEqual(package['logo'], result.body)
 
+    def test_get_logo_range(self):
+        self._set_policy_rules({'get_package': '@'})
+        _, package = self._test_package()
+        saved_package = db_catalog_api.package_upload(package, '')
+
+        self.expect_policy_check('get_package',
+                                 {'package_id': saved_package.id})
+        req = self._get_with_accept('/catalog/packages/%s/logo'
+                                    % saved_package.id,
+                                    accept='application/octet-stream')
+        req.range = (5, 20)
+        with mock.patch.object(db_catalog_api, 'package_get_blob',
+                               wraps=db_catalog_api.package_get_blob) as get:
+            result = req.get_response(self.api)
+        get.assert_called_once_with(saved_package.id, 'logo')
+        self.assertEqual(206, result.status_code)
+        self.assertEqual(package['logo'][5:20], result.body)
+
     def test_get_logo_negative(self):
         _, package = self._test_package()
 
@@ -1131,6 +1257,45 @@ This is a fake zip archive
             res = req.get_response(self.api)
             self.assertEqual(200, res.status_code)
 
+    def test_upload_package_archive_from_file(self):
+        self._set_policy_rules({'upload_package': '@'})
+        self.expect_policy_check('upload_package')
+        pkg, _ = self._test_package()
+        archive = pkg.blob
+        body = (b'--BOUNDARY\r\n'
+                b'Content-Disposition: form-data; name="ziparchive"; '
+                b'filename="package.zip"\r\n\r\n' + archive +
+                b'\r\n--BOUNDARY--\r\n')
+
+        with mock.patch.object(catalog, 'BLOB_CHUNK_SIZE', 100):
+            req = self._post('/catalog/packages', body,
+                             content_type='multipart/form-data; '
+                                          'boundary=BOUNDARY')
+            result = req.get_response(self.api)
+
+        self.assertEqual(200, result.status_code)
+        package_id = jsonutils.loads(result.body)['id']
+        self.assertEqual(archive, b''.join(
+            db_catalog_api.package_archive_read(package_id)))
+
+    def test_check_archive(self):
+        self.override_config('package_size_limit', 1, 'murano')
+        archive = six.BytesIO(b'a' * 3 * 1024 * 1024)
+        e = self.assertRaises(exc.HTTPBadRequest, catalog._check_archive,
+                              archive)
+        self.assertIn('Uploading file is too large', e.explanation)
+        # the size is checked without reading the archive
+        archive.seek(0)
+        with mock.patch.object(archive, 'read') as read:
+            self.assertRaises(exc.HTTPBadRequest, catalog._check_archive,
+                              archive)
+        self.assertFalse(read.called)
+
+        archive = six.BytesIO(b'archive')
+        self.assertEqual((7, hashlib.sha256(b'archive').hexdigest()),
+                         catalog._check_archive(archive))
+        self.assertEqual(0, archive.tell())
+
     def test_add_category(self):
         """Check that category added successfully"""
 
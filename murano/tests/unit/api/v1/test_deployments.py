@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+
 import mock
 import murano.tests.unit.api.base as tb
 
@@ -21,6 +23,8 @@ from oslo_serialization import jsonutils
 
 from murano.api.v1 import deployments
 from murano.api.v1 import environments
+from murano.db import models
+from murano.db import session as db_session
 
 from webob import exc
 
@@ -180,3 +184,270 @@ class TestDeploymentsApi(tb.ControllerTest, tb.MuranoApiTestCase):
         query_result.filter_by.return_value = filter_by_result
         result = deployments.set_dep_state(deployment, unit)
         self.assertEqual('running_w_errors', result.state)
+
+    def _create_deployments(self, count):
+        self._set_policy_rules({'list_deployments': '@'})
+        unit = db_session.get_session()
+        environment = models.Environment(
+            name='test_environment', tenant_id='test_tenant', version=1,
+            description={})
+        unit.add(environment)
+        unit.flush()
+        started = datetime.datetime(2016, 1, 1)
+        ids = []
+        for i in range(count):
+            created = started + datetime.timedelta(minutes=i // 2)
+            task = models.Task(
+                environment_id=environment.id, created=created,
+                started=created, description={'applications': [i]})
+            if i % 3:
+                task.finished = created
+            for level in ['error'] * (i % 2) + ['warning'] * (i % 3) + [
+                    'info']:
+                task.statuses.append(models.Status(text='text', level=level))
+            unit.add(task)
+            unit.flush()
+            ids.append(task.id)
+        return environment.id, ids
+
+    def _index(self, environment_id, **params):
+        self.expect_policy_check('list_deployments',
+                                 {'environment_id': environment_id})
+        request = self._get('/environments/{0}/deployments'.format(
+            environment_id), params=params)
+        return self.deployments_controller.index(request, environment_id)
+
+    def test_deployments_index_states(self):
+        environment_id, ids = self._create_deployments(4)
+        result = self._index(environment_id)
+        self.assertNotIn('next_marker', result)
+        deployments = dict((deployment['id'], deployment)
+                           for deployment in result['deployments'])
+        self.assertEqual(
+            ['running', 'completed_w_errors', 'completed_w_warnings',
+             'running_w_errors'],
+            [deployments[task_id]['state'] for task_id in ids])
+        self.assertEqual({'services': [3]}, deployments[ids[3]]['description'])
+
+    def test_deployments_index_pagination(self):
+        environment_id, ids = self._create_deployments(5)
+        with mock.patch.object(deployments, 'set_dep_state') as set_state:
+            pages = []
+            marker = None
+            while True:
+                params = {'limit': 2}
+                if marker:
+                    params['marker'] = marker
+                result = self._index(environment_id, **params)
+                pages.append([deployment['id']
+                              for deployment in result['deployments']])
+                marker = result.get('next_marker')
+                if not marker:
+                    break
+            self.assertFalse(set_state.called)
+        # newest first; equal creation times are ordered by id
+        expected = sorted(
+            range(5), key=lambda i: (i // 2, ids[i]), reverse=True)
+        self.assertEqual([ids[i] for i in expected],
+                         sum(pages, []))
+        self.assertEqual([2, 2, 1], [len(page) for page in pages])
+        self.assertNotIn('description', result['deployments'][0])
+
+        result = self._index(environment_id, limit=1,
+                             include_description='true')
+        self.assertEqual({'services': [ids.index(
+            result['deployments'][0]['id'])]},
+            result['deployments'][0]['description'])
+
+    def test_deployments_index_invalid_params(self):
+        environment_id, ids = self._create_deployments(1)
+        self.assertRaises(exc.HTTPBadRequest, self._index,
+                          environment_id, limit='x')
+        self.assertRaises(exc.HTTPBadRequest, self._index,
+                          environment_id, limit=0)
+        self.assertRaises(exc.HTTPBadRequest, self._index,
+                          environment_id, marker='missing')
+
+    def _create_reports(self, count):
+        environment_id, ids = self._create_deployments(1)
+        unit = db_session.get_session()
+        task = unit.query(models.Task).get(ids[0])
+        task.description = {'applications': [
+            {'?': {'id': 'app1'}, 'instance': {'?': {'id': 'vm1'}}},
+            {'?': {'id': 'app2'}}]}
+        unit.query(models.Status).filter_by(task_id=task.id).delete()
+        created = datetime.datetime(2016, 1, 1)
+        for i in range(count):
+            unit.add(models.Status(
+                task_id=task.id, text=str(i), level='info',
+                entity_id=['app1', 'vm1', 'app2'][i % 3],
+                created=created + datetime.timedelta(seconds=i // 2)))
+        unit.flush()
+        deployments._service_entities.clear()
+        self.addCleanup(deployments._service_entities.clear)
+        return environment_id, task.id
+
+    def _statuses(self, environment_id, deployment_id, params=None,
+                  **kwargs):
+        params = list(params or []) + list(kwargs.items())
+        self._set_policy_rules({'statuses_deployments': '@'})
+        self.expect_policy_check('statuses_deployments',
+                                 {'environment_id': environment_id,
+                                  'deployment_id': deployment_id})
+        request = self._get('/environments/{0}/deployments/{1}'.format(
+            environment_id, deployment_id), params=params)
+        result = self.deployments_controller.statuses(
+            request, environment_id, deployment_id)
+        result['reports'] = list(result['reports'])
+        return result
+
+    def test_statuses_pagination(self):
+        environment_id, deployment_id = self._create_reports(7)
+        result = self._statuses(environment_id, deployment_id)
+        full_history = [report['text'] for report in result['reports']]
+        # reports created at the same time are ordered by id
+        self.assertEqual([i // 2 for i in range(7)],
+                         [int(text) // 2 for text in full_history])
+        self.assertNotIn('next_marker', result)
+
+        texts = []
+        marker = None
+        while True:
+            params = {'limit': 3}
+            if marker:
+                params['marker'] = marker
+            result = self._statuses(environment_id, deployment_id, **params)
+            texts.extend(report['text'] for report in result['reports'])
+            marker = result.get('next_marker')
+            if not marker:
+                break
+        self.assertEqual(full_history, texts)
+
+        result = self._statuses(environment_id, deployment_id,
+                                since='2016-01-01T00:00:01Z')
+        self.assertEqual(['4', '5', '6'],
+                         sorted(report['text']
+                                for report in result['reports']))
+        self.assertRaises(exc.HTTPBadRequest, self._statuses,
+                          environment_id, deployment_id, since='yesterday')
+        self.assertRaises(exc.HTTPBadRequest, self._statuses,
+                          environment_id, deployment_id, marker='missing')
+
+    def test_statuses_service_filter(self):
+        environment_id, deployment_id = self._create_reports(6)
+        result = self._statuses(environment_id, deployment_id,
+                                service_id='app1')
+        self.assertEqual(['0', '1', '3', '4'],
+                         sorted(report['text']
+                                for report in result['reports']))
+        self.assertIn(deployment_id, deployments._service_entities)
+
+        with mock.patch.object(deployments, '_patch_description') as patch:
+            result = self._statuses(environment_id, deployment_id,
+                                    [('service_id', 'app1'),
+                                     ('service_id', 'app2')])
+            self.assertFalse(patch.called)
+        self.assertEqual(6, len(result['reports']))
+
+    def test_statuses_are_streamed(self):
+        environment_id, deployment_id = self._create_reports(250)
+        self._set_policy_rules({'statuses_deployments': '@'})
+        self.expect_policy_check('statuses_deployments',
+                                 {'environment_id': environment_id,
+                                  'deployment_id': deployment_id})
+        request = self._get('/environments/{0}/deployments/{1}'.format(
+            environment_id, deployment_id))
+        response = request.get_response(self.api)
+        self.assertEqual(200, response.status_code)
+        reports = jsonutils.loads(response.body)['reports']
+        self.assertEqual(sorted(str(i) for i in range(250)),
+                         sorted(report['text'] for report in reports))
+        self.assertNotIn('next_marker', jsonutils.loads(response.body))
+
+    def test_unpaginated_statuses_are_not_limited(self):
+        environment_id, deployment_id = self._create_reports(5)
+        self.override_config('api_limit_max', 3, 'murano')
+        result = self._statuses(environment_id, deployment_id)
+        self.assertEqual(5, len(result['reports']))
+        self.assertNotIn('next_marker', result)
+
+    @mock.patch('murano.common.wsgi.LOG')
+    def test_statuses_stream_failure_aborts_response(self, log):
+        environment_id, deployment_id = self._create_reports(5)
+        self._set_policy_rules({'statuses_deployments': '@'})
+        self.expect_policy_check('statuses_deployments',
+                                 {'environment_id': environment_id,
+                                  'deployment_id': deployment_id})
+        request = self._get('/environments/{0}/deployments/{1}'.format(
+            environment_id, deployment_id))
+        with mock.patch.object(models.Status, 'to_dict',
+                               side_effect=RuntimeError):
+            response = request.get_response(self.api)
+            self.assertEqual(200, response.status_code)
+            self.assertRaises(RuntimeError, lambda: response.body)
+        self.assertTrue(log.exception.called)
+
+    def _progress(self, environment_id, **params):
+        self._set_policy_rules({'statuses_deployments': '@'})
+        self.expect_policy_check('statuses_deployments',
+                                 {'environment_id': environment_id})
+        request = self._get('/environments/{0}/progress'.format(
+            environment_id), params=params)
+        return self.deployments_controller.progress(request, environment_id)
+
+    def test_progress_returns_new_reports(self):
+        environment_id, deployment_id = self._create_reports(5)
+        result = self._progress(environment_id)
+        self.assertEqual('ready', result['status'])
+        self.assertEqual(5, len(result['reports']))
+        marker = result['next_marker']
+        self.assertEqual(result['reports'][-1]['id'], marker)
+
+        unit = db_session.get_session()
+        unit.add(models.Status(
+            task_id=deployment_id, text='new', level='info',
+            created=datetime.datetime(2016, 1, 2)))
+        unit.flush()
+        result = self._progress(environment_id, marker=marker,
+                                status='ready')
+        self.assertEqual(['new'],
+                         [report['text'] for report in result['reports']])
+
+        self.assertRaises(exc.HTTPBadRequest, self._progress,
+                          environment_id, marker='missing')
+        self.assertRaises(exc.HTTPBadRequest, self._progress,
+                          environment_id, timeout='x')
+
+    def test_progress_times_out(self):
+        environment_id, deployment_id = self._create_reports(1)
+        marker = self._progress(environment_id)['next_marker']
+        self.override_config('progress_db_poll_interval', 0.1, 'murano')
+        with mock.patch('murano.common.progress.Subscription.wait',
+                        autospec=True, return_value=False) as wait:
+            result = self._progress(environment_id, marker=marker,
+                                    status='ready', timeout=0)
+        self.assertFalse(wait.called)
+        self.assertEqual([], result['reports'])
+        self.assertEqual(marker, result['next_marker'])
+
+    def test_progress_is_woken_up_by_notification(self):
+        environment_id, deployment_id = self._create_reports(1)
+        marker = self._progress(environment_id)['next_marker']
+        self.override_config('progress_db_poll_interval', 10, 'murano')
+
+        def add_report(subscription, timeout):
+            unit = db_session.get_session()
+            unit.add(models.Status(
+                task_id=deployment_id, text='new', level='info',
+                created=datetime.datetime(2016, 1, 2)))
+            unit.flush()
+            return True
+
+        with mock.patch('murano.common.progress.Subscription.wait',
+                        autospec=True, side_effect=add_report) as wait:
+            result = self._progress(environment_id, marker=marker,
+                                    status='ready', timeout=30)
+        self.assertEqual(1, wait.call_count)
+        self.assertEqual(10, wait.call_args[0][1])
+        self.assertEqual(['new'],
+                         [report['text'] for report in result['reports']])
@@ -0,0 +1,101 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from murano.common import auth_utils
+from murano.tests.unit import base
+
+
+class TestClientPool(base.MuranoTestCase):
+    def setUp(self):
+        super(TestClientPool, self).setUp()
+        self.override_config('auth_uri', 'http://keystone/v2.0',
+                             'keystone_authtoken')
+        self.addCleanup(auth_utils._pool.clear)
+        auth_utils._pool.clear()
+        patcher = mock.patch.object(
+            auth_utils, '_get_session',
+            side_effect=lambda auth, conf_section: mock.Mock(auth=auth))
+        self.get_session = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(auth_utils, '_get_keystone_auth')
+        self.get_keystone_auth = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def _session(trust_id=None, token='token', project_id='project'):
+        return mock.Mock(trust_id=trust_id, token=token,
+                         project_id=project_id)
+
+    def test_sessions_are_reused(self):
+        session = auth_utils.get_client_session(self._session('trust1'))
+        self.assertIs(session, auth_utils.get_client_session(
+            self._session('trust1')))
+        self.assertIsNot(session, auth_utils.get_client_session(
+            self._session('trust2')))
+        token_session = auth_utils.get_client_session(self._session())
+        self.assertIs(token_session, auth_utils.get_client_session(
+            self._session()))
+        self.assertIsNot(token_session, auth_utils.get_client_session(
+            self._session(project_id='project2')))
+        self.assertEqual(4, self.get_session.call_count)
+
+    def test_clients_are_isolated(self):
+        factory = mock.Mock(side_effect=lambda session: mock.Mock())
+        client = auth_utils.get_pooled_client(
+            'heat', 'region', factory, execution_session=self._session('t1'))
+        self.assertIs(client, auth_utils.get_pooled_client(
+            'heat', 'region', factory, execution_session=self._session('t1')))
+        for name, region, trust_id in (('heat', 'region2', 't1'),
+                                       ('neutron', 'region', 't1'),
+                                       ('heat', 'region', 't2')):
+            self.assertIsNot(client, auth_utils.get_pooled_client(
+                name, region, factory,
+                execution_session=self._session(trust_id)))
+        self.assertEqual(4, factory.call_count)
+
+    def test_pool_size(self):
+        self.override_config('client_pool_size', 2, 'engine')
+        sessions = [auth_utils.get_client_session(self._session(trust_id))
+                    for trust_id in ('t1', 't2', 't1', 't3')]
+        self.assertIs(sessions[0], sessions[2])
+        self.assertIs(sessions[0], auth_utils.get_client_session(
+            self._session('t1')))
+        self.assertIsNot(sessions[1], auth_utils.get_client_session(
+            self._session('t2')))
+
+        self.override_config('client_pool_size', 0, 'engine')
+        self.assertIsNot(sessions[0], auth_utils.get_client_session(
+            self._session('t1')))
+
+    @mock.patch('murano.common.auth_utils.time')
+    def test_max_age(self, time_mock):
+        self.override_config('client_pool_max_age', 100, 'engine')
+        time_mock.time.return_value = 1000
+        session = auth_utils.get_client_session(self._session('t1'))
+        time_mock.time.return_value = 1100
+        self.assertIs(session, auth_utils.get_client_session(
+            self._session('t1')))
+        time_mock.time.return_value = 1101
+        self.assertIsNot(session, auth_utils.get_client_session(
+            self._session('t1')))
+
+    @mock.patch('murano.common.auth_utils.ks_client')
+    def test_deleted_trust_is_discarded(self, ks_client):
+        session = auth_utils.get_client_session(self._session('t1'))
+        auth_utils.delete_trust('t1')
+        ks_client.Client().trusts.delete.assert_called_once_with('t1')
+        self.assertIsNot(session, auth_utils.get_client_session(
+            self._session('t1')))
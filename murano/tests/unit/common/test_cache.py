@@ -0,0 +1,122 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from murano.common import cache
+from murano.db.catalog import api as db_catalog_api
+from murano.db import models
+from murano.db import session as db_session
+from murano.tests.unit import base
+
+
+class TestLocalBackend(base.MuranoTestCase):
+    def test_least_recently_used_values_are_evicted(self):
+        backend = cache.LocalBackend(2)
+        backend.set('a', 1)
+        backend.set('b', 2)
+        self.assertEqual(1, backend.get('a'))
+        backend.set('c', 3)
+        self.assertIsNone(backend.get('b'))
+        self.assertEqual(1, backend.get('a'))
+        self.assertEqual(3, backend.get('c'))
+
+    @mock.patch('murano.common.cache.time')
+    def test_values_expire(self, time_mock):
+        backend = cache.LocalBackend(10)
+        time_mock.time.return_value = 100
+        backend.set('a', 1, ttl=10)
+        backend.set('b', 2)
+        time_mock.time.return_value = 109
+        self.assertEqual(1, backend.get('a'))
+        time_mock.time.return_value = 110
+        self.assertIsNone(backend.get('a'))
+        self.assertEqual(2, backend.get('b'))
+
+
+class TestCache(base.MuranoWithDBTestCase):
+    def setUp(self):
+        super(TestCache, self).setUp()
+        self.override_config('enabled', True, 'api_cache')
+        cache.reset()
+        self.addCleanup(cache.reset)
+        self.create = mock.Mock(side_effect=lambda: {'value': 'test'})
+
+    def _get_cached(self, scope=cache.CATALOG, key='key'):
+        return cache.get_cached(scope, key, self.create)
+
+    def test_value_is_cached(self):
+        self.assertEqual({'value': 'test'}, self._get_cached())
+        self.assertEqual({'value': 'test'}, self._get_cached())
+        self.assertEqual(1, self.create.call_count)
+        self._get_cached(key='other')
+        self._get_cached(scope=cache.ENVIRONMENTS)
+        self.assertEqual(3, self.create.call_count)
+
+    def test_cache_disabled(self):
+        self.override_config('enabled', False, 'api_cache')
+        self._get_cached()
+        self._get_cached()
+        self.assertEqual(2, self.create.call_count)
+
+    def test_invalidate(self):
+        self._get_cached()
+        self._get_cached(scope=cache.ENVIRONMENTS)
+        cache.invalidate(cache.CATALOG)
+        self._get_cached()
+        self._get_cached(scope=cache.ENVIRONMENTS)
+        self.assertEqual(3, self.create.call_count)
+
+    def test_backend_failure(self):
+        with mock.patch.object(cache.LocalBackend, 'get',
+                               side_effect=RuntimeError):
+            self.assertEqual({'value': 'test'}, self._get_cached())
+        with mock.patch.object(cache.LocalBackend, 'set',
+                               side_effect=RuntimeError):
+            self.assertEqual({'value': 'test'},
+                             self._get_cached(key='other'))
+
+    def test_database_changes_invalidate_scopes(self):
+        self._get_cached()
+        self._get_cached(scope=cache.ENVIRONMENTS)
+        package = db_catalog_api.package_upload(
+            {'fully_qualified_name': 'com.example.App', 'type': 'Application',
+             'name': 'App', 'description': '', 'author': '', 'tags': [],
+             'class_definitions': [], 'archive': b'', 'logo': b'',
+             'ui_definition': ''}, 'tenant')
+        self._get_cached()
+        self._get_cached(scope=cache.ENVIRONMENTS)
+        self.assertEqual(3, self.create.call_count)
+
+        unit = db_session.get_session()
+        unit.query(models.Environment).filter_by(id='missing').delete()
+        self._get_cached()
+        self._get_cached(scope=cache.ENVIRONMENTS)
+        self.assertEqual(4, self.create.call_count)
+
+        db_catalog_api.package_delete(package.id, mock.Mock(
+            tenant='tenant', is_admin=True))
+        self._get_cached()
+        self.assertEqual(5, self.create.call_count)
+
+    def test_changes_invalidate_scopes_when_committed(self):
+        self._get_cached()
+        unit = db_session.get_session()
+        with unit.begin():
+            unit.add(models.Category(name='test'))
+            unit.flush()
+            self._get_cached()
+            self.assertEqual(1, self.create.call_count)
+        self._get_cached()
+        self.assertEqual(2, self.create.call_count)
@@ -0,0 +1,55 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from murano.common import engine
+from murano.dsl import scheduler
+from murano.tests.unit import base
+
+
+class TestEngineService(base.MuranoTestCase):
+    def setUp(self):
+        super(TestEngineService, self).setUp()
+        for name in ('get_transport', 'get_rpc_server'):
+            patcher = mock.patch('oslo_messaging.' + name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # the service reconfigures the global scheduler
+        self.addCleanup(setattr, scheduler, '_scheduler',
+                        scheduler.get_scheduler())
+        self.service = engine.EngineService()
+
+    def test_scheduler_stats_are_logged_periodically(self):
+        self.override_config('scheduler_stats_interval', 30, 'engine')
+        with mock.patch.object(self.service.tg, 'add_timer') as add_timer:
+            self.service.start()
+        add_timer.assert_called_once_with(
+            30, self.service.log_scheduler_stats, 30)
+
+    def test_scheduler_stats_logging_disabled(self):
+        self.override_config('scheduler_stats_interval', 0, 'engine')
+        with mock.patch.object(self.service.tg, 'add_timer') as add_timer:
+            self.service.start()
+        self.assertFalse(add_timer.called)
+
+    @mock.patch.object(engine, 'LOG')
+    def test_log_scheduler_stats(self, log):
+        scheduler.configure(10)
+        with mock.patch.object(scheduler, 'get_thread_pool',
+                               return_value=scheduler.NativeThreadPool(5)):
+            engine.EngineService.log_scheduler_stats()
+        messages = [call[0][0] for call in log.debug.call_args_list]
+        self.assertIn('Green threads: 0 active of 10 ', messages[0])
+        self.assertIn('Native threads: 0 active of 5,', messages[1])
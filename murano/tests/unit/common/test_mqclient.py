@@ -0,0 +1,136 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import eventlet
+import mock
+
+from murano.common.messaging import message
+from murano.common.messaging import mqclient
+from murano.common.messaging import subscription as mq_subscription
+from murano.tests.unit import base
+
+
+def create_client():
+    return mqclient.MqClient(
+        login='guest', password='guest', host='localhost', port=5672,
+        virtual_host='/', transport='memory')
+
+
+def create_message(body, msg_id):
+    msg = message.Message()
+    msg.body = body
+    msg.id = msg_id
+    return msg
+
+
+class TestConnectionPool(base.MuranoTestCase):
+    def setUp(self):
+        super(TestConnectionPool, self).setUp()
+        self.factory = mock.Mock(side_effect=create_client)
+        self.pool = mqclient.ConnectionPool(self.factory, 2)
+        self.addCleanup(self.pool.close)
+
+    def test_connection_is_reused(self):
+        with self.pool.acquire() as client:
+            client.declare('queue')
+            client.send(create_message({'key': 1}, 'id1'), 'queue')
+        with self.pool.acquire() as client2:
+            client2.send(create_message({'key': 2}, 'id2'), 'queue')
+            self.assertIs(client, client2)
+        self.assertEqual(1, self.factory.call_count)
+
+        with self.pool.acquire() as client:
+            with client.open('queue') as subscription:
+                messages = []
+                for _ in range(2):
+                    msg = subscription.get_message(timeout=1)
+                    msg.ack()
+                    messages.append(msg)
+        self.assertEqual(
+            [('id1', {'key': 1}), ('id2', {'key': 2})],
+            sorted((msg.id, msg.body) for msg in messages))
+
+    def test_pool_is_bounded(self):
+        clients = set()
+
+        def use_client():
+            with self.pool.acquire() as client:
+                clients.add(client)
+                eventlet.sleep(0.01)
+
+        threads = [eventlet.spawn(use_client) for _ in range(5)]
+        for thread in threads:
+            thread.wait()
+        self.assertEqual(2, len(clients))
+        self.assertEqual(2, self.factory.call_count)
+        self.assertEqual(2, self.pool.idle_count)
+
+    def test_broken_connection_is_replaced(self):
+        with self.pool.acquire() as client:
+            pass
+        client.close()
+        with self.pool.acquire() as client2:
+            self.assertIsNot(client, client2)
+            self.assertTrue(client2.connected)
+
+    def test_connection_is_dropped_on_error(self):
+        def fail(error):
+            with self.pool.acquire() as client:
+                raise error or client.errors[0]()
+
+        self.assertRaises(ValueError, fail, ValueError())
+        self.assertEqual(1, self.pool.idle_count)
+        self.assertRaises(Exception, fail, None)
+        self.assertEqual(0, self.pool.idle_count)
+
+    def test_get_pool(self):
+        settings = {'login': 'guest', 'password': 'guest',
+                    'host': 'localhost', 'port': 5672, 'virtual_host': '/',
+                    'transport': 'memory'}
+        pool = mqclient.get_pool(3, **settings)
+        self.assertIs(pool, mqclient.get_pool(3, **settings))
+        settings['host'] = 'otherhost'
+        self.assertIsNot(pool, mqclient.get_pool(3, **settings))
+        self.assertEqual(3, pool.max_size)
+
+
+class TestSubscription(base.MuranoTestCase):
+    def test_messages_are_received_in_delivery_order(self):
+        client = create_client()
+        client.connect()
+        self.addCleanup(client.close)
+        client.declare('queue')
+        for i in range(5):
+            client.send(create_message({'key': i}, 'id{0}'.format(i)),
+                        'queue')
+        with client.open('queue', prefetch_count=5) as subscription:
+            messages = [subscription.get_message(timeout=1)
+                        for _ in range(5)]
+            subscription.ack(messages)
+        self.assertEqual(['id{0}'.format(i) for i in range(5)],
+                         [msg.id for msg in messages])
+
+    def test_ack_of_latest_delivery(self):
+        connection = mock.Mock()
+        connection.transport.driver_type = 'amqp'
+        with mock.patch('murano.common.messaging.subscription.kombu'):
+            subscription = mq_subscription.Subscription(connection, None)
+        handles = [mock.Mock(delivery_tag=tag, body='{}')
+                   for tag in (2, 3, 1)]
+        subscription.ack([message.Message(message_handle=handle)
+                          for handle in handles])
+        handles[1].channel.basic_ack.assert_called_once_with(
+            3, multiple=True)
+        self.assertFalse(handles[0].channel.basic_ack.called)
+        self.assertFalse(handles[2].channel.basic_ack.called)
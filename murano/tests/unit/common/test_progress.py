@@ -0,0 +1,50 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import eventlet
+
+from murano.common import progress
+from murano.tests.unit import base
+
+
+class TestProgressHub(base.MuranoTestCase):
+    def setUp(self):
+        super(TestProgressHub, self).setUp()
+        self.hub = progress.ProgressHub()
+
+    def test_subscriber_is_woken_up(self):
+        with self.hub.subscribe('env') as subscription:
+            eventlet.spawn_after(0.01, self.hub.publish, 'env')
+            self.assertTrue(subscription.wait(5))
+            self.assertFalse(subscription.wait(0.01))
+
+    def test_notification_before_wait_is_not_lost(self):
+        with self.hub.subscribe('env') as subscription:
+            self.hub.publish('env')
+            self.hub.publish('env')
+            self.assertTrue(subscription.wait(0))
+            self.assertFalse(subscription.wait(0))
+
+    def test_other_environments_are_not_notified(self):
+        with self.hub.subscribe('env1') as subscription:
+            self.hub.publish('env2')
+            self.assertFalse(subscription.wait(0.01))
+
+    def test_unsubscribe(self):
+        with self.hub.subscribe('env'):
+            with self.hub.subscribe('env'):
+                self.assertEqual(2, len(self.hub._subscriptions['env']))
+            self.assertEqual(1, len(self.hub._subscriptions['env']))
+        self.assertEqual({}, self.hub._subscriptions)
+        self.hub.publish('env')
@@ -0,0 +1,88 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+
+import mock
+
+from murano.common import server
+from murano.db import models
+from murano.db import session as db_session
+from murano.tests.unit import base
+
+
+class TestReportNotification(base.MuranoWithDBTestCase):
+    def setUp(self):
+        super(TestReportNotification, self).setUp()
+        unit = db_session.get_session()
+        environment = models.Environment(
+            name='env', tenant_id='tenant', version=1, description={})
+        unit.add(environment)
+        unit.flush()
+        self.environment_id = environment.id
+        started = datetime.datetime(2016, 1, 1)
+        for i in range(2):
+            task = models.Task(environment_id=environment.id, description={},
+                               started=started + datetime.timedelta(hours=i))
+            unit.add(task)
+            unit.flush()
+        self.task_id = task.id
+
+    def _report(self, text, timestamp, level='info'):
+        return {
+            'id': 'entity', 'text': text, 'details': None, 'level': level,
+            'environment_id': self.environment_id, 'timestamp': timestamp
+        }
+
+    def _get_statuses(self):
+        unit = db_session.get_session()
+        return unit.query(models.Status).order_by(models.Status.created).all()
+
+    def test_report_notification(self):
+        server.report_notification(
+            self._report('message', '2016-01-01T02:00:00.000001Z'))
+        statuses = self._get_statuses()
+        self.assertEqual(1, len(statuses))
+        self.assertEqual('message', statuses[0].text)
+        self.assertEqual('entity', statuses[0].entity_id)
+        self.assertEqual(self.task_id, statuses[0].task_id)
+
+    def test_report_notification_batch(self):
+        server.report_notification_batch({
+            'environment_id': self.environment_id,
+            'reports': [
+                self._report('second', '2016-01-01T02:00:00.000002Z'),
+                self._report('first', '2016-01-01T02:00:00.000001Z',
+                             'warning'),
+                self._report('third', '2016-01-01T02:00:01Z')]
+        })
+        statuses = self._get_statuses()
+        self.assertEqual(['first', 'second', 'third'],
+                         [status.text for status in statuses])
+        self.assertEqual(['warning', 'info', 'info'],
+                         [status.level for status in statuses])
+        self.assertEqual(set([self.task_id]),
+                         set(status.task_id for status in statuses))
+        self.assertEqual(datetime.datetime(2016, 1, 1, 2, 0, 0, 1),
+                         statuses[0].created)
+        self.assertEqual(3, len(set(status.id for status in statuses)))
+
+
+class TestTrackInstances(base.MuranoTestCase):
+    @mock.patch('murano.db.services.instances.InstanceStatsServices.'
+                'track_instances')
+    def test_track_instances(self, track_instances):
+        changes = [{'action': 'untrack', 'instance': 'vm'}]
+        server.track_instances({'environment': 'env', 'changes': changes})
+        track_instances.assert_called_once_with('env', changes)
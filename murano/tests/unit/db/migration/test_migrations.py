@@ -29,6 +29,7 @@ import uuid
 from oslo_db import exception as db_exc
 from oslo_db.sqlalchemy import test_base
 from oslo_db.sqlalchemy import utils as db_utils
+from oslo_serialization import jsonutils
 import sqlalchemy
 
 from murano.db.migration import migration
@@ -169,6 +170,86 @@ class MuranoMigrationsCheckers(object):
                                'package',
                                'ix_package_fqn_and_owner')
 
+    def _check_017(self, engine, data):
+        self.assertEqual('017', migration.version(engine))
+        self.assertIndexExists(engine, 'status', 'ix_status_task_id_created')
+        self.assertIndexExists(engine, 'status', 'ix_status_task_id_level')
+
+    def _pre_upgrade_018(self, engine):
+        now = datetime.datetime.now()
+        environment_table = db_utils.get_table(engine, 'environment')
+        environment_table.insert().execute({
+            'id': 'env', 'name': 'env', 'tenant_id': 'tenant',
+            'version': 0, 'description': '{}', 'description_text': '',
+            'created': now, 'updated': now})
+        session_table = db_utils.get_table(engine, 'session')
+        description = {'Objects': {'?': {'id': 'env'}, 'services': [
+            {'?': {'id': 'app1'}}, {'?': {'id': 'app2'}}]}}
+        session_table.insert().execute({
+            'id': 'session', 'environment_id': 'env', 'user_id': 'user',
+            'state': 'opened', 'version': 0,
+            'description': jsonutils.dumps(description),
+            'created': now, 'updated': now})
+
+    def _check_018(self, engine, data):
+        self.assertEqual('018', migration.version(engine))
+        self.assertColumnsExists(engine, 'session_application',
+                                 ['session_id', 'position', 'app_id', 'data'])
+        self.assertIndexExists(engine, 'session_application',
+                               'ix_session_application_session_id_app_id')
+        application_table = db_utils.get_table(engine, 'session_application')
+        rows = application_table.select().order_by(
+            application_table.c.position).execute().fetchall()
+        self.assertEqual(['app1', 'app2'], [row.app_id for row in rows])
+        session_table = db_utils.get_table(engine, 'session')
+        description = jsonutils.loads(
+            session_table.select().execute().fetchone().description)
+        self.assertEqual({'Objects': {'?': {'id': 'env'}}}, description)
+
+    def _pre_upgrade_019(self, engine):
+        now = datetime.datetime.now()
+        package_table = db_utils.get_table(engine, 'package')
+        package_table.insert().execute({
+            'id': 'search', 'archive': b'archive blob here',
+            'fully_qualified_name': 'io.murano.apps.Search',
+            'type': 'Application', 'author': 'OpenStack',
+            'name': 'Search', 'enabled': True, 'description': 'Text',
+            'is_public': False, 'owner_id': '123',
+            'created': now, 'updated': now})
+        tag_table = db_utils.get_table(engine, 'tag')
+        tag_table.insert().execute({'id': 'tag', 'name': 'Indexed',
+                                    'created': now, 'updated': now})
+        package_to_tag_table = db_utils.get_table(engine, 'package_to_tag')
+        package_to_tag_table.insert().execute({'package_id': 'search',
+                                               'tag_id': 'tag'})
+
+    def _check_019(self, engine, data):
+        self.assertEqual('019', migration.version(engine))
+        self.assertColumnsExists(engine, 'package_search_term',
+                                 ['package_id', 'field', 'term', 'weight'])
+        self.assertIndexExists(engine, 'package_search_term',
+                               'ix_package_search_term_term')
+        term_table = db_utils.get_table(engine, 'package_search_term')
+        rows = term_table.select().where(
+            term_table.c.package_id == 'search').execute().fetchall()
+        terms = set((row.field, row.term) for row in rows)
+        self.assertIn(('name', 'search'), terms)
+        self.assertIn(('fully_qualified_name', 'io.murano.apps.search'),
+                      terms)
+        self.assertIn(('fully_qualified_name', 'search'), terms)
+        self.assertIn(('tags', 'indexed'), terms)
+
+    def _check_020(self, engine, data):
+        self.assertEqual('020', migration.version(engine))
+        self.assertColumnsExists(engine, 'package_archive_chunk',
+                                 ['package_id', 'position', 'data'])
+        self.assertColumnNotExists(engine, 'package', 'archive')
+        chunk_table = db_utils.get_table(engine, 'package_archive_chunk')
+        rows = chunk_table.select().where(
+            chunk_table.c.package_id == 'search').execute().fetchall()
+        self.assertEqual([(0, b'archive blob here')],
+                         [(row.position, row.data) for row in rows])
+
 
 class TestMigrationsMySQL(MuranoMigrationsCheckers,
                           base.BaseWalkMigrationTestCase,
@@ -65,3 +65,49 @@ class TestEnvironmentServices(base.MuranoWithDBTestCase):
         )
 
         self.assertEqual(expected_status, actual_status)
+
+    def test_get_statuses(self):
+        session = db_session.get_session()
+        now = timeutils.utcnow()
+        # session states from the oldest to the most recent one
+        cases = {
+            'ready': [],
+            'deployed': [states.SessionState.DEPLOY_FAILURE,
+                         states.SessionState.DEPLOYED],
+            'pending': [states.SessionState.DEPLOYED,
+                        states.SessionState.OPENED],
+            'failed': [states.SessionState.DEPLOYED,
+                       states.SessionState.DEPLOY_FAILURE,
+                       states.SessionState.OPENED],
+            'deploying': [states.SessionState.OPENED,
+                          states.SessionState.DEPLOYING,
+                          states.SessionState.OPENED],
+            'deleting': [states.SessionState.DELETING]
+        }
+        environment_ids = {}
+        for name, session_states in cases.items():
+            environment = models.Environment(
+                name=name, tenant_id='test_tenant_id', version=1)
+            session.add(environment)
+            for i, state in enumerate(session_states):
+                session.add(models.Session(
+                    environment=environment, user_id='test_user_id',
+                    version=1, state=state, description={},
+                    updated=now + dt.timedelta(minutes=i)))
+            session.flush()
+            environment_ids[environment.id] = name
+
+        statuses = environments.EnvironmentServices.get_statuses(
+            list(environment_ids))
+        self.assertEqual({
+            'ready': states.EnvironmentStatus.READY,
+            'deployed': states.EnvironmentStatus.READY,
+            'pending': states.EnvironmentStatus.PENDING,
+            'failed': states.EnvironmentStatus.DEPLOY_FAILURE,
+            'deploying': states.EnvironmentStatus.DEPLOYING,
+            'deleting': states.EnvironmentStatus.DELETING
+        }, dict((environment_ids[env_id], status)
+                for env_id, status in statuses.items()))
+        for env_id, status in statuses.items():
+            self.assertEqual(
+                status, environments.EnvironmentServices.get_status(env_id))
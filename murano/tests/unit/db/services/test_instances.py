@@ -0,0 +1,103 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from murano.db import models
+from murano.db.services import instances
+from murano.db import session as db_session
+from murano.tests.unit import base
+
+
+class TestInstanceStatsServices(base.MuranoWithDBTestCase):
+    def setUp(self):
+        super(TestInstanceStatsServices, self).setUp()
+        unit = db_session.get_session()
+        environment = models.Environment(
+            name='env', tenant_id='tenant', version=1, description={})
+        unit.add(environment)
+        unit.flush()
+        self.environment_id = environment.id
+
+    def _get_instances(self):
+        unit = db_session.get_session()
+        return dict((instance.instance_id, instance) for instance in
+                    unit.query(models.Instance).filter_by(
+                        environment_id=self.environment_id))
+
+    @staticmethod
+    def _track(instance_id, unit_count=1):
+        return {'action': 'track', 'instance': instance_id,
+                'instance_type': instances.OS_INSTANCE,
+                'type_name': 'io.murano.Instance', 'unit_count': unit_count}
+
+    @staticmethod
+    def _untrack(instance_id):
+        return {'action': 'untrack', 'instance': instance_id,
+                'instance_type': instances.OS_INSTANCE}
+
+    @mock.patch('oslo_utils.timeutils.utcnow_ts')
+    def test_track_instances(self, utcnow_ts):
+        utcnow_ts.return_value = 100
+        instances.InstanceStatsServices.track_instance(
+            'existing', self.environment_id, instances.OS_INSTANCE,
+            'io.murano.Instance', unit_count=1)
+
+        utcnow_ts.return_value = 200
+        instances.InstanceStatsServices.track_instances(
+            self.environment_id,
+            [self._track('vm{0}'.format(i)) for i in range(100)] + [
+                self._track('existing', 3),
+                self._untrack('vm0'),
+                self._track('vm1', 5),
+                self._untrack('unknown')])
+
+        result = self._get_instances()
+        self.assertEqual(101, len(result))
+        self.assertEqual((100, None, 3), (
+            result['existing'].created, result['existing'].destroyed,
+            result['existing'].unit_count))
+        self.assertEqual((200, 200), (
+            result['vm0'].created, result['vm0'].destroyed))
+        self.assertEqual(5, result['vm1'].unit_count)
+        self.assertEqual('tenant', result['vm2'].tenant_id)
+        self.assertIsNone(result['vm2'].destroyed)
+
+        utcnow_ts.return_value = 300
+        instances.InstanceStatsServices.track_instances(
+            self.environment_id, [self._untrack('vm0'),
+                                  self._untrack('existing')])
+        result = self._get_instances()
+        self.assertEqual(200, result['vm0'].destroyed)
+        self.assertEqual(300, result['existing'].destroyed)
+
+    @mock.patch('oslo_utils.timeutils.utcnow_ts')
+    def test_track_instances_with_timestamps(self, utcnow_ts):
+        utcnow_ts.return_value = 500
+        track = self._track('vm1')
+        track['timestamp'] = 100
+        untrack = self._untrack('vm1')
+        untrack['timestamp'] = 150
+        instances.InstanceStatsServices.track_instances(
+            self.environment_id, [track, untrack, self._track('vm2')])
+        result = self._get_instances()
+        self.assertEqual((100, 150), (
+            result['vm1'].created, result['vm1'].destroyed))
+        self.assertEqual(500, result['vm2'].created)
+
+    def test_track_instances_of_missing_environment(self):
+        instances.InstanceStatsServices.track_instances(
+            'missing', [self._track('vm')])
+        unit = db_session.get_session()
+        self.assertEqual(0, unit.query(models.Instance).count())
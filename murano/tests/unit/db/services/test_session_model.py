@@ -0,0 +1,153 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from murano.db import models
+from murano.db.services import core_services
+from murano.db.services import environments as envs
+from murano.db.services import session_model
+from murano.db.services import sessions
+from murano.db import session as db_session
+from murano.tests.unit import base
+
+
+def create_app(app_id, **kwargs):
+    app = {'?': {'id': app_id, 'type': 'io.murano.apps.Test'},
+           'instance': {'?': {'id': app_id + '-vm'}, 'name': 'vm'}}
+    app.update(kwargs)
+    return app
+
+
+class TestSessionModelServices(base.MuranoWithDBTestCase):
+    def setUp(self):
+        super(TestSessionModelServices, self).setUp()
+        self.unit = db_session.get_session()
+        environment = models.Environment(
+            name='test', tenant_id='tenant', version=0,
+            description={'Objects': {
+                '?': {'id': 'env', 'type': 'io.murano.Environment'},
+                'name': 'test',
+                'services': [create_app('app1'), create_app('app2')]}})
+        with self.unit.begin():
+            self.unit.add(environment)
+        self.environment_id = environment.id
+        self.session = sessions.SessionServices.create(
+            self.environment_id, 'user')
+        self.core_services = core_services.CoreServices
+
+    def _get_session(self):
+        return db_session.get_session().query(models.Session).get(
+            self.session.id)
+
+    def _get_applications(self):
+        return [app.data for app in session_model.SessionModelServices.
+                get_applications(self.session.id)]
+
+    def test_applications_are_stored_separately(self):
+        self.assertEqual({'?': {'id': 'env', 'type': 'io.murano.Environment'},
+                          'name': 'test'},
+                         self.session.description['Objects'])
+        self.assertEqual([create_app('app1'), create_app('app2')],
+                         self._get_applications())
+        description = session_model.SessionModelServices.get_description(
+            self.session)
+        self.assertEqual([create_app('app1'), create_app('app2')],
+                         description['Objects']['services'])
+        self.assertEqual(
+            description,
+            envs.EnvironmentServices.get_environment_description(
+                self.environment_id, self.session.id, inner=False))
+
+    def test_get_data(self):
+        get_data = self.core_services.get_data
+        with mock.patch.object(
+                session_model.SessionModelServices, 'get_description') as get:
+            self.assertEqual('vm', get_data(
+                self.environment_id, '/services/app2/instance/name',
+                self.session.id))
+            self.assertEqual(create_app('app1'), get_data(
+                self.environment_id, '/services/0', self.session.id))
+            services = get_data(self.environment_id, '/services',
+                                self.session.id)
+            self.assertRaises(KeyError, get_data, self.environment_id,
+                              '/services/missing', self.session.id)
+            self.assertFalse(get.called)
+        self.assertEqual(['app1', 'app2'],
+                         [srv['?']['id'] for srv in services])
+        self.assertEqual('pending', services[0]['?']['status'])
+
+    def test_post_data(self):
+        self.core_services.post_data(self.environment_id, self.session.id,
+                                     create_app('app3'), '/services')
+        self.core_services.post_data(self.environment_id, self.session.id,
+                                     [create_app('app4')], '/services')
+        self.assertEqual(['app1', 'app2', 'app3', 'app4'],
+                         [app['?']['id'] for app in self._get_applications()])
+
+    def test_put_data(self):
+        self.core_services.put_data(self.environment_id, self.session.id,
+                                    'new', '/services/app1/instance/name')
+        self.core_services.put_data(self.environment_id, self.session.id,
+                                    create_app('app5'), '/services/app2')
+        self.assertEqual(
+            [create_app('app1', instance={'?': {'id': 'app1-vm'},
+                                          'name': 'new'}),
+             create_app('app5')],
+            self._get_applications())
+        self.assertIsNotNone(self._get_session().description['Objects'][
+            '?'].get('updated'))
+        self.assertEqual('app5', session_model.SessionModelServices.
+                         find_application(self.session.id, 'app5').app_id)
+
+    def test_delete_data(self):
+        self.core_services.delete_data(self.environment_id, self.session.id,
+                                       '/services/app1/instance')
+        self.core_services.delete_data(self.environment_id, self.session.id,
+                                       '/services/app2')
+        self.assertEqual(
+            [{'?': {'id': 'app1', 'type': 'io.murano.apps.Test'}}],
+            self._get_applications())
+        self.core_services.post_data(self.environment_id, self.session.id,
+                                     create_app('app3'), '/services')
+        self.assertEqual(['app1', 'app3'],
+                         [app['?']['id'] for app in self._get_applications()])
+        self.assertRaises(KeyError, self.core_services.delete_data,
+                          self.environment_id, self.session.id,
+                          '/services/app2')
+
+    def test_session_with_inline_services(self):
+        description = session_model.SessionModelServices.get_description(
+            self.session)
+        session = self.unit.query(models.Session).get(self.session.id)
+        with self.unit.begin():
+            session.description = description
+            self.unit.query(models.SessionApplication).delete()
+        self.assertFalse(session_model.SessionModelServices.is_split(
+            self._get_session()))
+        self.assertEqual(create_app('app2'), self.core_services.get_data(
+            self.environment_id, '/services/app2', self.session.id))
+
+        self.core_services.delete_data(self.environment_id, self.session.id,
+                                       '/services/app2')
+        self.assertTrue(session_model.SessionModelServices.is_split(
+            self._get_session()))
+        self.assertEqual([create_app('app1')], self._get_applications())
+
+    def test_deleted_environment(self):
+        envs.EnvironmentServices.delete(self.environment_id, self.session.id)
+        self.assertEqual([], self._get_applications())
+        self.assertIsNone(
+            envs.EnvironmentServices.get_environment_description(
+                self.environment_id, self.session.id))
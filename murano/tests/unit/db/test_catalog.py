@@ -13,11 +13,15 @@
 
 import uuid
 
+import mock
 from oslo_db import exception as db_exception
 from six.moves import range
 from webob import exc
 
+from murano.common import exceptions
 from murano.db.catalog import api
+from murano.db import models
+from murano.db import session as db_session
 from murano.tests.unit import base
 from murano.tests.unit import utils
 
@@ -238,6 +242,57 @@ class CatalogDBTestCase(base.MuranoWithDBTestCase):
             {'search': 'some text'}, self.context)
         self.assertEqual(2, len(res))
 
+    def test_package_search_search_relevance(self):
+        by_description = api.package_upload(self._stub_package(
+            name='package', description='Apache web server',
+            fully_qualified_name='com.example.Server'), self.tenant_id)
+        by_name = api.package_upload(self._stub_package(
+            name='Apache', fully_qualified_name='com.example.Apache'),
+            self.tenant_id)
+        by_tag = api.package_upload(self._stub_package(
+            tags=['apache'], fully_qualified_name='com.example.Tagged'),
+            self.tenant_id)
+        api.package_upload(self._stub_package(
+            fully_qualified_name='com.example.Other'), self.tenant_id)
+
+        res = api.package_search({'search': 'apa'}, self.context)
+        self.assertEqual([by_name.id, by_tag.id, by_description.id],
+                         [r.id for r in res])
+        res = api.package_search({'search': 'com.example.apache'},
+                                 self.context)
+        self.assertEqual([by_name.id], [r.id for r in res])
+        res = api.package_search({'search': 'web%'}, self.context)
+        self.assertEqual([], res)
+
+        res = api.package_search({'search': 'apache'}, self.context, limit=2)
+        self.assertEqual([by_name.id, by_tag.id], [r.id for r in res])
+        res = api.package_search({'search': 'apache', 'marker': by_tag.id},
+                                 self.context, limit=2)
+        self.assertEqual([by_description.id], [r.id for r in res])
+
+        res = api.package_search({'search': 'apache', 'order_by': ['fqn']},
+                                 self.context)
+        self.assertEqual([by_name.id, by_description.id, by_tag.id],
+                         [r.id for r in res])
+
+    def test_package_search_index_is_updated(self):
+        package = api.package_upload(self._stub_package(
+            fully_qualified_name='com.example.App'), self.tenant_id)
+        api.package_update(package.id, [
+            self.get_change('replace', ['name'], 'Renamed'),
+            self.get_change('add', ['tags'], ['tag3'])], self.context)
+
+        self.assertEqual(1, len(api.package_search({'search': 'renamed'},
+                                                   self.context)))
+        self.assertEqual(1, len(api.package_search({'search': 'tag3'},
+                                                   self.context)))
+        self.assertEqual(0, len(api.package_search({'search': 'package'},
+                                                   self.context)))
+
+        api.package_delete(package.id, self.context)
+        self.assertEqual(0, len(api.package_search({'search': 'tag1'},
+                                                   self.context)))
+
     def test_package_search_tags(self):
         api.package_upload(
             self._stub_package(
@@ -391,7 +446,42 @@ class CatalogDBTestCase(base.MuranoWithDBTestCase):
 
         self.assertIsNotNone(package.id)
         for k in values.keys():
-            self.assertEqual(values[k], package[k])
+            if k != 'archive':
+                self.assertEqual(values[k], package[k])
+        self.assertEqual(values['archive'],
+                         b''.join(api.package_archive_read(package.id)))
+
+    def test_package_archive_is_stored_by_chunks(self):
+        archive = b''.join(str(i).encode() * 10 for i in range(10))
+        with mock.patch.object(api, 'ARCHIVE_CHUNK_SIZE', 30):
+            package = api.package_upload(
+                self._stub_package(archive=archive), self.tenant_id)
+
+        self.assertEqual(100, api.package_archive_size(package.id))
+        self.assertEqual([archive[0:30], archive[30:60], archive[60:90],
+                          archive[90:]],
+                         list(api.package_archive_read(package.id)))
+        self.assertEqual([archive[45:60], archive[60:75]],
+                         list(api.package_archive_read(package.id, 45, 75)))
+        self.assertEqual([archive[95:]],
+                         list(api.package_archive_read(package.id, 95)))
+
+    def test_truncated_package_archive_is_not_read_as_complete(self):
+        archive = b'a' * 100
+        with mock.patch.object(api, 'ARCHIVE_CHUNK_SIZE', 30):
+            package = api.package_upload(
+                self._stub_package(archive=archive), self.tenant_id)
+        session = db_session.get_session()
+        session.query(models.PackageArchiveChunk).filter_by(
+            package_id=package.id, position=30).delete()
+
+        self.assertEqual([archive[:30]],
+                         list(api.package_archive_read(package.id, 0, 30)))
+        reader = api.package_archive_read(package.id, 0, 100)
+        self.assertEqual(archive[:30], next(reader))
+        self.assertRaises(exceptions.PackageArchiveTruncated, next, reader)
+        self.assertRaises(exceptions.PackageArchiveTruncated, list,
+                          api.package_archive_read(package.id, 0, 200))
 
     def test_package_fqn_is_unique(self):
         self._create_categories()
@@ -409,6 +499,7 @@ class CatalogDBTestCase(base.MuranoWithDBTestCase):
 
         self.assertRaises(exc.HTTPNotFound,
                           api.package_get, package.id, self.context)
+        self.assertEqual(0, api.package_archive_size(package.id))
 
     def test_package_upload_to_different_tenants_with_same_fqn(self):
         values = self._stub_package()
@@ -122,6 +122,13 @@ class TestPackageLoader(package_loader.MuranoPackageLoader):
         self._configs.setdefault(class_name, {})[
             property_name] = value
 
+    @property
+    def types_generation(self):
+        generation = super(TestPackageLoader, self).types_generation
+        if self._parent:
+            generation += self._parent.types_generation
+        return generation
+
     def register_package(self, package):
         super(TestPackageLoader, self).register_package(package)
         self.packages.append(package)
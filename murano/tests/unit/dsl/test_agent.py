@@ -40,16 +40,21 @@ class TestAgentListener(test_case.DslTestCase):
         self.context[constants.CTX_THIS] = mock.MagicMock(
             dsl.MuranoObjectInterface)
 
-    def test_listener_enabled(self):
+    @mock.patch('murano.engine.system.agent_listener.get_results_consumer')
+    def test_listener_enabled(self, get_results_consumer):
         self.override_config('disable_murano_agent', False, 'engine')
         al = self.runner.testAgentListener().extension
         self.assertTrue(al.enabled)
+        consumer = get_results_consumer.return_value
         with self.runner.session(), helpers.contextual(self.context):
             try:
                 al.subscribe('msgid', 'event')
                 self.assertEqual({'msgid': 'event'}, al._subscriptions)
+                consumer.register.assert_called_once_with(
+                    al.queue_name(), al._receive)
             finally:
                 al.stop()
+        consumer.unregister.assert_called_once_with(al.queue_name())
 
     def test_listener_disabled(self):
         self.override_config('disable_murano_agent', True, 'engine')
@@ -65,8 +65,8 @@ class TestAttributeStore(test_case.DslTestCase):
     def test_set_object(self, mock_get_attr_key):
         key1, key2 = mock.sentinel.key1, mock.sentinel.key2
 
-        val = dsl_types.MuranoObject()
-        val.object_id = mock.sentinel.oid
+        val = mock.Mock(spec=dsl_types.MuranoObject,
+                        object_id=mock.sentinel.oid)
         self.attribute_store.set(
             self.tagged_obj, self.owner_type, self.name, val)
         self.assertEqual(self.attribute_store._attributes[key1][key2],
@@ -126,8 +126,7 @@ class TestAttributeStore(test_case.DslTestCase):
         self.assertEqual({'foo': 42}, self.attribute_store._attributes)
 
     def test_forget_object(self):
-        obj = dsl_types.MuranoObject()
-        obj.object_id = 'foo'
+        obj = mock.Mock(spec=dsl_types.MuranoObject, object_id='foo')
         self.attribute_store._attributes = {'foo': 42, 'bar': 43}
         self.attribute_store.forget_object(obj)
         self.assertEqual({'bar': 43}, self.attribute_store._attributes)
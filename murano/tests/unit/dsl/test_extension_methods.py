@@ -13,11 +13,14 @@
 #    under the License.
 
 
+import threading
+
 from yaql.language import exceptions
 from yaql.language import specs
 from yaql.language import yaqltypes
 
 from murano.dsl import dsl
+from murano.dsl import helpers
 from murano.tests.unit.dsl.foundation import object_model as om
 from murano.tests.unit.dsl.foundation import test_case
 
@@ -41,6 +44,15 @@ class TestExtensionMethods(test_case.DslTestCase):
             def python_extension2(cls, arg):
                 return cls(2 * arg).value
 
+            @staticmethod
+            @specs.meta('Usage', 'Extension')
+            @specs.parameter('arg', yaqltypes.Integer())
+            def python_threaded_extension(arg):
+                def square():
+                    return (arg * arg, threading.current_thread().ident,
+                            helpers.get_object_store() is None)
+                return dsl.execute_in_thread(square)
+
         super(TestExtensionMethods, self).setUp()
         self.package_loader.load_class_package(
             'extcls.Extender', None).register_class(PythonClass)
@@ -75,6 +87,14 @@ class TestExtensionMethods(test_case.DslTestCase):
     def test_call_python_extension(self):
         self.assertEqual(16, self._runner.testCallPythonExtension())
 
+    def test_call_threaded_python_extension(self):
+        value, thread_id, no_object_store = \
+            self._runner.testCallThreadedPythonExtension()
+        self.assertEqual(36, value)
+        self.assertNotEqual(threading.current_thread().ident, thread_id)
+        # DSL state is not available outside of the green thread
+        self.assertTrue(no_object_store)
+
     def test_call_python_extension_explicitly(self):
         self.assertEqual(25, self._runner.testCallPythonExtensionExplicitly())
 
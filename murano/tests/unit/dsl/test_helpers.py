@@ -11,9 +11,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import mock
 import semantic_version
 
+from murano.dsl import executor
 from murano.dsl import helpers
+from murano.dsl import package_loader
 from murano.tests.unit import base
 
 
@@ -97,3 +100,95 @@ class TestParseVersionSpec(base.MuranoTestCase):
         version_spec = semantic_version.Spec('<=1', '<=1.11')
         expected = semantic_version.Spec('<1.12.0-0', '<2.0.0-0')
         self.check(expected, version_spec)
+
+
+class TestLruMemoize(base.MuranoTestCase):
+    def test_results_are_cached(self):
+        calls = []
+
+        @helpers.lru_memoize(2)
+        def func(x):
+            calls.append(x)
+            return x * 2
+
+        self.assertEqual(2, func(1))
+        self.assertEqual(2, func(1))
+        self.assertEqual([1], calls)
+
+    def test_least_recently_used_evicted(self):
+        calls = []
+
+        @helpers.lru_memoize(2)
+        def func(x):
+            calls.append(x)
+            return x
+
+        func(1)
+        func(2)
+        func(1)
+        func(3)
+        func(1)
+        func(2)
+        self.assertEqual([1, 2, 3, 2], calls)
+
+    def test_unhashable_arguments_not_cached(self):
+        calls = []
+
+        @helpers.lru_memoize(2)
+        def func(x):
+            calls.append(x)
+            return len(x)
+
+        self.assertEqual(2, func([1, 2]))
+        self.assertEqual(2, func([1, 2]))
+        self.assertEqual(2, len(calls))
+
+    def test_version_spec_parsing_is_cached(self):
+        spec1 = helpers.parse_version_spec('>=1.2')
+        spec2 = helpers.parse_version_spec('>=1.2')
+        self.assertIs(spec1, spec2)
+        self.assertIs(helpers.parse_version('1.2.3'),
+                      helpers.parse_version('1.2.3'))
+
+    def test_normalize_version_spec_is_cached(self):
+        spec = semantic_version.Spec('==1.2')
+        self.assertIs(helpers.normalize_version_spec(spec),
+                      helpers.normalize_version_spec(
+                          semantic_version.Spec('==1.2')))
+
+
+class TestTypeCache(base.MuranoTestCase):
+    class Loader(package_loader.MuranoPackageLoader):
+        load_package = load_class_package = register_package = mock.Mock()
+        import_fixation_table = export_fixation_table = mock.Mock()
+        compact_fixation_table = mock.Mock()
+
+    def test_type_cache_is_dropped_by_own_loader_only(self):
+        loader1 = self.Loader()
+        loader2 = self.Loader()
+        executor1 = executor.MuranoDslExecutor(loader1, mock.Mock())
+        executor1.type_cache['key'] = 'value'
+        loader2.invalidate_type_caches()
+        self.assertEqual({'key': 'value'}, executor1.type_cache)
+        loader1.invalidate_type_caches()
+        self.assertEqual({}, executor1.type_cache)
+
+    def test_type_resolution_is_cached_per_package(self):
+        def scope_type(package_name):
+            result = mock.Mock(version='1.0.0')
+            result.name = 'io.murano.Test'
+            result.package.name = package_name
+            result.namespace_resolver.resolve_name.side_effect = \
+                lambda name: name
+            return result
+
+        scope1 = scope_type('package1')
+        scope2 = scope_type('package2')
+        with mock.patch.object(helpers, 'get_executor',
+                               return_value=mock.Mock(type_cache={})):
+            self.assertIs(scope1.package.find_class.return_value,
+                          helpers.resolve_type('Dependency', scope1))
+            self.assertIs(scope2.package.find_class.return_value,
+                          helpers.resolve_type('Dependency', scope2))
+            helpers.resolve_type('Dependency', scope1)
+        self.assertEqual(1, scope1.package.find_class.call_count)
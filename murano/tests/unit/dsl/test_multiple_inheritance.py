@@ -67,3 +67,40 @@ class TestMultipleInheritance(test_case.DslTestCase):
             ['CommonParent::virtualMethod', 'ParentClass2::virtualMethod',
              'CommonParent::virtualMethod', 'ParentClass2::virtualMethod'],
             self.traces)
+
+    def test_method_lookup_cache_invalidation(self):
+        def find_class(name):
+            return self.package_loader.load_class_package(
+                name, None).find_class(name)
+
+        cls = find_class('DerivedFrom2Classes')
+        methods = cls.find_method('testRootMethod')
+        self.assertEqual(
+            ['CommonParent'], [m.declaring_type.name for m in methods])
+        self.assertEqual(methods, cls.find_method('testRootMethod'))
+
+        def method(this):
+            pass
+
+        find_class('ParentClass2').add_method('testRootMethod', method)
+        self.assertEqual(
+            ['ParentClass2'],
+            [m.declaring_type.name
+             for m in cls.find_method('testRootMethod')])
+
+    def test_method_lookup_cache_of_unrelated_class_is_kept(self):
+        def find_class(name):
+            return self.package_loader.load_class_package(
+                name, None).find_class(name)
+
+        cls = find_class('ParentClass1')
+        cls.find_method('testRootMethod')
+        self.assertTrue(cls._symbols_cache)
+
+        def method(this):
+            pass
+
+        find_class('ParentClass2').add_method('testRootMethod', method)
+        self.assertTrue(cls._symbols_cache)
+        find_class('CommonParent').add_method('testRootMethod', method)
+        self.assertFalse(cls._symbols_cache)
@@ -0,0 +1,154 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import time
+
+import eventlet
+import eventlet.event
+import mock
+
+from murano.dsl import helpers
+from murano.dsl import scheduler
+from murano.tests.unit import base
+
+
+class TestGreenThreadScheduler(base.MuranoTestCase):
+    def setUp(self):
+        super(TestGreenThreadScheduler, self).setUp()
+        self.scheduler = scheduler.GreenThreadScheduler(2, 0)
+        patcher = mock.patch.object(
+            scheduler, 'get_scheduler', return_value=self.scheduler)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_global_limit(self):
+        peak = []
+
+        def func(x):
+            peak.append(self.scheduler.active_threads)
+            eventlet.sleep(0)
+            return x * 2
+
+        result = list(helpers.parallel_select(range(10), func))
+        self.assertEqual([x * 2 for x in range(10)], result)
+        self.assertEqual(2, max(peak))
+        self.assertEqual(0, self.scheduler.active_threads)
+        self.assertEqual(0, self.scheduler.queue_depth)
+        stats = self.scheduler.get_stats()
+        self.assertEqual(10, stats['total_requests'])
+        self.assertTrue(stats['max_queue_depth'] > 0)
+
+    def test_nested_parallel_does_not_deadlock(self):
+        def inner(x):
+            eventlet.sleep(0)
+            return x
+
+        def outer(x):
+            return sum(helpers.parallel_select(range(3), inner))
+
+        result = list(helpers.parallel_select(range(5), outer))
+        self.assertEqual([3] * 5, result)
+        self.assertEqual(0, self.scheduler.active_threads)
+
+    def test_task_quota(self):
+        self.scheduler = scheduler.GreenThreadScheduler(10, 1)
+        peak = []
+
+        def func(x):
+            peak.append(self.scheduler.active_threads)
+            eventlet.sleep(0)
+
+        with mock.patch.object(scheduler, 'get_scheduler',
+                               return_value=self.scheduler):
+            list(helpers.parallel_select(range(5), func))
+        self.assertEqual(1, max(peak))
+
+    def test_fair_queueing(self):
+        sched = scheduler.GreenThreadScheduler(1, 0)
+        order = []
+        sched.acquire('busy')
+
+        def run(task, index):
+            with sched.slot(task):
+                order.append((task, index))
+                eventlet.sleep(0)
+
+        threads = [eventlet.spawn(run, 'big', i) for i in range(3)]
+        threads.append(eventlet.spawn(run, 'small', 0))
+        eventlet.sleep(0)
+        self.assertEqual(4, sched.queue_depth)
+        sched.release('busy')
+        for thread in threads:
+            thread.wait()
+        self.assertEqual(
+            [('big', 0), ('small', 0), ('big', 1), ('big', 2)], order)
+
+    def test_thread_killed_while_resuming_does_not_release_slot(self):
+        sched = scheduler.GreenThreadScheduler(1, 0)
+        resume = eventlet.event.Event()
+
+        def run():
+            with sched.slot('task'):
+                with sched.suspended():
+                    resume.wait()
+
+        thread = eventlet.spawn(run)
+        eventlet.sleep(0)
+        self.assertEqual(0, sched.active_threads)
+        sched.acquire('other')
+        resume.send()
+        eventlet.sleep(0)
+        self.assertEqual(1, sched.queue_depth)
+        thread.kill()
+        self.assertEqual(0, sched.queue_depth)
+        self.assertEqual(1, sched.active_threads)
+        sched.release('other')
+        self.assertEqual(0, sched.active_threads)
+        self.assertEqual(0, sched.get_stats()['active_tasks'])
+
+
+class TestNativeThreadPool(base.MuranoTestCase):
+    def test_execute_in_os_thread(self):
+        pool = scheduler.NativeThreadPool(2)
+
+        def func(x):
+            return x, threading.current_thread().ident
+
+        value, thread_id = pool.execute(func, 5)
+        self.assertEqual(5, value)
+        self.assertNotEqual(threading.current_thread().ident, thread_id)
+        self.assertEqual(0, pool.active_threads)
+        self.assertEqual(1, pool.get_stats()['total_calls'])
+
+    def test_saturation(self):
+        pool = scheduler.NativeThreadPool(1)
+        threads = [eventlet.spawn(pool.execute, time.sleep, 0.01)
+                   for _ in range(3)]
+        for thread in threads:
+            thread.wait()
+        stats = pool.get_stats()
+        self.assertEqual(3, stats['total_calls'])
+        self.assertEqual(2, stats['saturated_calls'])
+        self.assertEqual(2, stats['max_queue_depth'])
+        self.assertEqual(0, stats['queue_depth'])
+
+    def test_exception_is_reraised(self):
+        pool = scheduler.NativeThreadPool(1)
+
+        def func():
+            raise ValueError('error')
+
+        self.assertRaises(ValueError, pool.execute, func)
+        self.assertEqual(0, pool.active_threads)
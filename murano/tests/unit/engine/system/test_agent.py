@@ -14,11 +14,14 @@
 
 import os
 import tempfile
+import threading
 
+import eventlet.event
 import mock
 from oslo_serialization import base64
 import yaml as yamllib
 
+from murano.dsl import dsl
 from murano.dsl import murano_object
 from murano.dsl import murano_type
 from murano.dsl import object_store
@@ -375,3 +378,73 @@ class TestExecutionPlan(base.MuranoTestCase):
             Loader=self.yaml_loader)
         template = self.agent._build_v1_execution_plan(template,
                                                        self.resources)
+
+
+class TestAgentBroadcast(base.MuranoTestCase):
+    def setUp(self):
+        super(TestAgentBroadcast, self).setUp()
+        self.override_config('disable_murano_agent', False, 'engine')
+        self.addCleanup(agent._plan_cache.clear)
+        self.resources = mock.MagicMock()
+        self.resources.extension._package.name = 'io.murano.test'
+        self.resources.extension._package.version = '1.0.0'
+        self.resources.return_value.string.return_value = 'text'
+        self.template = {
+            'FormatVersion': '2.0.0',
+            'Body': 'return deploy().stdout',
+            'Scripts': {
+                'deploy': {
+                    'Type': 'Application',
+                    'Version': '1.0.0',
+                    'EntryPoint': 'deploy.sh'
+                }
+            }
+        }
+        self.agents = [self._create_agent(str(i)) for i in range(3)]
+
+    @staticmethod
+    def _create_agent(host_id):
+        host = mock.MagicMock()
+        host.id = host_id
+        host.find_owner.return_value.id = 'env'
+        return agent.Agent(host)
+
+    def test_plan_is_built_once(self):
+        threads = []
+
+        def string(*args, **kwargs):
+            threads.append(threading.current_thread().ident)
+            return 'text'
+
+        self.resources.return_value.string.side_effect = string
+        plans = [a._build_plan(self.template, self.resources)
+                 for a in self.agents]
+        # resources are fetched through MuranoPL, so in the green thread
+        self.assertEqual([threading.current_thread().ident], threads)
+        self.assertEqual(3, len(set(plan['ID'] for plan in plans)))
+        self.assertEqual(plans[0]['Files'], plans[2]['Files'])
+        self.assertNotIn('ID', self.template)
+
+    @mock.patch('murano.engine.system.common.get_rmq_client')
+    @mock.patch('murano.engine.system.agent.Agent._subscribe')
+    def test_broadcast(self, subscribe, get_rmq_client):
+        def subscribe_func(region, msg_id):
+            event = eventlet.event.Event()
+            event.send({'FormatVersion': '2.0.0', 'Body': msg_id})
+            return event
+
+        subscribe.side_effect = subscribe_func
+        client = get_rmq_client.return_value.__enter__.return_value
+
+        agents = [mock.Mock(spec=dsl.MuranoObjectInterface, extension=a)
+                  for a in self.agents]
+        results = agent.Agent.broadcast(agents, self.template, self.resources)
+
+        self.assertEqual(3, client.send.call_count)
+        self.assertEqual(
+            [a._queue for a in self.agents],
+            [call[1]['key'] for call in client.send.call_args_list])
+        sent_ids = [call[1]['message'].id
+                    for call in client.send.call_args_list]
+        self.assertEqual(sent_ids, results)
+        self.assertEqual(1, self.resources.return_value.string.call_count)
@@ -0,0 +1,118 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import eventlet
+import mock
+
+from murano.common.messaging import message
+from murano.common.messaging import mqclient
+from murano.engine.system import agent_listener
+from murano.tests.unit import base
+
+
+def create_client():
+    return mqclient.MqClient(
+        login='guest', password='guest', host='localhost', port=5672,
+        virtual_host='/', transport='memory')
+
+
+class TestResultsConsumer(base.MuranoTestCase):
+    def setUp(self):
+        super(TestResultsConsumer, self).setUp()
+        self.override_config('disable_murano_agent', False, 'engine')
+        # in-memory transport polls queues using blocking sleep
+        patcher = mock.patch('kombu.transport.virtual.base.sleep',
+                             eventlet.sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.consumer = agent_listener.ResultsConsumer(
+            create_client, prefetch_count=10, ack_batch_size=3,
+            drain_timeout=0.05)
+        self.addCleanup(self._wait_consumer_stopped)
+        self.client = create_client()
+        self.client.connect()
+        self.addCleanup(self.client.close)
+
+    def _wait_consumer_stopped(self):
+        with eventlet.Timeout(5):
+            while self.consumer._thread is not None:
+                eventlet.sleep(0.01)
+
+    def _create_listener(self, name):
+        listener = agent_listener.AgentListener(name)
+        listener._consumer = self.consumer
+        self.consumer.register(listener.queue_name(), listener._receive)
+        self.addCleanup(listener.stop)
+        return listener
+
+    def _send_result(self, listener, source_id):
+        msg = message.Message()
+        msg.body = {'SourceID': source_id, 'Body': source_id}
+        msg.id = source_id
+        self.client.send(msg, listener.queue_name())
+
+    def test_results_are_dispatched_to_subscribers(self):
+        listeners = [self._create_listener('env{0}'.format(i))
+                     for i in range(2)]
+        events = {}
+        for i, listener in enumerate(listeners):
+            for j in range(5):
+                source_id = 'msg-{0}-{1}'.format(i, j)
+                events[source_id] = eventlet.event.Event()
+                listener.subscribe(source_id, events[source_id])
+                self._send_result(listener, source_id)
+
+        with eventlet.Timeout(5):
+            for source_id, event in events.items():
+                self.assertEqual(source_id, event.wait()['Body'])
+        for listener in listeners:
+            self.assertEqual({}, listener._subscriptions)
+
+    def test_queue_is_declared_on_register(self):
+        client = mock.MagicMock()
+        consumer = agent_listener.ResultsConsumer(
+            mock.Mock(), declare_client_factory=lambda: client)
+        with mock.patch('eventlet.spawn') as spawn:
+            consumer.register('queue', mock.Mock())
+        client.__enter__.return_value.declare.assert_called_once_with(
+            'queue', enable_ha=True, ttl=86400000)
+        spawn.assert_called_once_with(consumer._run)
+
+    def test_results_are_acked_in_batches(self):
+        listener = self._create_listener('env')
+        events = []
+        with mock.patch('murano.common.messaging.subscription.'
+                        'Subscription.ack', autospec=True) as ack:
+            ack.side_effect = lambda subscription, messages: [
+                msg.ack() for msg in messages]
+            for i in range(7):
+                event = eventlet.event.Event()
+                events.append(event)
+                listener.subscribe(str(i), event)
+                self._send_result(listener, str(i))
+            with eventlet.Timeout(5):
+                for event in events:
+                    event.wait()
+                while sum(len(call[0][1]) for call in ack.call_args_list) < 7:
+                    eventlet.sleep(0.01)
+        batches = [len(call[0][1]) for call in ack.call_args_list
+                   if call[0][1]]
+        self.assertTrue(max(batches) > 1)
+        self.assertTrue(max(batches) <= 3)
+
+    def test_consumer_stops_without_listeners(self):
+        listener = self._create_listener('env')
+        self.assertIsNotNone(self.consumer._thread)
+        self.consumer.unregister(listener.queue_name())
+        self._wait_consumer_stopped()
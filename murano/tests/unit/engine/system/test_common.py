@@ -0,0 +1,79 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import eventlet
+import mock
+
+from murano.engine import execution_session
+from murano.engine.system import common
+from murano.tests.unit import base
+
+
+class TestNotificationBatch(base.MuranoTestCase):
+    def setUp(self):
+        super(TestNotificationBatch, self).setUp()
+        self.session = None
+        patcher = mock.patch('murano.dsl.helpers.get_execution_session',
+                             side_effect=lambda: self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.send = mock.Mock()
+
+    def _create_batch(self, batch_size=100, interval=60):
+        batch = common.NotificationBatch(
+            self.send, batch_size, interval, 'error')
+        self.addCleanup(batch.flush)
+        return batch
+
+    def _sent(self):
+        return [call[0][0] for call in self.send.call_args_list]
+
+    def test_items_are_sent_in_batches(self):
+        batch = self._create_batch(batch_size=3)
+        for i in range(7):
+            batch.add(i)
+        self.assertEqual([[0, 1, 2], [3, 4, 5]], self._sent())
+        batch.flush()
+        batch.flush()
+        self.assertEqual([[0, 1, 2], [3, 4, 5], [6]], self._sent())
+
+    def test_items_are_flushed_by_interval(self):
+        batch = self._create_batch(interval=0.01)
+        batch.add(1)
+        batch.add(2)
+        self.assertEqual([], self._sent())
+        eventlet.sleep(0.05)
+        self.assertEqual([[1, 2]], self._sent())
+        batch.add(3)
+        eventlet.sleep(0.05)
+        self.assertEqual([[1, 2], [3]], self._sent())
+
+    def test_items_are_flushed_on_session_finish(self):
+        self.session = execution_session.ExecutionSession()
+        batch = self._create_batch()
+        for i in range(3):
+            batch.add(i)
+        self.assertEqual(1, len(self.session._tear_down_list))
+        self.assertEqual([], self._sent())
+        self.session.finish()
+        self.assertEqual([[0, 1, 2]], self._sent())
+
+    @mock.patch('murano.engine.system.common.LOG')
+    def test_send_failure_in_timer_is_logged(self, log):
+        self.send.side_effect = RuntimeError
+        batch = self._create_batch(interval=0.01)
+        batch.add(1)
+        eventlet.sleep(0.05)
+        log.exception.assert_called_once_with('error')
+        self.send.side_effect = None
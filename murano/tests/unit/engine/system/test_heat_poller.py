@@ -0,0 +1,184 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import copy
+
+import eventlet
+import mock
+
+from murano.engine.system import heat_poller
+from murano.engine.system import heat_stack
+from murano.tests.unit import base
+
+
+class FakeStack(object):
+    def __init__(self, name, status):
+        self.stack_name = name
+        self.id = name + '-id'
+        self.stack_status = status
+        self.stack_status_reason = 'reason'
+        self.creation_time = '2016-01-01T00:00:00'
+        self.updated_time = None
+        self.outputs = [{'output_key': 'key', 'output_value': name}]
+
+
+class FakeStackManager(object):
+    """Stack manager that moves stacks forward on each list() call"""
+
+    def __init__(self):
+        self.stacks = {}
+        self.transitions = {}
+        self.list_calls = []
+        self.errors = []
+
+    def add(self, name, statuses):
+        self.stacks[name] = FakeStack(name, statuses[0])
+        self.transitions[name] = list(statuses[1:])
+
+    def list(self, filters):
+        self.list_calls.append(sorted(filters['name']))
+        if self.errors:
+            raise self.errors.pop(0)
+        result = []
+        for name in filters['name']:
+            stack = self.stacks.get(name)
+            if stack is None:
+                continue
+            result.append(copy.copy(stack))
+            if self.transitions[name]:
+                stack.stack_status = self.transitions[name].pop(0)
+        return iter(result)
+
+    def get(self, stack_id):
+        return self.stacks[stack_id]
+
+
+class FakeHeatClient(object):
+    def __init__(self):
+        self.stacks = FakeStackManager()
+
+
+class TestStackStatusPoller(base.MuranoTestCase):
+    def setUp(self):
+        super(TestStackStatusPoller, self).setUp()
+        self.client = FakeHeatClient()
+        self.poller = heat_poller.StackStatusPoller(0.01, 0.04, 0)
+
+    def test_stable_stack_is_returned_immediately(self):
+        self.client.stacks.add('stack', ['CREATE_COMPLETE'])
+        stack = self.poller.wait(self.client, 'group', 'stack')
+        self.assertEqual('CREATE_COMPLETE', stack.stack_status)
+        self.assertEqual(1, self.poller.total_polls)
+
+    def test_missing_stack(self):
+        self.assertIsNone(self.poller.wait(self.client, 'group', 'stack'))
+
+    def test_waits_while_in_progress(self):
+        self.client.stacks.add('stack', [
+            'CREATE_IN_PROGRESS', 'CREATE_IN_PROGRESS', 'CREATE_COMPLETE'])
+        stack = self.poller.wait(self.client, 'group', 'stack')
+        self.assertEqual('CREATE_COMPLETE', stack.stack_status)
+        self.assertEqual(3, self.poller.total_polls)
+
+    def test_stacks_of_group_share_list_call(self):
+        names = ['stack{0}'.format(i) for i in range(5)]
+        for name in names:
+            self.client.stacks.add(name, [
+                'CREATE_IN_PROGRESS', 'CREATE_IN_PROGRESS',
+                'CREATE_COMPLETE'])
+        threads = [eventlet.spawn(self.poller.wait, self.client,
+                                  'group', name) for name in names]
+        results = [thread.wait() for thread in threads]
+        self.assertEqual(['CREATE_COMPLETE'] * 5,
+                         [stack.stack_status for stack in results])
+        self.assertIn(names, self.client.stacks.list_calls)
+        self.assertTrue(self.poller.total_polls < 5 * 3)
+
+    def test_groups_are_polled_separately(self):
+        self.client.stacks.add('stack1', ['CREATE_COMPLETE'])
+        self.client.stacks.add('stack2', ['CREATE_COMPLETE'])
+        threads = [
+            eventlet.spawn(self.poller.wait, self.client, 'g1', 'stack1'),
+            eventlet.spawn(self.poller.wait, self.client, 'g2', 'stack2')]
+        for thread in threads:
+            thread.wait()
+        self.assertEqual([['stack1'], ['stack2']],
+                         sorted(self.client.stacks.list_calls))
+
+    def test_backoff(self):
+        self.client.stacks.add('stack', ['CREATE_IN_PROGRESS'] * 5 + [
+            'CREATE_COMPLETE'])
+        with mock.patch.object(self.poller, '_sleep',
+                               return_value=False) as sleep:
+            self.poller.wait(self.client, 'group', 'stack')
+        self.assertEqual([0.02, 0.04, 0.04, 0.04, 0.04],
+                         [call[0][1] for call in sleep.call_args_list])
+
+    def test_transient_errors_are_retried(self):
+        self.client.stacks.add('stack', ['CREATE_COMPLETE'])
+        self.client.stacks.errors = [ValueError(), ValueError()]
+        stack = self.poller.wait(self.client, 'group', 'stack')
+        self.assertEqual('CREATE_COMPLETE', stack.stack_status)
+        self.assertEqual(3, self.poller.total_polls)
+
+    def test_errors_are_propagated_to_waiters(self):
+        self.client.stacks.errors = [ValueError()] * 4
+        self.assertRaises(ValueError, self.poller.wait,
+                          self.client, 'group', 'stack')
+        self.assertEqual({}, self.poller._groups)
+
+
+class TestHeatStackWait(base.MuranoTestCase):
+    def setUp(self):
+        super(TestHeatStackWait, self).setUp()
+        self.client = FakeHeatClient()
+        poller = heat_poller.StackStatusPoller(0.01, 0.04, 0)
+        patcher = mock.patch.object(
+            heat_poller, 'get_poller', return_value=poller)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(
+            heat_stack.HeatStack, '_get_client', return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_output(self):
+        self.client.stacks.add('stack', [
+            'UPDATE_IN_PROGRESS', 'UPDATE_COMPLETE'])
+        hs = heat_stack.HeatStack('stack')
+        self.assertEqual({'key': 'stack'}, hs.output())
+
+    def test_output_of_missing_stack(self):
+        hs = heat_stack.HeatStack('stack')
+        self.assertEqual({}, hs.output())
+
+    def test_wait_state_does_not_get_stack(self):
+        self.client.stacks.add('stack', [
+            'UPDATE_IN_PROGRESS', 'UPDATE_COMPLETE'])
+        hs = heat_stack.HeatStack('stack')
+        with mock.patch.object(self.client.stacks, 'get') as get:
+            hs._wait_state(lambda status: status == 'UPDATE_COMPLETE')
+        self.assertFalse(get.called)
+
+    def test_get_status(self):
+        hs = heat_stack.HeatStack('stack')
+        self.assertEqual('NOT_FOUND', hs._get_status())
+        self.client.stacks.add('stack', ['CREATE_FAILED'])
+        self.assertEqual('CREATE_FAILED', hs._get_status())
+
+    def test_unexpected_state(self):
+        self.client.stacks.add('stack', ['CREATE_FAILED'])
+        hs = heat_stack.HeatStack('stack')
+        self.assertRaises(EnvironmentError, hs._wait_state,
+                          lambda status: status == 'CREATE_COMPLETE')
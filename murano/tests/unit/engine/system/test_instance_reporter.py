@@ -0,0 +1,89 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from murano.engine import execution_session
+from murano.engine.system import instance_reporter
+from murano.tests.unit import base
+
+
+class TestInstanceReportNotifier(base.MuranoTestCase):
+    def setUp(self):
+        super(TestInstanceReportNotifier, self).setUp()
+        instance_reporter.InstanceReportNotifier.transport = mock.Mock()
+        self.addCleanup(setattr, instance_reporter.InstanceReportNotifier,
+                        'transport', None)
+        patcher = mock.patch('oslo_messaging.Notifier')
+        self.notifier = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.session = execution_session.ExecutionSession()
+        patcher = mock.patch('murano.dsl.helpers.get_execution_session',
+                             side_effect=lambda: self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.reporter = instance_reporter.InstanceReportNotifier(
+            mock.Mock(id='env'))
+
+    @staticmethod
+    def _instance(instance_id):
+        instance = mock.Mock(id=instance_id)
+        instance.type.name = 'io.murano.Instance'
+        return instance
+
+    @mock.patch('oslo_utils.timeutils.utcnow_ts')
+    def test_changes_are_sent_on_session_finish(self, utcnow_ts):
+        utcnow_ts.side_effect = [100, 101, 102]
+        self.reporter.track_application(self._instance('app'), 'App', 2)
+        self.reporter.track_cloud_instance(self._instance('vm'))
+        self.reporter.untrack_cloud_instance(self._instance('vm'))
+        self.assertFalse(self.notifier.info.called)
+
+        self.session.finish()
+        self.notifier.info.assert_called_once_with(
+            {}, 'murano.track_instances', {
+                'environment': 'env',
+                'changes': [{
+                    'action': 'track',
+                    'instance': 'app',
+                    'instance_type': instance_reporter.APPLICATION,
+                    'type_name': 'io.murano.Instance',
+                    'type_title': 'App',
+                    'unit_count': 2,
+                    'timestamp': 100
+                }, {
+                    'action': 'track',
+                    'instance': 'vm',
+                    'instance_type': instance_reporter.OS_INSTANCE,
+                    'type_name': 'io.murano.Instance',
+                    'type_title': None,
+                    'unit_count': 1,
+                    'timestamp': 101
+                }, {
+                    'action': 'untrack',
+                    'instance': 'vm',
+                    'instance_type': instance_reporter.OS_INSTANCE,
+                    'timestamp': 102
+                }]
+            })
+
+    def test_batching_disabled(self):
+        self.override_config('instance_tracking_batch_size', 1, 'engine')
+        self.reporter.untrack_application(self._instance('app'))
+        self.notifier.info.assert_called_once_with(
+            {}, 'murano.untrack_instance', {
+                'instance': 'app',
+                'environment': 'env',
+                'instance_type': instance_reporter.APPLICATION
+            })
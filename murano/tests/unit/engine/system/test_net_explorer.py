@@ -42,3 +42,78 @@ class TestNetExplorer(base.MuranoTestCase):
     def test_init(self, execution_session):
         region_name = "regionOne"
         net_explorer.NetworkExplorer(self._this, region_name)
+
+
+class TestCidrIndex(base.MuranoTestCase):
+    def test_overlaps(self):
+        index = net_explorer.CidrIndex(['10.0.0.0/24', '10.0.2.0/23'])
+        self.assertTrue(index.overlaps('10.0.0.128/25'))
+        self.assertTrue(index.overlaps('10.0.0.0/16'))
+        self.assertTrue(index.overlaps('10.0.3.0/24'))
+        self.assertFalse(index.overlaps('10.0.1.0/24'))
+        self.assertFalse(index.overlaps('10.0.4.0/24'))
+        self.assertFalse(index.overlaps('9.0.0.0/8'))
+
+    def test_ranges_are_merged(self):
+        index = net_explorer.CidrIndex(['10.0.0.0/24', '10.0.2.0/24'])
+        self.assertEqual(2, len(index))
+        index.add('10.0.1.128/25')
+        self.assertEqual(3, len(index))
+        index.add('10.0.0.0/16')
+        self.assertEqual(1, len(index))
+        self.assertTrue(index.overlaps('10.0.200.0/24'))
+
+
+class TestGetAvailableCidr(base.MuranoTestCase):
+    def setUp(self):
+        super(TestGetAvailableCidr, self).setUp()
+        self.override_config('env_ip_template', '10.0.0.0', 'networking')
+        self.override_config('max_environments', 4, 'networking')
+        self.override_config('max_hosts', 256, 'networking')
+        self.session = mock.Mock(project_id='project')
+        patcher = mock.patch('murano.dsl.helpers.get_execution_session',
+                             return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = mock.Mock()
+        self.client.list_ports.return_value = {'ports': [
+            {'fixed_ips': [{'subnet_id': 'subnet1'}]},
+            {'fixed_ips': [{'subnet_id': 'subnet2'}]}]}
+        self.client.list_subnets.return_value = {'subnets': [
+            {'id': 'subnet1', 'cidr': '10.0.0.0/24'},
+            {'id': 'subnet2', 'cidr': 'fd00::/64'},
+            {'id': 'other', 'cidr': '10.0.1.0/24'}]}
+        patcher = mock.patch.object(net_explorer.NetworkExplorer,
+                                    '_get_client', return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        this = mock.MagicMock()
+        this.find_owner.return_value = None
+        self.explorer = net_explorer.NetworkExplorer(this, 'region')
+
+    def test_taken_cidrs_are_skipped(self):
+        cidrs = [self.explorer.get_available_cidr('router', net_id)
+                 for net_id in (0, 4)]
+        self.assertEqual(['10.0.1.0/24', '10.0.2.0/24'], cidrs)
+
+    def test_allocations_are_recorded(self):
+        cidrs = set(self.explorer.get_available_cidr('router', 'net')
+                    for _ in range(3))
+        self.assertEqual(set(['10.0.1.0/24', '10.0.2.0/24', '10.0.3.0/24']),
+                         cidrs)
+        self.assertIsNone(self.explorer.get_available_cidr('router', 'net'))
+        self.assertEqual(1, self.client.list_ports.call_count)
+        self.assertEqual(1, self.client.list_subnets.call_count)
+
+    def test_unknown_subnets_are_fetched(self):
+        self.client.list_ports.return_value['ports'].append(
+            {'fixed_ips': [{'subnet_id': 'subnet3'}]})
+        self.client.list_subnets.side_effect = [
+            self.client.list_subnets.return_value,
+            {'subnets': [{'id': 'subnet3', 'cidr': '10.0.1.0/24'}]}]
+        self.assertEqual('10.0.2.0/24',
+                         self.explorer.get_available_cidr('router', 0))
+        self.client.list_subnets.assert_called_with(
+            id=['subnet3'], fields=['id', 'cidr'])
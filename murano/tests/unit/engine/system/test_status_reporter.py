@@ -0,0 +1,52 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from murano.engine.system import status_reporter
+from murano.tests.unit import base
+
+
+class TestStatusReporter(base.MuranoTestCase):
+    def setUp(self):
+        super(TestStatusReporter, self).setUp()
+        status_reporter.StatusReporter.transport = mock.Mock()
+        self.addCleanup(setattr, status_reporter.StatusReporter,
+                        'transport', None)
+        patcher = mock.patch('oslo_messaging.Notifier')
+        self.notifier = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+
+    def test_reports_are_sent_in_batches(self):
+        self.override_config('status_report_batch_size', 2, 'engine')
+        reporter = status_reporter.StatusReporter('env')
+        reporter.report(None, 'message')
+        reporter.report_error(mock.Mock(id='app'), 'error')
+        self.notifier.info.assert_called_once_with(
+            {}, 'murano.report_notification_batch', {
+                'environment_id': 'env', 'reports': mock.ANY})
+        reports = self.notifier.info.call_args[0][2]['reports']
+        self.assertEqual(
+            [('env', 'message', 'info'), ('app', 'error', 'error')],
+            [(report['id'], report['text'], report['level'])
+             for report in reports])
+
+    def test_batching_disabled(self):
+        self.override_config('status_report_batch_size', 1, 'engine')
+        reporter = status_reporter.StatusReporter('env')
+        reporter.report(None, 'message')
+        self.notifier.info.assert_called_once_with(
+            {}, 'murano.report_notification', mock.ANY)
+        reporter.flush()
+        self.assertEqual(1, self.notifier.info.call_count)
@@ -15,6 +15,8 @@
 
 import os
 from shutil import rmtree
+
+import mock
 import yaml
 
 from murano.packages import exceptions
@@ -344,3 +346,49 @@ class TestHotPackage(test_base.MuranoTestCase):
         self.assertRaises(
             exceptions.PackageClassLoadError,
             hot_package._translate_ui)
+
+    def _create_package(self, template=None):
+        if template is not None:
+            with open(os.path.join(self.test_dirs[0], 'template.yaml'),
+                      'w') as stream:
+                yaml.dump(template, stream, default_flow_style=True)
+        return murano.packages.hot_package.HotPackage(
+            None, None, source_directory=self.test_dirs[0],
+            manifest=HOT_PACKAGE_MANIFEST
+        )
+
+    def test_translation_is_cached(self):
+        hot_package = self._create_package(
+            {'resources': '', 'parameters': {'bar': {'type': 'boolean'}}})
+        translated_class, _ = hot_package.get_class(hot_package.full_name)
+        ui = hot_package.ui
+
+        hot_package = self._create_package()
+        with mock.patch.object(hot_package, '_translate_class') as tc, \
+                mock.patch.object(hot_package, '_translate_ui') as tu:
+            self.assertEqual(translated_class, hot_package.get_class(
+                hot_package.full_name)[0])
+            self.assertEqual(ui, hot_package.ui)
+            self.assertFalse(tc.called)
+            self.assertFalse(tu.called)
+        self.assertTrue(os.path.isfile(
+            hot_package.get_resource(hot_package.full_name)))
+
+    def test_translation_cache_is_invalidated(self):
+        hot_package = self._create_package()
+        hot_package.get_class(hot_package.full_name)
+
+        hot_package = self._create_package(
+            {'resources': '', 'parameters': {'baz': {'type': 'string'}}})
+        translated_class, _ = hot_package.get_class(hot_package.full_name)
+        self.assertIn('baz', translated_class)
+
+    def test_translation_without_writable_directory(self):
+        hot_package = self._create_package()
+        with mock.patch('tempfile.mkstemp', side_effect=OSError):
+            translated_class, _ = hot_package.get_class(
+                hot_package.full_name)
+        self.assertIsNotNone(translated_class)
+        self.assertEqual([], os.listdir(os.path.join(
+            self.test_dirs[0],
+            murano.packages.hot_package.TRANSLATION_CACHE_DIR_NAME)))
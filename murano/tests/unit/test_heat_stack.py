@@ -13,10 +13,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import eventlet
 from heatclient.v1 import stacks
 import mock
 from oslo_config import cfg
 
+from murano.dsl import attribute_store
 from murano.engine.system import heat_stack
 from murano.tests.unit import base
 
@@ -424,3 +426,85 @@ class TestHeatStack(base.MuranoTestCase):
         hs.set_files(new_files)
         self.assertEqual(hs._files, new_files)
         hs.output()
+
+    @mock.patch(CLS_NAME + '._wait_state')
+    @mock.patch(CLS_NAME + '._get_status')
+    def test_concurrent_pushes_are_coalesced(self, status_get, wait_st):
+        status_get.return_value = 'CREATE_COMPLETE'
+        wait_st.side_effect = lambda *args: eventlet.sleep(0.01)
+
+        hs = heat_stack.HeatStack('test-stack', None)
+        hs._template = {'resources': {}}
+        hs._applied = False
+
+        def update_and_push(index):
+            hs.update_template({'resources': {index: index}})
+            hs.push()
+
+        threads = [eventlet.spawn(update_and_push, i) for i in range(10)]
+        for thread in threads:
+            thread.wait()
+
+        # the first push is in flight when all the others are requested,
+        # so they are served by the single follow-up update
+        self.assertEqual(2, self.heat_client_mock.stacks.update.call_count)
+        template = self.heat_client_mock.stacks.update.call_args[1][
+            'template']
+        self.assertEqual(dict((i, i) for i in range(10)),
+                         template['resources'])
+        self.assertTrue(hs._applied)
+
+    @mock.patch(CLS_NAME + '._wait_state')
+    @mock.patch(CLS_NAME + '._get_status')
+    def test_push_of_unchanged_stack_is_skipped(self, status_get, wait_st):
+        status_get.return_value = 'CREATE_COMPLETE'
+        hs = heat_stack.HeatStack('test-stack', None)
+        hs.set_template({'resources': {'test': 1}})
+        hs.push()
+        self.assertEqual(1, self.heat_client_mock.stacks.update.call_count)
+
+        hs.set_template({'resources': {'test': 1}})
+        self.assertFalse(hs._applied)
+        hs.push()
+        self.assertTrue(hs._applied)
+        self.assertEqual(1, self.heat_client_mock.stacks.update.call_count)
+        self.assertEqual(1, status_get.call_count)
+
+        hs.set_parameters({'param': 'value'})
+        hs.push()
+        self.assertEqual(2, self.heat_client_mock.stacks.update.call_count)
+
+    @mock.patch('murano.dsl.helpers.get_attribute_store')
+    @mock.patch('murano.engine.system.heat_stack._get_this')
+    @mock.patch(CLS_NAME + '._wait_state')
+    @mock.patch(CLS_NAME + '._get_status')
+    def test_fingerprint_survives_recreation_of_stack(
+            self, status_get, wait_st, get_this, get_attribute_store):
+        status_get.return_value = 'CREATE_COMPLETE'
+        store = attribute_store.AttributeStore()
+        get_attribute_store.return_value = store
+        region = mock.Mock(object_id='region')
+        stack_type = mock.Mock()
+        stack_type.name = 'io.murano.system.HeatStack'
+
+        def deploy(stack_id):
+            # CloudRegion creates a new HeatStack object on every deployment
+            # and the previous one is destroyed
+            this = mock.Mock(object_id=stack_id, owner=region,
+                             type=stack_type)
+            get_this.return_value = this
+            hs = heat_stack.HeatStack('test-stack', None)
+            hs.set_template({'resources': {'test': 1}})
+            hs.push()
+            store.forget_object(this)
+
+        deploy('stack1')
+        deploy('stack2')
+        self.assertEqual(1, self.heat_client_mock.stacks.update.call_count)
+        # stacks with other names owned by the same object are not skipped
+        get_this.return_value = mock.Mock(object_id='stack3', owner=region,
+                                          type=stack_type)
+        hs = heat_stack.HeatStack('other-stack', None)
+        hs.set_template({'resources': {'test': 1}})
+        hs.push()
+        self.assertEqual(2, self.heat_client_mock.stacks.update.call_count)
@@ -0,0 +1,112 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measures memory footprint of MuranoPL objects
+
+Loads an object model consisting of the requested number of objects
+into a DSL executor and reports how much resident memory was consumed
+per 10000 objects. Test classes from murano/tests/unit/dsl/meta are used
+so that the numbers do not depend on any installed packages.
+
+Usage: python tools/dsl_memory_benchmark.py [--objects N] [--runs N]
+"""
+
+import argparse
+import gc
+import os
+import resource
+import sys
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from murano.tests.unit.dsl.foundation import object_model as om  # noqa
+from murano.tests.unit.dsl.foundation import runner  # noqa
+from murano.tests.unit.dsl.foundation import test_package_loader  # noqa
+
+
+def current_rss():
+    # unlike ru_maxrss current RSS can be sampled several times per process
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * resource.getpagesize()
+
+
+def build_model(count):
+    nodes = [om.Object('Node', value='node-{0}'.format(i))
+             for i in range(count)]
+    return om.Object('Node', nodes=nodes, value='root')
+
+
+def create_package_loader():
+    tests_root = os.path.join(ROOT, 'murano', 'tests', 'unit', 'dsl')
+    sys_package_loader = test_package_loader.TestPackageLoader(
+        os.path.join(ROOT, 'meta', 'io.murano', 'Classes'), 'io.murano')
+    return test_package_loader.TestPackageLoader(
+        os.path.join(tests_root, 'meta'), 'tests', sys_package_loader)
+
+
+def measure(count):
+    package_loader = create_package_loader()
+    # warm up caches (classes, yaql engines) on a small model first
+    warmup = runner.Runner(build_model(10), package_loader, {})
+    warmup.executor.finalize(warmup.root)
+    model = build_model(count)
+    gc.collect()
+    if tracemalloc:
+        tracemalloc.start()
+    before = current_rss()
+    instance = runner.Runner(model, package_loader, {})
+    gc.collect()
+    rss = current_rss() - before
+    heap = None
+    if tracemalloc:
+        heap = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    loaded = len(instance.executor.object_store._store)
+    instance.executor.finalize(instance.root)
+    return loaded, rss, heap
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--objects', type=int, default=10000)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    rss_results = []
+    heap_results = []
+    for _ in range(args.runs):
+        loaded, rss, heap = measure(args.objects)
+        rss_results.append(rss * 10000.0 / loaded / 2 ** 20)
+        if heap is not None:
+            heap_results.append(heap * 10000.0 / loaded / 2 ** 20)
+
+    def report(title, results):
+        results.sort()
+        print('{0} per 10k objects: min {1:.2f} MiB, median {2:.2f} MiB'
+              .format(title, results[0], results[len(results) // 2]))
+
+    print('objects loaded: {0}'.format(loaded))
+    report('RSS growth', rss_results)
+    if heap_results:
+        report('Retained heap', heap_results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measures latency of application API calls versus object model size
+
+Creates an environment with the requested numbers of applications in an
+SQLite database and times the calls that the applications API makes to
+read, update, add and delete a single application within a session. Each
+size is measured twice: with the session object model stored as a whole
+(the way older releases stored it) and with applications stored
+separately.
+
+Usage: python tools/session_model_benchmark.py [--apps N [N ...]]
+                                               [--calls N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from oslo_config import cfg  # noqa
+from oslo_utils import timeutils  # noqa
+
+from murano.common import utils  # noqa
+from murano.db import api as db_api  # noqa
+from murano.db import models  # noqa
+from murano.db.services import core_services  # noqa
+from murano.db.services import environments as envs  # noqa
+from murano.db.services import session_model  # noqa
+from murano.db.services import sessions  # noqa
+from murano.db import session as db_session  # noqa
+
+CONF = cfg.CONF
+
+
+def create_app(index):
+    app_id = 'app-{0}'.format(index)
+    # roughly the size of a typical application with a single instance
+    return {
+        '?': {'id': app_id, 'type': 'io.murano.apps.Benchmark'},
+        'name': app_id,
+        'settings': dict(('key{0}'.format(i), 'value' * 10)
+                         for i in range(20)),
+        'instance': {
+            '?': {'id': app_id + '-vm', 'type': 'io.murano.resources.Linux'},
+            'name': app_id + '-vm', 'flavor': 'm1.medium',
+            'image': 'ubuntu', 'keyname': '', 'assignFloatingIp': True}}
+
+
+def create_session(count, split):
+    unit = db_session.get_session()
+    environment = models.Environment(
+        name='env-{0}-{1}'.format(count, split), tenant_id='tenant',
+        version=0, description={'Objects': {
+            '?': {'id': 'env', 'type': 'io.murano.Environment'},
+            'name': 'env', 'services': [create_app(i)
+                                        for i in range(count)]}})
+    with unit.begin():
+        unit.add(environment)
+    session = sessions.SessionServices.create(environment.id, 'user')
+    if not split:
+        description = session_model.SessionModelServices.get_description(
+            session)
+        session = unit.query(models.Session).get(session.id)
+        with unit.begin():
+            session.description = description
+            unit.query(models.SessionApplication).filter_by(
+                session_id=session.id).delete()
+    return environment.id, session.id
+
+
+def put_whole(environment_id, session_id, data, path):
+    # CoreServices.put_data as it was with the whole object model stored
+    # in Session.description
+    description = envs.EnvironmentServices.get_environment_description(
+        environment_id, session_id)
+    utils.TraverseHelper.update(path, data, description)
+    description['?']['updated'] = str(timeutils.utcnow())
+    unit = db_session.get_session()
+    session = unit.query(models.Session).get(session_id)
+    whole = session.description.copy()
+    whole['Objects'] = description
+    with unit.begin():
+        session.description = whole
+
+
+def measure(count, split, calls):
+    environment_id, session_id = create_session(count, split)
+    cs = core_services.CoreServices
+    path = '/services/app-{0}'.format(count // 2)
+    operations = [('get', lambda: cs.get_data(
+        environment_id, path + '/instance', session_id))]
+    if split:
+        operations.extend([
+            ('put', lambda: cs.put_data(
+                environment_id, session_id, 'new', path + '/name')),
+            ('post+delete', lambda: (
+                cs.post_data(environment_id, session_id,
+                             create_app('new'), '/services'),
+                cs.delete_data(environment_id, session_id,
+                               '/services/app-new')))])
+    else:
+        # modifications made through CoreServices save the model split,
+        # so the old behaviour is reproduced directly
+        operations.append(('put', lambda: put_whole(
+            environment_id, session_id, 'new', path + '/name')))
+
+    results = {}
+    for name, operation in operations:
+        start = time.time()
+        for _ in range(calls):
+            operation()
+        results[name] = (time.time() - start) * 1000.0 / calls
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--apps', type=int, nargs='+',
+                        default=[10, 100, 1000])
+    parser.add_argument('--calls', type=int, default=20)
+    args = parser.parse_args()
+
+    db_file = tempfile.NamedTemporaryFile(suffix='.sqlite')
+    CONF([], project='murano')
+    CONF.set_override('connection', 'sqlite:///' + db_file.name,
+                      group='database')
+    db_api.setup_db()
+
+    print('{0:>8} {1:>8} {2:>12} {3:>12} {4:>12}'.format(
+        'apps', 'layout', 'get, ms', 'put, ms', 'post+del, ms'))
+    for count in args.apps:
+        for split in (False, True):
+            results = measure(count, split, args.calls)
+            print('{0:>8} {1:>8} {2:>12.2f} {3:>12.2f} {4:>12}'.format(
+                count, 'split' if split else 'whole', results['get'],
+                results['put'],
+                '{0:.2f}'.format(results['post+delete'])
+                if 'post+delete' in results else '-'))
+
+
+if __name__ == '__main__':
+    main()